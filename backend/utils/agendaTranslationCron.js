@@ -7,117 +7,114 @@ const TRANSLATE_API_URL = process.env.VIDEO_MOM_BACKEND_URL || 'http://localhost
 const AGENDA_CRON_SCHEDULE = process.env.AGENDA_TRANSLATION_CRON || '*/15 * * * *'; // Fallback: every 15 min
 const supportedLanguages = ['en', 'hi', 'hindi'];
 
-async function fetchTranslationResult(resultUrl, maxAttempts = 10, interval = 1000) {
-  let attempts = 0;
-  while (attempts < maxAttempts) {
-    const res = await axios.get(`${TRANSLATE_API_URL}${resultUrl}`);
-    if (res.data?.translated_text) return res.data.translated_text;
-    await new Promise(resolve => setTimeout(resolve, interval));
-    attempts++;
-  }
-  return '';
+const TRANSLATE_BATCH_SIZE = parseInt(process.env.TRANSLATE_BATCH_SIZE, 10) || 500;
+
+async function translateBatch(segments, targetLanguages) {
+  const res = await axios.post(`${TRANSLATE_API_URL}/translate/batch`, {
+    segments,
+    target_languages: targetLanguages,
+  });
+  return res.data?.translations || {};
 }
 
-async function translateText(text, target_language) {
-  if (typeof text !== 'string') {
-    return '';
-  }
+function toPlainObject(field) {
+  return field instanceof Map ? Object.fromEntries(field) : field || {};
+}
 
-  const res = await axios.post(`${TRANSLATE_API_URL}/translate`, {
-    text,
-    target_language,
-  });
+// Record every title/description language still missing; returns the field objects to write back
+function collectMissing(item, sources, targets) {
+  const fields = { title: toPlainObject(item.title), description: toPlainObject(item.description) };
+
+  for (const fieldObj of Object.values(fields)) {
+    const originalLang = Object.keys(fieldObj)[0];
+    const source = fieldObj[originalLang];
+    if (typeof source !== 'string' || !source.trim()) continue;
 
-  if (res.data?.result_url) {
-    return await fetchTranslationResult(res.data.result_url);
+    for (const lang of supportedLanguages) {
+      if (!fieldObj[lang]) {
+        sources.add(source);
+        targets.push({ fieldObj, lang, source });
+      }
+    }
   }
+  return fields;
+}
 
-  return '';
+// Translate every source text into all supported languages, TRANSLATE_BATCH_SIZE texts per request.
+// A failed batch only leaves its own texts untranslated; they are retried on the next run.
+async function translateSources(sources) {
+  const texts = [...sources];
+  const translations = new Map();
+
+  for (let start = 0; start < texts.length; start += TRANSLATE_BATCH_SIZE) {
+    const chunk = texts.slice(start, start + TRANSLATE_BATCH_SIZE);
+    let byLanguage;
+    try {
+      byLanguage = await translateBatch(chunk, supportedLanguages);
+    } catch (error) {
+      console.error(`[AgendaTranslation] Batch of ${chunk.length} texts failed, skipping it:`, error.message);
+      continue;
+    }
+    chunk.forEach((text, index) => {
+      const perLanguage = {};
+      for (const lang of supportedLanguages) {
+        perLanguage[lang] = byLanguage[lang]?.[index];
+      }
+      translations.set(text, perLanguage);
+    });
+  }
+  return translations;
 }
 
 const agendaTranslationCron = cron.schedule(AGENDA_CRON_SCHEDULE, async () => {
   try {
-    // --- Translate IssueSummary.agendaItems ---
+    // --- Collect untranslated IssueSummary.agendaItems and GramSabha.agenda fields ---
+    const sources = new Set();
+    const documents = [];
+
     const summaries = await IssueSummary.find({});
     for (const summary of summaries) {
-      let updated = false;
-
-      for (const item of summary.agendaItems) {
-        let titleObj = item.title instanceof Map ? Object.fromEntries(item.title) : item.title || {};
-        let descObj = item.description instanceof Map ? Object.fromEntries(item.description) : item.description || {};
-
-        const originalTitleLang = Object.keys(titleObj)[0];
-        for (const lang of supportedLanguages) {
-          if (!titleObj[lang] && titleObj[originalTitleLang]) {
-            const translated = await translateText(titleObj[originalTitleLang], lang);
-            if (translated?.trim()) {
-              titleObj[lang] = translated;
-              updated = true;
-            }
-          }
-        }
-
-        const originalDescLang = Object.keys(descObj)[0];
-        for (const lang of supportedLanguages) {
-          if (!descObj[lang] && descObj[originalDescLang]) {
-            const translated = await translateText(descObj[originalDescLang], lang);
-            if (translated?.trim()) {
-              descObj[lang] = translated;
-              updated = true;
-            }
-          }
-        }
-
-        item.title = titleObj;
-        item.description = descObj;
-      }
-
-      if (updated) {
-        await summary.save();
-      }
+      const targets = [];
+      const items = summary.agendaItems.map(item => ({ item, fields: collectMissing(item, sources, targets) }));
+      documents.push({ doc: summary, items, targets });
     }
 
-    // --- Translate GramSabha.agenda ---
     const meetings = await GramSabha.find({ dateTime: { $gte: new Date() } });
-
     for (const meeting of meetings) {
-      let updated = false;
-
-      for (const item of meeting.agenda || []) {
+      const targets = [];
+      const items = (meeting.agenda || []).map(item => {
         if (!item.createdByType) item.createdByType = 'SYSTEM';
         if (item.createdByType === 'USER' && !item.createdByUserId) item.createdByUserId = null;
+        return { item, fields: collectMissing(item, sources, targets) };
+      });
+      documents.push({ doc: meeting, items, targets });
+    }
 
-        let titleObj = item.title instanceof Map ? Object.fromEntries(item.title) : item.title || {};
-        let descObj = item.description instanceof Map ? Object.fromEntries(item.description) : item.description || {};
-
-        const originalTitleLang = Object.keys(titleObj)[0];
-        for (const lang of supportedLanguages) {
-          if (!titleObj[lang] && titleObj[originalTitleLang]) {
-            const translated = await translateText(titleObj[originalTitleLang], lang);
-            if (translated?.trim()) {
-              titleObj[lang] = translated;
-              updated = true;
-            }
-          }
-        }
+    if (sources.size === 0) return;
 
-        const originalDescLang = Object.keys(descObj)[0];
-        for (const lang of supportedLanguages) {
-          if (!descObj[lang] && descObj[originalDescLang]) {
-            const translated = await translateText(descObj[originalDescLang], lang);
-            if (translated?.trim()) {
-              descObj[lang] = translated;
-              updated = true;
-            }
-          }
-        }
+    // --- One batch request instead of one request per item, field and language ---
+    const translations = await translateSources(sources);
 
-        item.title = titleObj;
-        item.description = descObj;
+    for (const { doc, items, targets } of documents) {
+      let updated = false;
+      for (const { fieldObj, lang, source } of targets) {
+        const translated = translations.get(source)?.[lang];
+        if (translated?.trim()) {
+          fieldObj[lang] = translated;
+          updated = true;
+        }
       }
 
       if (updated) {
-        await meeting.save();
+        for (const { item, fields } of items) {
+          item.title = fields.title;
+          item.description = fields.description;
+        }
+        try {
+          await doc.save();
+        } catch (error) {
+          console.error(`[AgendaTranslation] Failed to save translations for ${doc._id}:`, error.message);
+        }
       }
     }
   } catch (error) {
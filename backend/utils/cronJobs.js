@@ -9,6 +9,37 @@ const logger = require('./logger');
 
 const VIDEO_MOM_URL = process.env.VIDEO_MOM_BACKEND_URL || 'http://video-mom-backend:8000';
 
+// Issues per /analyze/batch request; the service packs several into each Bedrock prompt
+const ANALYZE_BATCH_SIZE = parseInt(process.env.ANALYZE_BATCH_SIZE, 10) || 100;
+
+async function analyzeCompletedIssues(completedIssues) {
+    for (let start = 0; start < completedIssues.length; start += ANALYZE_BATCH_SIZE) {
+        const chunk = completedIssues.slice(start, start + ANALYZE_BATCH_SIZE);
+        try {
+            const comprehendRes = await axios.post(`${VIDEO_MOM_URL}/analyze/batch`, {
+                issues: chunk.map(({ issue, text }) => ({ id: issue._id.toString(), text, language: 'en' }))
+            });
+            const results = comprehendRes.data?.results || [];
+
+            for (const [index, { issue }] of chunk.entries()) {
+                const analysis = results[index];
+                if (!analysis || !analysis.sentiment) continue;
+                try {
+                    issue.sentiment = analysis.sentiment;
+                    issue.keyPhrases = analysis.keyPhrases || [];
+                    if (analysis.suggestedPriority === 'URGENT' && issue.priority !== 'URGENT') {
+                        issue.priority = 'URGENT';
+                    }
+                    await issue.save();
+                } catch (saveErr) {
+                }
+            }
+        } catch (comprehendErr) {
+            // Non-blocking — analysis failure shouldn't affect transcription flow
+        }
+    }
+}
+
 // Check transcription status every 5 minutes
 const checkTranscriptionStatus = cron.schedule('*/1 * * * *', async () => {
     try {
@@ -18,6 +49,8 @@ const checkTranscriptionStatus = cron.schedule('*/1 * * * *', async () => {
             'transcription.requestId': { $exists: true, $ne: null }
         });
 
+        const completedIssues = [];
+
         for (const issue of processingIssues) {
             try {
                 const statusResult = await transcriptionService.checkTranscriptionStatus(issue.transcription.requestId);
@@ -37,25 +70,10 @@ const checkTranscriptionStatus = cron.schedule('*/1 * * * *', async () => {
                     issue.transcription.lastError = null;
                     await issue.save();
 
-                    // Trigger Comprehend analysis on completed transcription
-                    try {
-                        const analysisText = statusResult.enhancedEnglishTranscription || statusResult.transcription;
-                        if (analysisText && analysisText.trim()) {
-                            const comprehendRes = await axios.post(`${VIDEO_MOM_URL}/analyze/issue`, {
-                                text: analysisText,
-                                language: 'en'
-                            });
-                            if (comprehendRes.data && comprehendRes.data.sentiment) {
-                                issue.sentiment = comprehendRes.data.sentiment;
-                                issue.keyPhrases = comprehendRes.data.keyPhrases || [];
-                                if (comprehendRes.data.suggestedPriority === 'URGENT' && issue.priority !== 'URGENT') {
-                                    issue.priority = 'URGENT';
-                                }
-                                await issue.save();
-                            }
-                        }
-                    } catch (comprehendErr) {
-                        // Non-blocking — analysis failure shouldn't affect transcription flow
+                    // Queue Comprehend analysis of the completed transcription
+                    const analysisText = statusResult.enhancedEnglishTranscription || statusResult.transcription;
+                    if (analysisText && analysisText.trim()) {
+                        completedIssues.push({ issue, text: analysisText });
                     }
 
                 } else if (statusResult.status === 'failed') {
@@ -69,6 +87,9 @@ const checkTranscriptionStatus = cron.schedule('*/1 * * * *', async () => {
             } catch (error) {
             }
         }
+
+        // Analyze all newly completed transcriptions with one batch request
+        await analyzeCompletedIssues(completedIssues);
         
     } catch (error) {
     }
@@ -1,18 +1,30 @@
 import os
+import uuid
 import asyncio
+import inspect
 import logging
-from fastapi import APIRouter, UploadFile, File, HTTPException, Body, Depends, Path
-from fastapi.responses import Response
-from typing import Dict, Any, List
+import contextlib
+from functools import partial
+from fastapi import APIRouter, UploadFile, File, HTTPException, Body, Depends, Path, Request
+from fastapi.responses import Response, StreamingResponse
+from typing import Dict, Any, List, Optional
 from app.services.audio_extractor import AudioExtractor
 from app.services.stt_transcriber import STTTranscriber
 from app.services.jio_only_stt_transcriber import jio_only_stt_transcriber
-from app.services.request_tracker import RequestTracker
+from app.services.request_tracker import RequestTracker, ChunkCheckpoint
+from app.services.upload_manager import ResumableUploadManager, UploadStatus
 from app.core.config import settings
-from app.services.file_storage import file_storage
+from app.services.file_storage import file_storage, UploadTooLargeError
 from app.services.llm_service import llm_service
+from app.services.llm_cache import llm_response_cache
+from app.services.translation_memory import translation_memory
 from app.services.tts_service import tts_service
+from app.services.tts_cache import tts_local_cache
 from app.services.comprehend_service import comprehend_service
+from app.services.issue_preclassifier import issue_preclassifier
+from app.services.voice_activity import voice_activity_detector
+from app.services.job_scheduler import job_scheduler, JobType, QueueFullError, JOB_PRIORITIES
+from app.services.job_queue import JobQueue, PROCESS_ID
 from app.core.database import get_database, RequestStatus, RequestType
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
@@ -26,9 +38,171 @@ router = APIRouter()
 audio_extractor = AudioExtractor()
 stt_transcriber = STTTranscriber()
 
+SUPPORTED_MEDIA_EXTENSIONS = ['mp4', 'wav', 'mp3', 'avi', 'mov', 'mkv', 'flv', 'webm', 'm4a', 'aac', 'ogg', 'flac']
+
+SUPPORTED_JIO_LANGUAGES = ["English", "Hindi", "Gujarati",
+                           "Marathi", "Telugu", "Bengali",
+                            "Kannada", "Malayalam", "Tamil",
+                            "Spanish", "German", "Italian", 
+                            "French", "Urdu", "Punjabi",
+                            "Assamese", "Oriya", "Arabic",
+                            "Simplified Chinese", "Traditional Chinese","Bahasa", "Dutch", "Korean", "Malay", "Polish",
+                            "Portuguese", "Russian", "Tagalog", "Thai",
+                            "Turkish", "Vietnamese"
+]
+
+# Bounds for the part size a client may choose for resumable uploads
+MIN_RESUMABLE_CHUNK_SIZE = 256 * 1024
+MAX_RESUMABLE_CHUNK_SIZE = 64 * 1024 * 1024
+
 async def get_request_tracker(db: AsyncIOMotorDatabase = Depends(get_database)) -> RequestTracker:
     return RequestTracker(db)
 
+async def get_upload_manager(db: AsyncIOMotorDatabase = Depends(get_database)) -> ResumableUploadManager:
+    return ResumableUploadManager(db)
+
+# Scheduler job type for each request type
+REQUEST_JOB_TYPES = {
+    RequestType.TRANSCRIPTION: JobType.TRANSCRIPTION,
+    RequestType.TRANSCRIPTION_JIO: JobType.TRANSCRIPTION,
+    RequestType.MOM_GENERATION: JobType.LLM,
+    RequestType.AGENDA_GENERATION: JobType.LLM,
+    RequestType.AGENDA_UPDATE: JobType.LLM,
+    RequestType.TRANSLATION: JobType.TRANSLATION,
+}
+
+def _queue_mode() -> bool:
+    return settings.EXECUTION_MODE.lower() == "queue"
+
+async def _check_job_capacity(request_type: str, tracker: RequestTracker):
+    """Reject with 429 + Retry-After before any payload is read when the job queue is full"""
+    job_type = REQUEST_JOB_TYPES[request_type]
+    try:
+        if not _queue_mode():
+            job_scheduler.check_capacity(job_type)
+        elif await JobQueue(tracker.db).count_pending() >= settings.JOB_QUEUE_MAX_PENDING:
+            raise QueueFullError(job_type, settings.JOB_RETRY_AFTER_SECONDS)
+    except QueueFullError as e:
+        raise _server_busy(e)
+
+def _server_busy(e: QueueFullError) -> HTTPException:
+    return HTTPException(
+        status_code=429,
+        detail=f"Server busy: too many pending {e.job_type} jobs. Retry later.",
+        headers={"Retry-After": str(e.retry_after)}
+    )
+
+async def _run_in_job_slot(job_type: str, func, *args):
+    """Run blocking work for a synchronous endpoint in a scheduler slot of job_type.
+
+    It passes the same admission gate and per-type limits as background jobs, and
+    the response waits for the job's result.
+    """
+    try:
+        job_scheduler.check_capacity(job_type)
+    except QueueFullError as e:
+        raise _server_busy(e)
+    
+    done = asyncio.get_running_loop().create_future()
+    
+    async def job():
+        try:
+            result = await asyncio.to_thread(func, *args)
+            if not done.done():
+                done.set_result(result)
+        except Exception as e:
+            if not done.done():
+                done.set_exception(e)
+        finally:
+            # Cancelled by a shutdown drain before it finished
+            if not done.done():
+                done.cancel()
+    
+    def discarded(error: QueueFullError):
+        # Shutdown dropped the job before it started: answer 429 instead of waiting forever
+        if not done.done():
+            done.set_exception(error)
+    
+    job_scheduler.submit(job_type, f"{job_type}-{uuid.uuid4().hex[:8]}", job, on_discard=discarded)
+    try:
+        return await done
+    except QueueFullError as e:
+        raise _server_busy(e)
+
+async def _dispatch_job(request_id: str, tracker: RequestTracker, request_type: str, process_func):
+    """Run a pipeline in this process, or queue it for the worker pool"""
+    job_type = REQUEST_JOB_TYPES[request_type]
+    queue = JobQueue(tracker.db)
+    if _queue_mode():
+        await queue.enqueue(request_id, job_type, JOB_PRIORITIES[job_type])
+    else:
+        # Leased to this process, so the job is recovered if the process dies before finishing it
+        await queue.lease(request_id, job_type, JOB_PRIORITIES[job_type], PROCESS_ID)
+        job_scheduler.submit(job_type, request_id, lambda: _run_leased_job(request_id, tracker, process_func))
+
+async def _run_leased_job(request_id: str, tracker: RequestTracker, process_func):
+    try:
+        await process_func(request_id, tracker)
+    except asyncio.CancelledError:
+        # Interrupted by shutdown: keep the lease so recovery resumes the job
+        raise
+    except Exception:
+        logger.exception(f"Unhandled error in pipeline for request {request_id}")
+    await JobQueue(tracker.db).release(request_id, PROCESS_ID)
+
+async def recover_interrupted_jobs(db: AsyncIOMotorDatabase) -> int:
+    """Pick up unfinished requests whose process died (expired lease) and resume them.
+
+    The pipelines skip every stage whose output is already stored (normalized audio,
+    raw transcription, LLM result), so a resumed job continues from its last
+    completed step. Returns the number of jobs resumed.
+    """
+    queue = JobQueue(db)
+    tracker = RequestTracker(db)
+    resumed = 0
+    
+    while True:
+        job = await queue.claim_interrupted(PROCESS_ID)
+        if not job:
+            break
+        
+        request_id = job["request_id"]
+        request_type = job.get("request_type")
+        if request_type not in REQUEST_PROCESSORS or job.get("attempts", 1) > settings.JOB_MAX_ATTEMPTS:
+            logger.warning(f"Giving up on interrupted request {request_id} (type {request_type}, attempts {job.get('attempts')})")
+            await tracker.update_request_status(
+                request_id, RequestStatus.FAILED, error_message="Processing was interrupted and could not be resumed"
+            )
+            await queue.release(request_id, PROCESS_ID)
+            continue
+        
+        job_type = REQUEST_JOB_TYPES[request_type]
+        await tracker.update_request_status(request_id, RequestStatus.RESUMED, "recovery")
+        if _queue_mode():
+            await queue.enqueue(request_id, job_type, JOB_PRIORITIES[job_type])
+        else:
+            processor = REQUEST_PROCESSORS[request_type]
+            job_scheduler.submit(
+                job_type, request_id,
+                lambda request_id=request_id, processor=processor: _run_leased_job(request_id, tracker, processor)
+            )
+        resumed += 1
+        logger.info(f"Resuming interrupted {request_type} request {request_id} (attempt {job.get('attempts')})")
+    
+    return resumed
+
+def _validate_jio_language(language: str):
+    if language not in SUPPORTED_JIO_LANGUAGES:
+        raise HTTPException(
+            status_code=400, 
+            detail=f"Unsupported language: {language}. Supported languages: {', '.join(SUPPORTED_JIO_LANGUAGES)}"
+        )
+
+def _validate_media_extension(filename: str):
+    file_extension = filename.lower().split('.')[-1]
+    if file_extension not in SUPPORTED_MEDIA_EXTENSIONS:
+        raise HTTPException(status_code=400, detail=f"Unsupported file type: {file_extension}")
+
 # ======================= MAIN ENDPOINTS =======================
 
 @router.post("/transcription/")
@@ -49,23 +223,7 @@ async def jio_transcription_endpoint(
     tracker: RequestTracker = Depends(get_request_tracker)
 ):
     """Transcribe audio/video file using Jio Translate API with specified language"""
-    # Validate language parameter
-    supported_languages = ["English", "Hindi", "Gujarati",
-                           "Marathi", "Telugu", "Bengali",
-                            "Kannada", "Malayalam", "Tamil",
-                            "Spanish", "German", "Italian", 
-                            "French", "Urdu", "Punjabi",
-                            "Assamese", "Oriya", "Arabic",
-                            "Simplified Chinese", "Traditional Chinese","Bahasa", "Dutch", "Korean", "Malay", "Polish",
-                            "Portuguese", "Russian", "Tagalog", "Thai",
-                            "Turkish", "Vietnamese"
-    ]
-    
-    if language not in supported_languages:
-        raise HTTPException(
-            status_code=400, 
-            detail=f"Unsupported language: {language}. Supported languages: {', '.join(supported_languages)}"
-        )
+    _validate_jio_language(language)
     
     # Store language in the request data for processing
     request_data = {"language": language}
@@ -132,6 +290,205 @@ async def translate_text_endpoint(
         process_translation_async, "translate"
     )
 
+@router.post("/translate/batch")
+async def translate_batch_endpoint(
+    segments: List[str] = Body(..., embed=True),
+    target_languages: List[str] = Body(..., embed=True)
+):
+    """Translate many segments into many languages and return all results in one response"""
+    if not segments or not target_languages:
+        raise HTTPException(status_code=400, detail="segments and target_languages are required")
+    if len(segments) > settings.TRANSLATE_BATCH_MAX_SEGMENTS:
+        raise HTTPException(status_code=400, detail=f"At most {settings.TRANSLATE_BATCH_MAX_SEGMENTS} segments per batch")
+    if len(target_languages) > settings.TRANSLATE_BATCH_MAX_LANGUAGES:
+        raise HTTPException(status_code=400, detail=f"At most {settings.TRANSLATE_BATCH_MAX_LANGUAGES} target languages per batch")
+    
+    try:
+        result = await _run_in_job_slot(JobType.TRANSLATION, llm_service.translate_batch, segments, target_languages)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Batch translation error: {e}")
+        raise HTTPException(status_code=500, detail=f"Batch translation failed: {str(e)}")
+    
+    return {"segment_count": len(segments), **result}
+
+# ======================= RESUMABLE UPLOAD ENDPOINTS =======================
+
+@router.post("/transcription/jio/{language}/uploads")
+async def initiate_jio_upload(
+    language: str = Path(..., description="Language for transcription (e.g., Hindi, English, Tamil, etc.)"),
+    filename: str = Body(..., embed=True),
+    total_size: int = Body(..., embed=True),
+    chunk_size: int = Body(None, embed=True),
+    sha256: str = Body(None, embed=True),
+    uploads: ResumableUploadManager = Depends(get_upload_manager)
+):
+    """Start a resumable upload for Jio transcription. Send parts with PUT, then call complete."""
+    _validate_jio_language(language)
+    _validate_media_extension(filename)
+    
+    if total_size <= 0:
+        raise HTTPException(status_code=400, detail="total_size must be positive")
+    if total_size > file_storage.max_upload_bytes:
+        raise HTTPException(status_code=413, detail=f"File too large. Maximum size is {settings.MAX_UPLOAD_SIZE_MB} MB")
+    
+    # Turn clients away before they send any bytes
+    await _check_job_capacity(RequestType.TRANSCRIPTION_JIO, RequestTracker(uploads.db))
+    
+    chunk_size = chunk_size or settings.RESUMABLE_CHUNK_SIZE_MB * 1024 * 1024
+    if not MIN_RESUMABLE_CHUNK_SIZE <= chunk_size <= MAX_RESUMABLE_CHUNK_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"chunk_size must be between {MIN_RESUMABLE_CHUNK_SIZE} and {MAX_RESUMABLE_CHUNK_SIZE} bytes"
+        )
+    
+    session = await uploads.create_session(
+        os.path.basename(filename), total_size, chunk_size,
+        session_data={"language": language}, expected_sha256=sha256
+    )
+    upload_id = session["upload_id"]
+    
+    return {
+        "upload_id": upload_id,
+        "chunk_size": session["chunk_size"],
+        "total_chunks": session["total_chunks"],
+        "expires_at": session["expires_at"],
+        "language": language,
+        "chunk_url": f"/uploads/{upload_id}/chunks/{{index}}",
+        "status_url": f"/uploads/{upload_id}",
+        "complete_url": f"/uploads/{upload_id}/complete"
+    }
+
+@router.put("/uploads/{upload_id}/chunks/{index}")
+async def upload_chunk(
+    upload_id: str,
+    index: int,
+    request: Request,
+    uploads: ResumableUploadManager = Depends(get_upload_manager)
+):
+    """Upload one numbered part (raw request body). Re-sending a part overwrites it."""
+    session = await uploads.get_session(upload_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Upload session not found or expired")
+    if session["status"] != UploadStatus.ACTIVE:
+        raise HTTPException(status_code=409, detail=f"Upload session is {session['status']}")
+    if index < 0 or index >= session["total_chunks"]:
+        raise HTTPException(status_code=400, detail=f"Chunk index must be between 0 and {session['total_chunks'] - 1}")
+    
+    expected_size = uploads.expected_chunk_size(session, index)
+    try:
+        received, digest = await file_storage.store_upload_part(upload_id, index, request.stream(), expected_size)
+    except UploadTooLargeError:
+        raise HTTPException(status_code=400, detail=f"Chunk {index} is larger than the expected {expected_size} bytes")
+    
+    if received != expected_size:
+        file_storage.discard_upload_part(upload_id, index)
+        raise HTTPException(status_code=400, detail=f"Chunk {index} has {received} bytes, expected {expected_size}")
+    
+    await uploads.mark_chunk_received(upload_id, index)
+    return {"upload_id": upload_id, "index": index, "received_bytes": received, "sha256": digest}
+
+@router.get("/uploads/{upload_id}")
+async def get_upload_status(upload_id: str, uploads: ResumableUploadManager = Depends(get_upload_manager)):
+    """Report which parts have been received so a client can resume"""
+    session = await uploads.get_session(upload_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Upload session not found or expired")
+    
+    return {
+        "upload_id": upload_id,
+        "status": session["status"],
+        "filename": session["filename"],
+        "total_size": session["total_size"],
+        "chunk_size": session["chunk_size"],
+        "total_chunks": session["total_chunks"],
+        "received_chunks": sorted(set(session["received_chunks"])),
+        "missing_chunks": uploads.missing_chunks(session),
+        "received_ranges": uploads.received_ranges(session),
+        "request_id": session.get("request_id"),
+        "expires_at": session["expires_at"]
+    }
+
+@router.post("/uploads/{upload_id}/complete")
+async def complete_upload(
+    upload_id: str,
+    tracker: RequestTracker = Depends(get_request_tracker),
+    uploads: ResumableUploadManager = Depends(get_upload_manager)
+):
+    """Assemble a fully received upload and start Jio transcription on it"""
+    session = await uploads.get_session(upload_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Upload session not found or expired")
+    
+    # Completing twice is harmless: hand back the request that was already started
+    if session["status"] == UploadStatus.FINALIZED:
+        request_id = session["request_id"]
+        return {
+            "upload_id": upload_id,
+            "request_id": request_id,
+            "status": "processing",
+            "status_url": f"/request/{request_id}/status",
+            "result_url": f"/transcription/jio/{request_id}/result"
+        }
+    
+    missing = uploads.missing_chunks(session)
+    if missing:
+        raise HTTPException(status_code=409, detail={"error": "Upload incomplete", "missing_chunks": missing})
+    
+    # The parts stay on disk, so a busy server can simply ask the client to complete later
+    await _check_job_capacity(RequestType.TRANSCRIPTION_JIO, tracker)
+    
+    session = await uploads.begin_finalize(upload_id)
+    if not session:
+        raise HTTPException(status_code=409, detail="Upload is already being finalized")
+    
+    request_id = None
+    try:
+        additional_data = dict(session["session_data"], upload_id=upload_id)
+        request_data = {"filename": session["filename"], "provider": "jio_translate_only", **additional_data}
+        request_id = await tracker.create_request(RequestType.TRANSCRIPTION_JIO, request_data)
+        
+        stored_file_path, file_size, file_sha256 = await asyncio.to_thread(
+            file_storage.assemble_upload, upload_id, session["total_chunks"], session["filename"], request_id
+        )
+        
+        expected_sha256 = session.get("expected_sha256")
+        if expected_sha256 and expected_sha256 != file_sha256:
+            file_storage.cleanup_request_files(request_id)
+            file_storage.cleanup_upload_parts(upload_id)
+            await uploads.reset_session(upload_id)
+            await tracker.update_request_status(request_id, RequestStatus.FAILED, error_message="Upload checksum mismatch")
+            raise HTTPException(status_code=422, detail="Checksum mismatch, all chunks must be uploaded again")
+        
+        file_metadata = {
+            "stored_path": stored_file_path,
+            "original_filename": session["filename"],
+            "file_size": file_size,
+            "sha256": file_sha256,
+            "content_type": None
+        }
+        
+        response = await _start_file_processing(
+            request_id, tracker, RequestType.TRANSCRIPTION_JIO, process_jio_transcription_async,
+            "jio_translate_only", file_metadata, additional_data
+        )
+        await uploads.complete_finalize(upload_id, request_id)
+        file_storage.cleanup_upload_parts(upload_id)
+        
+        response["upload_id"] = upload_id
+        return response
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error finalizing upload {upload_id}: {e}", exc_info=True)
+        await uploads.abort_finalize(upload_id)
+        if request_id:
+            file_storage.cleanup_request_files(request_id)
+            await tracker.update_request_status(request_id, RequestStatus.FAILED, error_message=str(e))
+        raise HTTPException(status_code=500, detail=f"Failed to finalize upload: {str(e)}")
+
 # ======================= HELPER FUNCTIONS =======================
 
 async def _create_file_processing_request(
@@ -145,9 +502,14 @@ async def _create_file_processing_request(
             raise HTTPException(status_code=400, detail="No valid file provided")
         
         # Check file extension
-        file_extension = file.filename.lower().split('.')[-1]
-        if file_extension not in ['mp4', 'wav', 'mp3', 'avi', 'mov', 'mkv', 'flv', 'webm', 'm4a', 'aac', 'ogg', 'flac']:
-            raise HTTPException(status_code=400, detail=f"Unsupported file type: {file_extension}")
+        _validate_media_extension(file.filename)
+        
+        # Backpressure before the spooled body is copied to storage
+        await _check_job_capacity(request_type, tracker)
+        
+        # Starlette has already spooled the body; the limit_upload_size middleware capped its length
+        if file.size and file.size > file_storage.max_upload_bytes:
+            raise HTTPException(status_code=413, detail=f"File too large. Maximum size is {settings.MAX_UPLOAD_SIZE_MB} MB")
         
         # Create request first to get request_id
         request_data = {
@@ -161,62 +523,80 @@ async def _create_file_processing_request(
         # Create request to get request_id
         request_id = await tracker.create_request(request_type, request_data)
         
-        # Read file content as bytes
-        file_content = await file.read()
-        
-        # Store file with request_id - pass bytes content, not UploadFile object
-        stored_file_path = file_storage.store_file(file_content, file.filename, request_id)
+        # Copy the spooled upload to storage in bounded chunks, hashing as we go
+        try:
+            stored_file_path, file_size, file_sha256 = await file_storage.store_upload(file, file.filename, request_id)
+        except UploadTooLargeError as e:
+            file_storage.cleanup_request_files(request_id)
+            await tracker.update_request_status(request_id, RequestStatus.FAILED, error_message=str(e))
+            raise HTTPException(status_code=413, detail=f"File too large. Maximum size is {settings.MAX_UPLOAD_SIZE_MB} MB")
         
         # Store file metadata for processing
         file_metadata = {
             "stored_path": stored_file_path,
             "original_filename": file.filename,
-            "file_size": file.size,
+            "file_size": file_size,
+            "sha256": file_sha256,
             "content_type": file.content_type
         }
         
-        # Store the metadata object in the tracker
-        await tracker.store_object(request_id, "file_metadata", file_metadata)
-        
-        # Start background processing
-        asyncio.create_task(process_func(request_id, tracker))
-        
-        # Determine result endpoint based on request type
-        if request_type == RequestType.TRANSCRIPTION:
-            result_endpoint = f"/transcription/{request_id}/result"
-        elif request_type == RequestType.TRANSCRIPTION_JIO:
-            result_endpoint = f"/transcription/jio/{request_id}/result"
-        else:
-            result_endpoint = f"/request/{request_id}/result"
-        
-        response = {
-            "request_id": request_id,
-            "status": "processing",
-            "message": f"File uploaded successfully. Processing with {provider_name}.",
-            "status_url": f"/request/{request_id}/status",
-            "result_url": result_endpoint
-        }
-        
-        # Add language info if available
-        if additional_data and "language" in additional_data:
-            response["language"] = additional_data["language"]
-        
-        return response
+        return await _start_file_processing(
+            request_id, tracker, request_type, process_func, provider_name,
+            file_metadata, additional_data
+        )
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error creating file processing request: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to process file: {str(e)}")
 
+async def _start_file_processing(
+    request_id: str, tracker: RequestTracker, request_type: RequestType,
+    process_func, provider_name: str, file_metadata: dict, additional_data: dict = None
+) -> dict:
+    """Record metadata for a stored file, start its pipeline and build the upload response"""
+    # Store the metadata object in the tracker
+    await tracker.store_object(request_id, "file_metadata", file_metadata)
+    if file_metadata.get("sha256") and settings.MEDIA_DEDUP_ENABLED:
+        await tracker.record_media_artifact(file_metadata["sha256"], "stored_path", file_metadata["stored_path"])
+    
+    # Queue background processing
+    await _dispatch_job(request_id, tracker, request_type, process_func)
+    
+    # Determine result endpoint based on request type
+    if request_type == RequestType.TRANSCRIPTION:
+        result_endpoint = f"/transcription/{request_id}/result"
+    elif request_type == RequestType.TRANSCRIPTION_JIO:
+        result_endpoint = f"/transcription/jio/{request_id}/result"
+    else:
+        result_endpoint = f"/request/{request_id}/result"
+    
+    response = {
+        "request_id": request_id,
+        "status": "processing",
+        "message": f"File uploaded successfully. Processing with {provider_name}.",
+        "status_url": f"/request/{request_id}/status",
+        "result_url": result_endpoint
+    }
+    
+    # Add language info if available
+    if additional_data and "language" in additional_data:
+        response["language"] = additional_data["language"]
+    
+    return response
+
 async def _create_text_processing_request(
     data: dict, tracker: RequestTracker, request_type: str, 
     processor_func, endpoint_prefix: str
 ):
     """Common logic for text-based processing requests"""
+    await _check_job_capacity(request_type, tracker)
     request_id = await tracker.create_request(request_type, data)
     
     try:
         await tracker.store_object(request_id, "input_data", data)
-        asyncio.create_task(processor_func(request_id, tracker))
+        await _dispatch_job(request_id, tracker, request_type, processor_func)
         
         return {
             "request_id": request_id,
@@ -241,7 +621,8 @@ async def process_transcription_async(request_id: str, tracker: RequestTracker):
     """Background processing for HuggingFace Whisper transcription"""
     await _process_transcription_common(
         request_id, tracker, stt_transcriber.transcribe_audio, 
-        "huggingface_whisper", "HuggingFace Whisper API"
+        "huggingface_whisper", "HuggingFace Whisper API",
+        cache_variant="huggingface_whisper"
     )
 
 async def process_jio_transcription_async(request_id: str, tracker: RequestTracker):
@@ -253,6 +634,8 @@ async def process_jio_transcription_async(request_id: str, tracker: RequestTrack
 
         # Select transcription function based on STT_PROVIDER config
         provider = settings.STT_PROVIDER.lower()
+        stream_transcribe_func = None
+        checkpoints = []
         if provider == "aws_transcribe":
             from app.services.aws_stt_transcriber import get_aws_stt_transcriber
             aws_transcriber = get_aws_stt_transcriber()
@@ -262,18 +645,36 @@ async def process_jio_transcription_async(request_id: str, tracker: RequestTrack
             provider_display = f"AWS Transcribe ({language})"
         elif provider == "whisper":
             logger.info(f"Processing transcription for request {request_id} with language: {language}, provider: Whisper")
-            transcribe_func = lambda audio_path: stt_transcriber.transcribe_audio(audio_path, language)
+            transcribe_func = partial(stt_transcriber.transcribe_audio, language=language)
             provider_name = "whisper"
             provider_display = f"HuggingFace Whisper ({language})"
         else:
             logger.info(f"Processing transcription for request {request_id} with language: {language}, provider: Jio")
-            transcribe_func = lambda audio_path: jio_only_stt_transcriber.transcribe_audio(audio_path, language)
+            # Chunk results are checkpointed per media content, so a retry or a re-upload of the
+            # same file only sends chunks that never came back
+            file_metadata = await tracker.get_object(request_id, "file_metadata") or {}
+            media_sha256 = file_metadata.get("sha256") if settings.MEDIA_DEDUP_ENABLED else None
+            checkpoints.append(ChunkCheckpoint(tracker, request_id, f"jio:{language}", media_sha256))
+            transcribe_func = partial(
+                jio_only_stt_transcriber.transcribe_audio, language=language, checkpoint=checkpoints[-1]
+            )
+            if settings.JIO_STT_STREAMING:
+                # Streamed chunks are cut from the uncompacted timeline while the file path above
+                # reads VAD-compacted audio, so the same range holds different speech: the two
+                # variants cannot share chunk results and are keyed apart on purpose
+                checkpoints.append(ChunkCheckpoint(tracker, request_id, f"jio-stream:{language}", media_sha256))
+                stream_transcribe_func = partial(
+                    jio_only_stt_transcriber.transcribe_stream, language=language, checkpoint=checkpoints[-1]
+                )
             provider_name = "jio_translate"
             provider_display = f"Jio Translate API ({language})"
 
         await _process_transcription_common(
             request_id, tracker, transcribe_func,
-            provider_name, provider_display
+            provider_name, provider_display,
+            cache_variant=f"{provider_name}:{language}",
+            stream_transcribe_func=stream_transcribe_func,
+            checkpoints=checkpoints
         )
     except Exception as e:
         logger.error(f"Error in transcription processing: {e}")
@@ -284,9 +685,15 @@ async def process_jio_transcription_async(request_id: str, tracker: RequestTrack
 
 async def _process_transcription_common(
     request_id: str, tracker: RequestTracker, transcribe_func, 
-    provider_name: str, provider_display: str
+    provider_name: str, provider_display: str, cache_variant: str = None,
+    stream_transcribe_func=None, checkpoints=()
 ):
-    """Common transcription processing logic"""
+    """Common transcription processing logic.
+
+    cache_variant identifies provider+language for content-addressed dedup of raw transcriptions.
+    stream_transcribe_func, if given, takes PCM blocks and lets a fresh request transcribe
+    while ffmpeg is still decoding. checkpoints are cleared once the transcription is stored.
+    """
     audio_path = None
     stored_path = None
     
@@ -299,17 +706,34 @@ async def _process_transcription_common(
         
         stored_path = file_metadata["stored_path"]
         
-        # Audio extraction
-        audio_path = await _handle_audio_extraction(request_id, tracker, file_metadata, stored_path)
-        if not audio_path:
-            return
+        # A byte-identical upload may already have been transcribed: skip ffmpeg and STT entirely
+        transcription = await _reuse_cached_transcription(request_id, tracker, file_metadata, cache_variant)
         
-        # Transcription
-        transcription = await _handle_transcription_with_provider(
-            request_id, tracker, audio_path, transcribe_func, provider_name
-        )
-        if not transcription:
-            return
+        if not transcription and stream_transcribe_func and await _can_stream_transcription(request_id, tracker, file_metadata):
+            # Decode and transcribe together; the uncompacted WAV is written alongside for resume and dedup
+            audio_path = os.path.join(os.path.dirname(stored_path), "full_audio.wav")
+            transcription = await _handle_streaming_transcription(
+                request_id, tracker, stored_path, audio_path, stream_transcribe_func, provider_name,
+                file_metadata.get("sha256"), cache_variant
+            )
+            if not transcription:
+                return
+        elif not transcription:
+            # Audio extraction
+            audio_path = await _handle_audio_extraction(request_id, tracker, file_metadata, stored_path)
+            if not audio_path:
+                return
+            
+            # Transcription
+            transcription = await _handle_transcription_with_provider(
+                request_id, tracker, audio_path, transcribe_func, provider_name,
+                file_metadata.get("sha256"), cache_variant
+            )
+            if not transcription:
+                return
+        
+        for checkpoint in checkpoints:
+            await checkpoint.clear()
         
         # LLM enhancement with multilingual output
         llm_result = await _handle_llm_enhancement(request_id, tracker, transcription)
@@ -319,12 +743,26 @@ async def _process_transcription_common(
             request_id, tracker, transcription, llm_result, provider_name, provider_display
         )
 
+    except asyncio.CancelledError:
+        # Shutdown: keep the normalized WAV so the resumed job does not run ffmpeg again
+        audio_path = None
+        raise
     except Exception as e:
         logger.exception(f"Error in transcription processing for request {request_id}")
         await tracker.update_request_status(request_id, RequestStatus.FAILED, error_message=str(e))
     finally:
         _cleanup_audio_file(audio_path, stored_path, request_id)
 
+def _language_publisher(request_id: str, tracker: RequestTracker):
+    """Callback for LLM worker threads that records each language version as soon as it is ready"""
+    loop = asyncio.get_running_loop()
+    
+    def publish(key: str, value):
+        future = asyncio.run_coroutine_threadsafe(tracker.store_partial_result(request_id, key, value), loop)
+        future.result(timeout=30)
+    
+    return publish
+
 async def process_mom_generation_async(request_id: str, tracker: RequestTracker):
     """Background processing for MOM generation with multilingual output"""
     try:
@@ -338,7 +776,9 @@ async def process_mom_generation_async(request_id: str, tracker: RequestTracker)
         transcription = data["transcription"]
         
         # FIX: Generate multilingual MOM in a separate thread
-        mom_result = await asyncio.to_thread(llm_service.generate_multilingual_mom, transcription, language)
+        mom_result = await asyncio.to_thread(
+            llm_service.generate_multilingual_mom, transcription, language, _language_publisher(request_id, tracker)
+        )
         
         # Create final response with new format
         final_response = {
@@ -348,7 +788,8 @@ async def process_mom_generation_async(request_id: str, tracker: RequestTracker)
             "hindi_mom": mom_result.get("hindi_mom", ""),
             "primary_language": language,
             "input_transcription_length": len(transcription),
-            "llm_status": mom_result.get("status", "unknown")
+            "llm_status": mom_result.get("status", "unknown"),
+            "failed_languages": mom_result.get("failed_languages", [])
         }
         
         await tracker.store_object(request_id, "final_response", final_response)
@@ -374,7 +815,9 @@ async def process_agenda_generation_async(request_id: str, tracker: RequestTrack
             raise Exception("Issues list is required")
         
         # FIX: Generate multilingual agenda in a separate thread
-        agenda_result = await asyncio.to_thread(llm_service.generate_multilingual_agenda_from_issues, issues, language)
+        agenda_result = await asyncio.to_thread(
+            llm_service.generate_multilingual_agenda_from_issues, issues, language, _language_publisher(request_id, tracker)
+        )
         
         # Create final response with new format
         final_response = {
@@ -385,6 +828,7 @@ async def process_agenda_generation_async(request_id: str, tracker: RequestTrack
             "primary_language": language,
             "total_issues": len(issues),
             "llm_status": agenda_result.get("status", "unknown"),
+            "failed_languages": agenda_result.get("failed_languages", []),
             "processing_type": "issues_to_multilingual_agenda"
         }
         
@@ -414,7 +858,10 @@ async def process_agenda_update_async(request_id: str, tracker: RequestTracker):
             raise Exception("New issues are required")
         
         # FIX: Update agenda with multilingual output in a separate thread
-        update_result = await asyncio.to_thread(llm_service.update_multilingual_agenda_with_issues, current_agenda, new_issues, language)
+        update_result = await asyncio.to_thread(
+            llm_service.update_multilingual_agenda_with_issues, current_agenda, new_issues, language,
+            _language_publisher(request_id, tracker)
+        )
         
         # Create final response with new format
         final_response = {
@@ -426,6 +873,7 @@ async def process_agenda_update_async(request_id: str, tracker: RequestTracker):
             "original_items_count": len(current_agenda),
             "new_issues_count": len(new_issues),
             "llm_status": update_result.get("status", "unknown"),
+            "failed_languages": update_result.get("failed_languages", []),
             "processing_type": "multilingual_agenda_update"
         }
         
@@ -467,6 +915,16 @@ async def process_translation_async(request_id: str, tracker: RequestTracker):
 
 # ======================= TRANSCRIPTION HELPERS =======================
 
+# Pipeline for each request type; queue workers look processors up here
+REQUEST_PROCESSORS = {
+    RequestType.TRANSCRIPTION: process_transcription_async,
+    RequestType.TRANSCRIPTION_JIO: process_jio_transcription_async,
+    RequestType.MOM_GENERATION: process_mom_generation_async,
+    RequestType.AGENDA_GENERATION: process_agenda_generation_async,
+    RequestType.AGENDA_UPDATE: process_agenda_update_async,
+    RequestType.TRANSLATION: process_translation_async,
+}
+
 async def _handle_audio_extraction(request_id: str, tracker: RequestTracker, file_metadata: dict, stored_path: str) -> str:
     """Handle audio extraction with resume capability"""
     existing_audio_path = await tracker.get_object(request_id, "audio_file_path")
@@ -474,21 +932,93 @@ async def _handle_audio_extraction(request_id: str, tracker: RequestTracker, fil
         await tracker.update_request_status(request_id, RequestStatus.RESUMED, "transcription", progress=30)
         return existing_audio_path
     
-    await tracker.update_request_status(request_id, RequestStatus.PROCESSING, "audio_extraction", progress=10)
+    # Reuse normalized audio from an earlier upload of the same content
+    media_sha256 = file_metadata.get("sha256")
+    if media_sha256 and settings.MEDIA_DEDUP_ENABLED:
+        media_entry = await tracker.get_media_entry(media_sha256)
+        if media_entry and media_entry.get("audio_path"):
+            audio_path = file_storage.link_cached_artifact(media_entry["audio_path"], request_id, "normalized_audio.wav")
+            if audio_path:
+                logger.info(f"Reusing normalized audio for request {request_id} (content {media_sha256[:12]})")
+                await _store_audio_artifact(request_id, tracker, audio_path)
+                return audio_path
     
-    # FIX: Run the blocking audio_extractor in a separate thread
-    audio_path = await asyncio.to_thread(audio_extractor.extract_audio, stored_path)
+    # A streamed attempt already decoded the full timeline; only VAD is left to do
+    audio_path = await _find_full_audio(request_id, tracker, media_sha256)
+    if audio_path:
+        logger.info(f"Reusing streamed full audio for request {request_id}")
+    else:
+        await tracker.update_request_status(request_id, RequestStatus.PROCESSING, "audio_extraction", progress=10)
+        
+        # FIX: Run the blocking audio_extractor in a separate thread
+        audio_path = await asyncio.to_thread(audio_extractor.extract_audio, stored_path)
     
     if not audio_path:
         await tracker.update_request_status(request_id, RequestStatus.FAILED, "Audio extraction failed")
         return ""
     
-    await tracker.store_object(request_id, "audio_file_path", audio_path)
+    # Drop long non-speech stretches once, so every STT provider bills and waits only for speech
+    if voice_activity_detector.enabled:
+        try:
+            speech_path = await asyncio.to_thread(voice_activity_detector.compact_silences, audio_path)
+            if speech_path != audio_path:
+                if audio_path != stored_path:
+                    os.remove(audio_path)
+                audio_path = speech_path
+        except Exception as e:
+            logger.warning(f"Voice activity trimming failed for request {request_id}, using full audio: {e}")
+    
+    if media_sha256 and settings.MEDIA_DEDUP_ENABLED:
+        cached_audio_path = file_storage.cache_media_artifact(media_sha256, audio_path, ".wav")
+        if cached_audio_path:
+            await tracker.record_media_artifact(media_sha256, "audio_path", cached_audio_path)
+    
+    await _store_audio_artifact(request_id, tracker, audio_path)
     return audio_path
 
+async def _find_full_audio(request_id: str, tracker: RequestTracker, media_sha256: Optional[str]) -> Optional[str]:
+    """Uncompacted WAV left by a streamed transcription of this request or of the same content"""
+    full_audio_path = await tracker.get_object(request_id, "full_audio_path")
+    if full_audio_path and os.path.exists(full_audio_path):
+        return full_audio_path
+    if media_sha256 and settings.MEDIA_DEDUP_ENABLED:
+        media_entry = await tracker.get_media_entry(media_sha256)
+        if media_entry and media_entry.get("full_audio_path"):
+            return file_storage.link_cached_artifact(media_entry["full_audio_path"], request_id, "full_audio.wav")
+    return None
+
+async def _store_audio_artifact(request_id: str, tracker: RequestTracker, audio_path: str):
+    """Record the canonical audio artifact and its format; providers consume it by path"""
+    audio_metadata = await asyncio.to_thread(audio_extractor.describe_audio, audio_path)
+    if not audio_metadata["canonical"]:
+        logger.warning(f"Normalized audio for request {request_id} is not canonical: {audio_metadata}")
+    await tracker.store_object(request_id, "audio_metadata", audio_metadata)
+    await tracker.store_object(request_id, "audio_file_path", audio_path)
+
+async def _reuse_cached_transcription(
+    request_id: str, tracker: RequestTracker, file_metadata: dict, cache_variant: str
+) -> str:
+    """Return a raw transcription already produced for identical media, if any"""
+    media_sha256 = file_metadata.get("sha256")
+    if not media_sha256 or not cache_variant or not settings.MEDIA_DEDUP_ENABLED:
+        return ""
+    
+    # A resumed request may already hold its own transcription
+    if await tracker.get_object(request_id, "raw_transcription"):
+        return ""
+    
+    cached_transcription = await tracker.get_cached_transcription(media_sha256, cache_variant)
+    if not cached_transcription:
+        return ""
+    
+    logger.info(f"Reusing {cache_variant} transcription for request {request_id} (content {media_sha256[:12]})")
+    await tracker.store_object(request_id, "raw_transcription", cached_transcription)
+    await tracker.update_request_status(request_id, RequestStatus.PROCESSING, "llm_enhancement", progress=70)
+    return cached_transcription
+
 async def _handle_transcription_with_provider(
     request_id: str, tracker: RequestTracker, audio_path: str, 
-    transcribe_func, provider_name: str
+    transcribe_func, provider_name: str, media_sha256: str = None, cache_variant: str = None
 ) -> str:
     """Handle transcription with any provider"""
     existing_transcription = await tracker.get_object(request_id, "raw_transcription")
@@ -499,20 +1029,76 @@ async def _handle_transcription_with_provider(
     await tracker.update_request_status(request_id, RequestStatus.PROCESSING, f"{provider_name}_transcription", progress=40)
     
     try:
-        # FIX: Run the blocking transcribe_func in a separate thread
-        transcription = await asyncio.to_thread(transcribe_func, audio_path)
+        if inspect.iscoroutinefunction(transcribe_func):
+            # Async-native providers share the pooled HTTP client and need no thread
+            transcription = await transcribe_func(audio_path)
+        else:
+            # FIX: Run the blocking transcribe_func in a separate thread
+            transcription = await asyncio.to_thread(transcribe_func, audio_path)
         
         if not transcription or not transcription.strip():
             await _create_empty_transcription_response(request_id, tracker, provider_name)
             return ""
         
         await tracker.store_object(request_id, "raw_transcription", transcription)
+        if media_sha256 and cache_variant and settings.MEDIA_DEDUP_ENABLED:
+            await tracker.record_cached_transcription(media_sha256, cache_variant, transcription)
         return transcription
         
     except Exception as e:
         await _create_failed_transcription_response(request_id, tracker, provider_name, str(e))
         return ""
 
+async def _can_stream_transcription(request_id: str, tracker: RequestTracker, file_metadata: dict) -> bool:
+    """Streaming only pays off for a fresh decode; resumed or deduplicated audio is already on disk"""
+    if await tracker.get_object(request_id, "raw_transcription"):
+        return False
+    for field in ("audio_file_path", "full_audio_path"):
+        existing_audio_path = await tracker.get_object(request_id, field)
+        if existing_audio_path and os.path.exists(existing_audio_path):
+            return False
+    media_sha256 = file_metadata.get("sha256")
+    if media_sha256 and settings.MEDIA_DEDUP_ENABLED:
+        media_entry = await tracker.get_media_entry(media_sha256) or {}
+        for field in ("audio_path", "full_audio_path"):
+            if media_entry.get(field) and os.path.exists(media_entry[field]):
+                return False
+    return True
+
+async def _handle_streaming_transcription(
+    request_id: str, tracker: RequestTracker, stored_path: str, audio_path: str,
+    stream_transcribe_func, provider_name: str, media_sha256: str = None, cache_variant: str = None
+) -> str:
+    """Transcribe while ffmpeg decodes; on success audio_path holds the normalized WAV.
+
+    That WAV skips voice activity compaction, so it is kept apart from the compacted
+    audio ("full_audio_path", ".full.wav") and every provider still gets the same input.
+    """
+    await tracker.update_request_status(request_id, RequestStatus.PROCESSING, f"{provider_name}_transcription", progress=20)
+    
+    try:
+        with contextlib.closing(audio_extractor.stream_pcm(stored_path, audio_path)) as pcm_blocks:
+            transcription = await stream_transcribe_func(pcm_blocks)
+    except Exception as e:
+        await _create_failed_transcription_response(request_id, tracker, provider_name, str(e))
+        return ""
+    
+    if os.path.exists(audio_path):
+        if media_sha256 and settings.MEDIA_DEDUP_ENABLED:
+            cached_audio_path = file_storage.cache_media_artifact(media_sha256, audio_path, ".full.wav")
+            if cached_audio_path:
+                await tracker.record_media_artifact(media_sha256, "full_audio_path", cached_audio_path)
+        await tracker.store_object(request_id, "full_audio_path", audio_path)
+    
+    if not transcription or not transcription.strip():
+        await _create_empty_transcription_response(request_id, tracker, provider_name)
+        return ""
+    
+    await tracker.store_object(request_id, "raw_transcription", transcription)
+    if media_sha256 and cache_variant and settings.MEDIA_DEDUP_ENABLED:
+        await tracker.record_cached_transcription(media_sha256, cache_variant, transcription)
+    return transcription
+
 async def _handle_llm_enhancement(request_id: str, tracker: RequestTracker, transcription: str) -> dict:
     """Handle LLM enhancement with resume capability"""
     existing_llm_result = await tracker.get_object(request_id, "llm_result")
@@ -639,13 +1225,17 @@ async def _get_result_response(request_id: str, tracker: RequestTracker, cleanup
             "status": "failed"
         })
     else:
-        return {
+        response = {
             "request_id": request_id,
             "status": status["status"],
             "progress": status.get("progress_percentage", 0),
             "current_step": status.get("current_step"),
             "message": "Processing not completed yet. Check status endpoint for updates."
         }
+        if status.get("partial_results"):
+            # Language versions that are already finished
+            response["partial_results"] = status["partial_results"]
+        return response
 
 # Result endpoints
 @router.get("/transcription/{request_id}/result")
@@ -697,6 +1287,36 @@ async def text_to_speech(
         logger.error(f"TTS error: {e}")
         raise HTTPException(status_code=500, detail=f"TTS synthesis failed: {str(e)}")
 
+@router.post("/tts/stream")
+async def text_to_speech_stream(
+    text: str = Body(..., embed=True),
+    language: str = Body("hi", embed=True),
+):
+    """Stream speech for long text: sentence-bounded segments are synthesized concurrently and sent in order."""
+    if not tts_service.is_available():
+        raise HTTPException(status_code=503, detail="TTS service not available")
+
+    if not text or not text.strip():
+        raise HTTPException(status_code=400, detail="Text is required")
+
+    audio_stream = tts_service.synthesize_stream(text, language)
+    try:
+        # The first segment is synthesized before responding, so Polly failures still get an error status
+        first_segment = await asyncio.to_thread(next, audio_stream, b"")
+    except Exception as e:
+        logger.error(f"TTS stream error: {e}")
+        raise HTTPException(status_code=500, detail=f"TTS synthesis failed: {str(e)}")
+
+    def remaining_segments():
+        yield first_segment
+        try:
+            yield from audio_stream
+        except Exception as e:
+            # Headers are already sent; the client sees a truncated stream
+            logger.error(f"TTS stream interrupted: {e}")
+
+    return StreamingResponse(remaining_segments(), media_type="audio/mpeg")
+
 # ======================= COMPREHEND ENDPOINT =======================
 
 @router.post("/analyze/issue")
@@ -765,6 +1385,17 @@ async def health_check_services():
             "llm_service": {
                 "provider": llm_provider_display,
                 "status": llm_status,
+                "response_cache": {"enabled": settings.LLM_CACHE_ENABLED, **llm_response_cache.stats()},
+                "translation_memory": {"enabled": settings.TRANSLATION_MEMORY_ENABLED, **translation_memory.cache.stats()},
+            },
+            "job_scheduler": {"execution_mode": settings.EXECUTION_MODE, **job_scheduler.stats()},
+            "tts_service": {
+                "status": "configured" if tts_service.is_available() else "not_configured",
+                "local_cache": tts_local_cache.stats()
+            },
+            "issue_analysis": {
+                "status": "configured" if comprehend_service.is_available() else "not_configured",
+                "preclassifier": issue_preclassifier.stats()
             }
         },
         "available_endpoints": {
@@ -773,7 +1404,8 @@ async def health_check_services():
             "mom_generation": "/mom/generate/{language}",
             "agenda_generation": "/agenda/generate/{language} (from issues with IDs)",
             "agenda_update": "/agenda/update/{language} (with new issues)",
-            "translation": "/translate"
+            "translation": "/translate",
+            "translation_batch": "/translate/batch"
         }
     }
 
@@ -6,6 +6,12 @@ class Settings(BaseSettings):
 
     # Jio STT Service (optional — not needed if using whisper only)
     JIO_API_KEY: Optional[str] = None
+    JIO_STT_MAX_CONCURRENCY: int = 4  # parallel chunk requests to the Jio API (process-wide)
+    # Send Jio chunks while ffmpeg is still decoding instead of waiting for the full WAV
+    JIO_STT_STREAMING: bool = True
+    # A chunk still without a result after these retries fails the transcription (finished chunks stay checkpointed)
+    JIO_STT_CHUNK_RETRIES: int = 2
+    JIO_STT_RETRY_BASE_SECONDS: float = 2.0
 
     # Hugging Face Services (optional — not needed if using bedrock)
     HF_TOKEN: Optional[str] = None
@@ -17,6 +23,47 @@ class Settings(BaseSettings):
     MONGODB_URL: str
     DATABASE_NAME: str
 
+    # --- Uploads ---
+    MAX_UPLOAD_SIZE_MB: int = 2048
+    UPLOAD_CHUNK_SIZE_KB: int = 1024
+    # Resumable uploads: default part size offered to clients, and how long sessions live
+    RESUMABLE_CHUNK_SIZE_MB: int = 5
+    RESUMABLE_UPLOAD_TTL_HOURS: int = 24
+    # Reuse normalized audio and raw transcriptions for byte-identical re-uploads
+    MEDIA_DEDUP_ENABLED: bool = True
+
+    # --- Voice Activity Detection ---
+    # Cut STT chunks in silences and drop long non-speech stretches before transcription
+    VAD_ENABLED: bool = True
+    VAD_FRAME_MS: int = 30
+    VAD_THRESHOLD_DB: float = 12.0  # speech must be this far above the recording's noise floor
+    VAD_MIN_SILENCE_MS: int = 700  # shorter pauses are kept inside a speech region
+    VAD_SPEECH_PAD_MS: int = 200
+    VAD_COMPACT_GAP_MS: int = 400  # silence left between speech regions in trimmed audio
+
+    # --- Outbound HTTP (shared keep-alive pools for Jio, Hugging Face, transcript downloads) ---
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 60.0
+    HTTP_CONNECT_TIMEOUT_SECONDS: float = 10.0
+    HTTP_TIMEOUT_SECONDS: float = 60.0
+    HTTP2_ENABLED: bool = True  # used only when the h2 package is installed
+
+    # --- Background Jobs ---
+    # Concurrent pipelines per job type; further jobs wait in a bounded queue
+    JOB_MAX_TRANSCRIPTION: int = 2
+    JOB_MAX_LLM: int = 4
+    JOB_MAX_TRANSLATION: int = 8
+    JOB_QUEUE_MAX_PENDING: int = 50  # beyond this new requests get HTTP 429
+    JOB_RETRY_AFTER_SECONDS: int = 30
+    JOB_DRAIN_TIMEOUT_SECONDS: int = 60  # how long shutdown waits for running jobs
+    # "inline": the API process runs pipelines; "queue": they are claimed by `python -m app.worker`
+    EXECUTION_MODE: str = "inline"
+    JOB_LEASE_SECONDS: int = 120  # a worker must heartbeat within this or its job is reclaimed
+    JOB_HEARTBEAT_SECONDS: int = 30
+    JOB_MAX_ATTEMPTS: int = 3
+    WORKER_POLL_INTERVAL_SECONDS: float = 2.0
+
     # --- AI Provider Selection ---
     STT_PROVIDER: str = "jio"  # "jio" | "whisper" | "aws_transcribe"
     LLM_PROVIDER: str = "huggingface"  # "huggingface" | "bedrock"
@@ -28,6 +75,36 @@ class Settings(BaseSettings):
     AWS_SECRET_ACCESS_KEY: Optional[str] = None
     BEDROCK_MODEL_ID: str = "anthropic.claude-3-sonnet-20240229-v1:0"
     BEDROCK_MAX_TOKENS: int = 4096
+    # In-flight LLM calls per process across all pipelines, and retries when the provider throttles
+    LLM_MAX_CONCURRENCY: int = 4
+    LLM_MAX_RETRIES: int = 3
+    LLM_RETRY_BASE_SECONDS: float = 2.0
+    # Bedrock account quota (requests per minute, 0 = unlimited) shared by all Bedrock calls in a process
+    BEDROCK_REQUESTS_PER_MINUTE: int = 0
+    BEDROCK_BURST: int = 5
+    # Prompt sizing: tokenizer.json path or HF Hub id for exact counts (per-script estimates otherwise),
+    # and overrides for the model's context window and the per-chunk input budget for transcript correction
+    LLM_TOKENIZER: Optional[str] = None
+    LLM_CONTEXT_WINDOW: Optional[int] = None
+    LLM_CHUNK_TOKEN_BUDGET: Optional[int] = None
+    # Transcripts above this many tokens get MOMs by map-reduce: key points per segment, then one synthesis
+    MOM_MAP_REDUCE_THRESHOLD_TOKENS: int = 12000
+    MOM_SEGMENT_TOKENS: int = 6000
+    # Generate MOMs, agendas and corrections in English only, then translate the other languages concurrently
+    LLM_LANGUAGE_FANOUT: bool = True
+    # Identical LLM requests (translations, agendas, corrections) are answered from an LRU + MongoDB cache
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_MAX_ENTRIES: int = 1000
+    LLM_CACHE_TTL_HOURS: int = 168
+    # Cache reads and writes to MongoDB give up after this long and count as a miss
+    LLM_CACHE_DB_TIMEOUT_MS: int = 500
+    # Sentence-level translation memory: repeated sentences are translated once per target language
+    TRANSLATION_MEMORY_ENABLED: bool = True
+    TRANSLATION_MEMORY_MAX_ENTRIES: int = 5000
+    TRANSLATION_MEMORY_TTL_DAYS: int = 90
+    # Largest /translate/batch request
+    TRANSLATE_BATCH_MAX_SEGMENTS: int = 1000
+    TRANSLATE_BATCH_MAX_LANGUAGES: int = 10
     AWS_TRANSCRIBE_BUCKET: str = "egramsabha-transcribe-temp"
 
     # CloudWatch Logging
@@ -37,9 +114,32 @@ class Settings(BaseSettings):
     # TTS (Polly)
     TTS_PROVIDER: str = "polly"  # "polly" | "disabled"
     S3_BUCKET: str = "egramsabha-assets"
+    # Local tier in front of the S3 audio cache: disk LRU capped at TTS_CACHE_DISK_MB (0 disables it)
+    # plus an in-memory hot set of TTS_CACHE_MEMORY_MB
+    TTS_CACHE_DIR: str = "tts_cache"
+    TTS_CACHE_DISK_MB: int = 512
+    TTS_CACHE_MEMORY_MB: int = 32
+    # Segments synthesized concurrently for /tts/stream and long /tts/speak texts
+    TTS_STREAM_CONCURRENCY: int = 4
 
     # Comprehend
     COMPREHEND_ENABLED: bool = True
+    # Issues analyzed concurrently by /analyze/batch (still bounded by BEDROCK_REQUESTS_PER_MINUTE)
+    COMPREHEND_MAX_CONCURRENCY: int = 8
+    # Issues sent together in one analysis prompt (1 = one request per issue), and their combined text limit
+    COMPREHEND_PACK_SIZE: int = 20
+    COMPREHEND_PACK_MAX_CHARS: int = 20000
+    COMPREHEND_MAX_TEXT_CHARS: int = 5000
+    # Local lexicon + linear-model pass; issues it is confident about skip Bedrock. It trains on the
+    # Bedrock analyses it records once MIN_SAMPLES exist, and retrains after every RETRAIN_EVERY new ones
+    ISSUE_PRECLASSIFIER_ENABLED: bool = True
+    ISSUE_PRECLASSIFIER_CONFIDENCE: float = 0.85
+    ISSUE_PRECLASSIFIER_MIN_SAMPLES: int = 200
+    ISSUE_PRECLASSIFIER_MAX_SAMPLES: int = 2000
+    ISSUE_PRECLASSIFIER_RETRAIN_EVERY: int = 100
+    # Recorded issue texts are citizen data: they expire after this many days, and only the newest
+    # MAX_SAMPLES are kept
+    ISSUE_PRECLASSIFIER_RETENTION_DAYS: int = 90
 
     class Config:
         # This tells pydantic to load variables from a .env file
@@ -1,9 +1,12 @@
 import os
 import logging
+import threading
 import urllib.request
 from pathlib import Path
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
-from typing import Optional
+from pymongo import MongoClient
+from pymongo.database import Database
+from typing import Dict, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +30,9 @@ CA_BUNDLE_PATH = Path(__file__).parent.parent.parent / "certs" / "global-bundle.
 
 # MongoDB connection
 mongodb_client: Optional[AsyncIOMotorClient] = None
+# Blocking clients for services that run in worker threads, one per operation timeout (created on first use)
+sync_mongodb_clients: Dict[Optional[int], MongoClient] = {}
+_sync_client_lock = threading.Lock()
 
 
 def _is_documentdb(url: str) -> bool:
@@ -45,11 +51,7 @@ def _ensure_ca_bundle() -> str:
     return str(CA_BUNDLE_PATH)
 
 
-async def connect_to_mongo():
-    """Create database connection (MongoDB or DocumentDB)."""
-    global mongodb_client
-    mongodb_url = os.getenv("MONGODB_URL", "mongodb://localhost:27017")
-
+def _client_kwargs(mongodb_url: str) -> dict:
     kwargs = {}
 
     if _is_documentdb(mongodb_url):
@@ -60,15 +62,42 @@ async def connect_to_mongo():
         logger.info("[DB] Connecting to Amazon DocumentDB with TLS")
     else:
         logger.info("[DB] Connecting to MongoDB")
+    return kwargs
 
-    mongodb_client = AsyncIOMotorClient(mongodb_url, **kwargs)
+
+async def connect_to_mongo():
+    """Create database connection (MongoDB or DocumentDB)."""
+    global mongodb_client
+    mongodb_url = os.getenv("MONGODB_URL", "mongodb://localhost:27017")
+    mongodb_client = AsyncIOMotorClient(mongodb_url, **_client_kwargs(mongodb_url))
 
 async def close_mongo_connection():
     """Close database connection"""
     if mongodb_client:
         mongodb_client.close()
+    with _sync_client_lock:
+        for client in sync_mongodb_clients.values():
+            client.close()
+        sync_mongodb_clients.clear()
 
 async def get_database() -> AsyncIOMotorDatabase:
     """Get database instance"""
     database_name = os.getenv("DATABASE_NAME", "eGramSabha")
-    return mongodb_client[database_name]
\ No newline at end of file
+    return mongodb_client[database_name]
+
+def get_sync_database(timeout_ms: Optional[int] = None) -> Database:
+    """Get a blocking database instance for code running outside the event loop.
+
+    With timeout_ms, server selection, connecting and every socket read give up after
+    that long, for optional lookups (caches) that must not stall a request during an outage.
+    """
+    with _sync_client_lock:
+        client = sync_mongodb_clients.get(timeout_ms)
+        if client is None:
+            mongodb_url = os.getenv("MONGODB_URL", "mongodb://localhost:27017")
+            kwargs = _client_kwargs(mongodb_url)
+            if timeout_ms is not None:
+                kwargs.update(serverSelectionTimeoutMS=timeout_ms, connectTimeoutMS=timeout_ms, socketTimeoutMS=timeout_ms)
+            client = sync_mongodb_clients[timeout_ms] = MongoClient(mongodb_url, **kwargs)
+    database_name = os.getenv("DATABASE_NAME", "eGramSabha")
+    return client[database_name]
@@ -1,19 +1,28 @@
 import os
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
 import asyncio
 import logging
 from dotenv import load_dotenv
 
-from app.api.endpoints import router as api_router
+from app.api.endpoints import router as api_router, recover_interrupted_jobs
 from app.core.database import connect_to_mongo, close_mongo_connection, get_database
 from app.services.file_storage import file_storage
 from app.services.request_tracker import RequestTracker
+from app.services.upload_manager import ResumableUploadManager
+from app.services.http_client import http_clients
+from app.services.job_scheduler import job_scheduler
+from app.services.job_queue import JobQueue, PROCESS_ID
+from app.core.config import settings
 
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# Form fields and part headers that come with an uploaded file in a multipart body
+MULTIPART_OVERHEAD_BYTES = 1024 * 1024
+
 # Configure CloudWatch logging if AWS credentials available
 def _setup_cloudwatch_logging():
     if os.environ.get("AWS_REGION") or os.environ.get("AWS_ACCESS_KEY_ID"):
@@ -37,14 +46,47 @@ _setup_cloudwatch_logging()
 async def lifespan(app: FastAPI):
     # Startup
     await connect_to_mongo()
+    await recover_jobs_on_startup()
     cleanup_task = asyncio.create_task(periodic_cleanup())
+    lease_task = asyncio.create_task(renew_job_leases())
     
     yield
     
     # Shutdown
     cleanup_task.cancel()
+    # Keep renewing leases while jobs drain, or another replica could claim a job still running here
+    await job_scheduler.drain(settings.JOB_DRAIN_TIMEOUT_SECONDS)
+    lease_task.cancel()
+    await lease_task
+    await JobQueue(await get_database()).expire_leases(PROCESS_ID)
+    await http_clients.aclose()
     await close_mongo_connection()
 
+async def recover_jobs_on_startup():
+    """Resume pipelines that a previous process left unfinished"""
+    try:
+        db = await get_database()
+        await JobQueue(db).setup()
+        resumed = await recover_interrupted_jobs(db)
+        if resumed:
+            logger.info(f"Resumed {resumed} interrupted jobs")
+    except Exception as e:
+        logger.error(f"Job recovery failed: {e}")
+
+async def renew_job_leases():
+    """Keep this process's job leases alive; they lapse if the process dies"""
+    while True:
+        try:
+            await asyncio.sleep(settings.JOB_HEARTBEAT_SECONDS)
+            
+            db = await get_database()
+            await JobQueue(db).renew_leases(PROCESS_ID)
+            
+        except asyncio.CancelledError:
+            break
+        except Exception as e:
+            logger.error(f"Lease renewal error: {e}")
+
 async def periodic_cleanup():
     """Periodic cleanup every hour"""
     while True:
@@ -54,6 +96,9 @@ async def periodic_cleanup():
             db = await get_database()
             tracker = RequestTracker(db)
             await tracker.cleanup_expired_requests()
+            await ResumableUploadManager(db).cleanup_expired_sessions()
+            # Jobs of replicas that died without restarting
+            await recover_interrupted_jobs(db)
             file_storage.cleanup_old_files(hours_old=24)
             
         except asyncio.CancelledError:
@@ -84,6 +129,20 @@ async def validate_api_key(request, call_next):
 
     return await call_next(request)
 
+# Multipart uploads are spooled by Starlette before a handler runs, so the size cap is enforced here
+@app.middleware("http")
+async def limit_upload_size(request, call_next):
+    if request.method == "POST" and request.headers.get("content-type", "").startswith("multipart/form-data"):
+        declared = request.headers.get("content-length")
+        if not declared or not declared.isdigit():
+            return JSONResponse(status_code=411, content={"detail": "Content-Length is required for file uploads"})
+        if int(declared) > file_storage.max_upload_bytes + MULTIPART_OVERHEAD_BYTES:
+            return JSONResponse(
+                status_code=413,
+                content={"detail": f"File too large. Maximum size is {settings.MAX_UPLOAD_SIZE_MB} MB"}
+            )
+    return await call_next(request)
+
 app.include_router(api_router)
 
 @app.get("/")
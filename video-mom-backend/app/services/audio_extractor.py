@@ -2,10 +2,20 @@ import ffmpeg
 import os
 import wave
 import logging
+import tempfile
+import subprocess
+from typing import Iterator, Optional
 
 logger = logging.getLogger(__name__)
 
 class AudioExtractor:
+    """Normalizes uploaded media into the canonical audio artifact every STT provider consumes"""
+
+    # Canonical format: 16kHz, mono, 16-bit PCM WAV
+    SAMPLE_RATE = 16000
+    CHANNELS = 1
+    SAMPLE_WIDTH = 2
+
     def __init__(self, output_format='wav'):
         self.output_format = output_format
 
@@ -13,19 +23,36 @@ class AudioExtractor:
         """Check if a file is a valid WAV file with the required format (16kHz, mono, 16-bit PCM)."""
         try:
             with wave.open(file_path, 'rb') as wav_file:
-                return (wav_file.getnchannels() == 1 and
-                        wav_file.getsampwidth() == 2 and
-                        wav_file.getframerate() == 16000)
+                return (wav_file.getnchannels() == self.CHANNELS and
+                        wav_file.getsampwidth() == self.SAMPLE_WIDTH and
+                        wav_file.getframerate() == self.SAMPLE_RATE)
         except Exception:
             return False
 
+    def describe_audio(self, wav_path: str) -> dict:
+        """Format metadata of a normalized WAV, read from its header only"""
+        with wave.open(wav_path, 'rb') as wav_file:
+            frames = wav_file.getnframes()
+            sample_rate = wav_file.getframerate()
+            return {
+                "format": "wav",
+                "codec": "pcm_s16le" if wav_file.getsampwidth() == 2 else f"pcm_{wav_file.getsampwidth() * 8}",
+                "sample_rate": sample_rate,
+                "channels": wav_file.getnchannels(),
+                "sample_width": wav_file.getsampwidth(),
+                "num_frames": frames,
+                "duration_ms": int(frames * 1000 / sample_rate) if sample_rate else 0,
+                "size_bytes": os.path.getsize(wav_path),
+                "canonical": self._is_valid_wav(wav_path)
+            }
+
     def _convert_with_ffmpeg(self, input_file_path: str, output_file_path: str) -> str:
         """Convert audio to WAV format (16kHz, mono, 16-bit PCM) using ffmpeg."""
         logger.info(f"Converting audio to proper WAV format: {input_file_path}")
         (
             ffmpeg
             .input(input_file_path)
-            .output(output_file_path, ac=1, ar=16000, format='wav', acodec='pcm_s16le')
+            .output(output_file_path, ac=self.CHANNELS, ar=self.SAMPLE_RATE, format='wav', acodec='pcm_s16le')
             .overwrite_output()
             .run(quiet=True, capture_stdout=True, capture_stderr=True)
         )
@@ -90,6 +117,62 @@ class AudioExtractor:
 
         return audio_file_path
 
+    def stream_pcm(self, input_file_path: str, wav_path: Optional[str] = None, block_ms: int = 1000) -> Iterator[bytes]:
+        """Decode media to canonical PCM and yield it in blocks while ffmpeg is still running.
+
+        If wav_path is given the same PCM is written there as a WAV, so the normalized
+        artifact exists for caching and resume once the stream has been fully consumed.
+        A stream that is abandoned or fails leaves no partial WAV behind.
+        """
+        if not os.path.exists(input_file_path):
+            raise FileNotFoundError(f"Input file not found: {input_file_path}")
+
+        args = (
+            ffmpeg
+            .input(input_file_path)
+            .output('pipe:', format='s16le', acodec='pcm_s16le', ac=self.CHANNELS, ar=self.SAMPLE_RATE)
+            .global_args('-nostdin', '-loglevel', 'error')
+            .compile()
+        )
+        block_size = self.SAMPLE_RATE * self.CHANNELS * self.SAMPLE_WIDTH * block_ms // 1000
+
+        logger.info(f"Streaming audio decode: {input_file_path}")
+        # stderr goes to a file so a chatty ffmpeg can never block on a full pipe
+        with tempfile.TemporaryFile() as stderr:
+            process = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=stderr)
+            wav_file = None
+            completed = False
+            try:
+                if wav_path:
+                    wav_file = wave.open(wav_path, 'wb')
+                    wav_file.setnchannels(self.CHANNELS)
+                    wav_file.setsampwidth(self.SAMPLE_WIDTH)
+                    wav_file.setframerate(self.SAMPLE_RATE)
+
+                while True:
+                    block = process.stdout.read(block_size)
+                    if not block:
+                        break
+                    if wav_file:
+                        wav_file.writeframes(block)
+                    yield block
+
+                if process.wait() != 0:
+                    stderr.seek(0)
+                    error_message = stderr.read().decode('utf-8', errors='replace')
+                    logger.error(f"FFmpeg error streaming {input_file_path}: {error_message}")
+                    raise Exception(f"Audio processing failed: {error_message}")
+                completed = True
+            finally:
+                if process.poll() is None:
+                    process.kill()
+                    process.wait()
+                process.stdout.close()
+                if wav_file:
+                    wav_file.close()
+                if wav_path and not completed and os.path.exists(wav_path):
+                    os.remove(wav_path)
+
     def is_audio_file(self, file_path: str) -> bool:
         """Check if file is an audio file"""
         audio_extensions = ['.wav', '.mp3', '.flac', '.aac', '.ogg', '.m4a', '.wma']
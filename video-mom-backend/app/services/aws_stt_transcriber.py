@@ -2,9 +2,9 @@ import os
 import time
 import uuid
 import logging
-import requests
 import boto3
 from app.core.config import settings
+from app.services.http_client import http_clients
 
 logger = logging.getLogger(__name__)
 
@@ -125,7 +125,7 @@ class AWSTranscribeSTT:
                     transcript_uri = resp["TranscriptionJob"]["Transcript"][
                         "TranscriptFileUri"
                     ]
-                    result = requests.get(transcript_uri, timeout=30).json()
+                    result = http_clients.sync_client.get(transcript_uri, timeout=30).json()
                     transcript = result["results"]["transcripts"][0]["transcript"]
                     logger.info(
                         f"AWS Transcribe job {job_name} completed, length={len(transcript)}"
@@ -1,8 +1,13 @@
 import json
+import time
+import random
 import logging
 import boto3
+from concurrent.futures import ThreadPoolExecutor
 from botocore.exceptions import ClientError
 from app.core.config import settings
+from app.services.rate_limiter import bedrock_rate_limiter
+from app.services.issue_preclassifier import issue_preclassifier
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +29,34 @@ Rules:
 Text to analyze:
 """
 
+PACKED_ANALYSIS_PROMPT = """Analyze each of the following citizen issues independently. The issues are a JSON array of {"id", "text"} objects.
+Return ONLY a valid JSON array with one object per issue, in the same order, with this exact structure:
+[
+  {"id": "<issue id>", "sentiment": {"label": "POSITIVE|NEGATIVE|NEUTRAL|MIXED", "score": 0.0, "scores": {"positive": 0.0, "negative": 0.0, "neutral": 0.0, "mixed": 0.0}}, "keyPhrases": ["phrase1", "phrase2"], "suggestedPriority": "URGENT|NORMAL"}
+]
+
+Rules:
+- id: Copy the issue's id exactly
+- sentiment.label: The dominant sentiment
+- sentiment.score: Confidence of dominant sentiment (0-1)
+- sentiment.scores: All sentiment scores (must sum to ~1.0)
+- keyPhrases: Top key phrases (max 10)
+- suggestedPriority: URGENT if the issue involves health, safety, infrastructure damage, or strong negative sentiment. NORMAL otherwise.
+- Return ONLY the JSON array, no explanation.
+
+Issues to analyze:
+"""
+
+SENTIMENT_LABELS = {"POSITIVE", "NEGATIVE", "NEUTRAL", "MIXED"}
+PRIORITIES = {"URGENT", "NORMAL"}
+
+# Output tokens budgeted per issue in a packed request, on top of a fixed allowance
+PACKED_OUTPUT_TOKENS_PER_ISSUE = 200
+PACKED_OUTPUT_BASE_TOKENS = 256
+
+# Bedrock error codes that mean "slow down" rather than "this request is bad"
+THROTTLING_CODES = {"ThrottlingException", "ServiceUnavailableException", "TooManyRequestsException"}
+
 
 class ComprehendService:
     """Issue analysis using Amazon Bedrock (Nova Lite) for sentiment and key phrase extraction."""
@@ -44,36 +77,30 @@ class ComprehendService:
             logger.error(f"[IssueAnalyzer] Failed to initialize: {e}")
 
     def analyze_issue(self, text: str, language: str = "en") -> dict:
-        """Analyze issue text for sentiment and key phrases using Bedrock."""
+        """Analyze issue text for sentiment and key phrases; clear-cut issues are answered locally."""
         if not self.client or not text or not text.strip():
             return {"sentiment": None, "keyPhrases": []}
 
+        local = issue_preclassifier.classify(text, language)
+        if local is not None:
+            return local
+        return self._analyze_with_bedrock(text, language)
+
+    def _analyze_with_bedrock(self, text: str, language: str = "en") -> dict:
+        """Analyze issue text for sentiment and key phrases using Bedrock."""
+
         result = {"sentiment": None, "keyPhrases": []}
 
         try:
-            response = self.client.converse(
-                modelId=settings.BEDROCK_MODEL_ID,
-                messages=[{
-                    "role": "user",
-                    "content": [{"text": ANALYSIS_PROMPT + text[:5000]}],
-                }],
-                inferenceConfig={"maxTokens": 1024, "temperature": 0.1},
-            )
+            response = self._converse(ANALYSIS_PROMPT + text[:settings.COMPREHEND_MAX_TEXT_CHARS])
 
             response_text = response["output"]["message"]["content"][0]["text"]
-
-            # Extract JSON from response (handle markdown code blocks)
-            json_text = response_text.strip()
-            if json_text.startswith("```"):
-                json_text = json_text.split("```")[1]
-                if json_text.startswith("json"):
-                    json_text = json_text[4:]
-                json_text = json_text.strip()
-
-            parsed = json.loads(json_text)
+            parsed = json.loads(self._extract_json(response_text))
             result["sentiment"] = parsed.get("sentiment")
             result["keyPhrases"] = parsed.get("keyPhrases", [])[:10]
             result["suggestedPriority"] = parsed.get("suggestedPriority", "NORMAL")
+            result["source"] = "bedrock"
+            issue_preclassifier.record(text, language, result)
 
             logger.info(
                 f"[IssueAnalyzer] Analyzed: sentiment={result['sentiment']['label']}, "
@@ -87,19 +114,163 @@ class ComprehendService:
 
         return result
 
+    @staticmethod
+    def _extract_json(response_text: str) -> str:
+        """Strip markdown code fences around a JSON reply."""
+        json_text = response_text.strip()
+        if json_text.startswith("```"):
+            json_text = json_text.split("```")[1]
+            if json_text.startswith("json"):
+                json_text = json_text[4:]
+            json_text = json_text.strip()
+        return json_text
+
+    @staticmethod
+    def _valid_analysis(entry) -> bool:
+        """Whether one packed result has a usable sentiment, key phrases and priority."""
+        if not isinstance(entry, dict):
+            return False
+        sentiment = entry.get("sentiment")
+        key_phrases = entry.get("keyPhrases")
+        return (
+            isinstance(sentiment, dict)
+            and sentiment.get("label") in SENTIMENT_LABELS
+            and isinstance(sentiment.get("score", 0), (int, float))
+            and isinstance(key_phrases, list)
+            and all(isinstance(phrase, str) for phrase in key_phrases)
+            and entry.get("suggestedPriority", "NORMAL") in PRIORITIES
+        )
+
+    def analyze_pack(self, items: list) -> list:
+        """Analyze several issues with one Bedrock request; results are in input order.
+
+        Each returned entry is validated on its own. Issues whose entry is missing or
+        malformed (or all of them, if the reply isn't a JSON array) are analyzed
+        individually with analyze_issue.
+        """
+        results = [None] * len(items)
+        packed = [(str(index + 1), item) for index, item in enumerate(items) if (item.get("text") or "").strip()]
+        for index, item in enumerate(items):
+            if not (item.get("text") or "").strip():
+                results[index] = {"sentiment": None, "keyPhrases": []}
+
+        entries = {}
+        if packed:
+            payload = json.dumps(
+                [{"id": pack_id, "text": item["text"][:settings.COMPREHEND_MAX_TEXT_CHARS]} for pack_id, item in packed],
+                ensure_ascii=False
+            )
+            max_tokens = min(settings.BEDROCK_MAX_TOKENS,
+                             PACKED_OUTPUT_BASE_TOKENS + PACKED_OUTPUT_TOKENS_PER_ISSUE * len(packed))
+            try:
+                response = self._converse(PACKED_ANALYSIS_PROMPT + payload, max_tokens=max_tokens)
+                parsed = json.loads(self._extract_json(response["output"]["message"]["content"][0]["text"]))
+                if isinstance(parsed, list):
+                    entries = {str(entry.get("id")): entry for entry in parsed if isinstance(entry, dict)}
+                else:
+                    logger.error("[IssueAnalyzer] Packed response is not a JSON array")
+            except (json.JSONDecodeError, KeyError, IndexError) as e:
+                logger.error(f"[IssueAnalyzer] Failed to parse packed Bedrock response: {e}")
+            except ClientError as e:
+                logger.error(f"[IssueAnalyzer] Bedrock error on packed request: {e}")
+
+        resent = 0
+        for pack_id, item in packed:
+            index = int(pack_id) - 1
+            entry = entries.get(pack_id)
+            if self._valid_analysis(entry):
+                results[index] = {
+                    "sentiment": entry["sentiment"],
+                    "keyPhrases": entry["keyPhrases"][:10],
+                    "suggestedPriority": entry.get("suggestedPriority", "NORMAL"),
+                    "source": "bedrock",
+                }
+                issue_preclassifier.record(item["text"], item.get("language", "en"), results[index])
+            else:
+                resent += 1
+                results[index] = self._analyze_with_bedrock(item.get("text", ""), item.get("language", "en"))
+
+        logger.info(f"[IssueAnalyzer] Packed analysis of {len(items)} issues, {resent} re-sent individually")
+        return results
+
+    def _converse(self, prompt: str, max_tokens: int = 1024) -> dict:
+        """Call Bedrock within the shared rate limit, retrying throttled requests with backoff and jitter."""
+        max_retries = max(0, settings.LLM_MAX_RETRIES)
+        for attempt in range(max_retries + 1):
+            bedrock_rate_limiter.acquire()
+            try:
+                return self.client.converse(
+                    modelId=settings.BEDROCK_MODEL_ID,
+                    messages=[{
+                        "role": "user",
+                        "content": [{"text": prompt}],
+                    }],
+                    inferenceConfig={"maxTokens": max_tokens, "temperature": 0.1},
+                )
+            except ClientError as e:
+                error_code = e.response.get("Error", {}).get("Code")
+                if error_code not in THROTTLING_CODES or attempt == max_retries:
+                    raise
+                bedrock_rate_limiter.penalize()
+                delay = settings.LLM_RETRY_BASE_SECONDS * (2 ** attempt) + random.uniform(0, settings.LLM_RETRY_BASE_SECONDS)
+                logger.warning(f"[IssueAnalyzer] Bedrock throttled ({error_code}); retrying in {delay:.1f}s "
+                               f"(attempt {attempt + 1}/{max_retries})")
+                time.sleep(delay)
+
+    def _analyze_pack(self, items: list) -> list:
+        try:
+            if len(items) == 1:
+                analyses = [self._analyze_with_bedrock(items[0].get("text", ""), items[0].get("language", "en"))]
+            else:
+                analyses = self.analyze_pack(items)
+        except Exception as e:
+            logger.error(f"[IssueAnalyzer] Analysis of issues {[item.get('id') for item in items]} failed: {e}")
+            analyses = [{"sentiment": None, "keyPhrases": []} for _ in items]
+        for item, analysis in zip(items, analyses):
+            analysis["id"] = item.get("id")
+        return analyses
+
+    def _pack_items(self, texts: list) -> list:
+        """Group issues into packs of at most COMPREHEND_PACK_SIZE issues and COMPREHEND_PACK_MAX_CHARS of text."""
+        pack_size = max(1, settings.COMPREHEND_PACK_SIZE)
+        packs = []
+        current, current_chars = [], 0
+        for item in texts:
+            chars = min(len(item.get("text") or ""), settings.COMPREHEND_MAX_TEXT_CHARS)
+            if current and (len(current) >= pack_size or current_chars + chars > settings.COMPREHEND_PACK_MAX_CHARS):
+                packs.append(current)
+                current, current_chars = [], 0
+            current.append(item)
+            current_chars += chars
+        if current:
+            packs.append(current)
+        return packs
+
     def batch_analyze(self, texts: list) -> list:
-        """Analyze multiple issues sequentially via Bedrock."""
-        if not self.client:
+        """Analyze multiple issues concurrently via Bedrock, several per request; results are in input order."""
+        if not self.client or not texts:
             return []
 
-        results = []
-        for item in texts:
-            text = item.get("text", "")
-            language = item.get("language", "en")
-            analysis = self.analyze_issue(text, language)
-            analysis["id"] = item.get("id")
-            results.append(analysis)
+        started = time.monotonic()
+        results = [None] * len(texts)
+        escalated = []
+        for index, item in enumerate(texts):
+            local = issue_preclassifier.classify(item.get("text", ""), item.get("language", "en"))
+            if local is not None:
+                local["id"] = item.get("id")
+                results[index] = local
+            else:
+                escalated.append(index)
+
+        packs = self._pack_items([texts[index] for index in escalated])
+        workers = min(len(packs), max(1, settings.COMPREHEND_MAX_CONCURRENCY)) or 1
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="issue-analysis") as executor:
+            analyses = [analysis for pack in executor.map(self._analyze_pack, packs) for analysis in pack]
+        for index, analysis in zip(escalated, analyses):
+            results[index] = analysis
 
+        logger.info(f"[IssueAnalyzer] Analyzed {len(results)} issues: {len(texts) - len(escalated)} locally, "
+                    f"{len(escalated)} in {len(packs)} Bedrock packs, in {time.monotonic() - started:.1f}s")
         return results
 
     def is_available(self) -> bool:
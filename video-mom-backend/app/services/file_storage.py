@@ -1,17 +1,31 @@
 import os
 import uuid
 import shutil
+import asyncio
+import hashlib
 import logging
 from pathlib import Path
-from typing import Optional
+from typing import AsyncIterator, Optional, Tuple
 from datetime import datetime, timedelta
+from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+class UploadTooLargeError(Exception):
+    """Raised when a streamed upload exceeds the configured size cap."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        super().__init__(f"Upload exceeds maximum allowed size of {max_bytes} bytes")
+
 class FileStorage:
     def __init__(self, storage_dir: str = "temp_storage"):
         self.storage_dir = Path(storage_dir)
         self.storage_dir.mkdir(exist_ok=True)
+        self.upload_chunk_size = settings.UPLOAD_CHUNK_SIZE_KB * 1024
+        self.max_upload_bytes = settings.MAX_UPLOAD_SIZE_MB * 1024 * 1024
+        self.media_cache_dir = self.storage_dir / "media_cache"
+        self.media_cache_dir.mkdir(exist_ok=True)
         
     def store_file(self, file_content: bytes, filename: str, request_id: str) -> str:
         """Store file content and return the storage path"""
@@ -27,6 +41,120 @@ class FileStorage:
             
         logger.info(f"Stored file {filename} for request {request_id} at {file_path}")
         return str(file_path)
+
+    async def store_upload(self, upload, filename: str, request_id: str,
+                           max_bytes: Optional[int] = None) -> Tuple[str, int, str]:
+        """Copy an upload (anything with an async ``read(size)``) to disk in bounded chunks.
+
+        For a Starlette UploadFile this copies the already spooled body. Returns
+        (stored_path, bytes_written, sha256_hex). Raises UploadTooLargeError as soon as
+        the cap is crossed; the partial file is removed in that case.
+        """
+        request_dir = self.storage_dir / request_id
+        request_dir.mkdir(exist_ok=True)
+        file_path = request_dir / filename
+        limit = max_bytes if max_bytes is not None else self.max_upload_bytes
+
+        written, digest = await self._stream_to_file(self._iter_upload(upload), file_path, limit)
+
+        logger.info(f"Stored file {filename} for request {request_id} at {file_path} ({written} bytes)")
+        return str(file_path), written, digest
+
+    # ---- Resumable upload parts -------------------------------------------------
+
+    def _upload_dir(self, upload_id: str) -> Path:
+        # Lives next to request directories so cleanup_old_files expires abandoned uploads
+        return self.storage_dir / f"upload_{upload_id}"
+
+    def _part_path(self, upload_id: str, index: int) -> Path:
+        return self._upload_dir(upload_id) / f"{index:06d}.part"
+
+    async def store_upload_part(self, upload_id: str, index: int, chunks: AsyncIterator[bytes],
+                                max_bytes: int) -> Tuple[int, str]:
+        """Stream one numbered part of a resumable upload to disk.
+
+        The part is written to a temporary name and renamed into place only once the
+        body has been fully received, so a dropped connection never leaves a partial part.
+        Each write has its own temporary file, so a client retrying a part while the
+        first attempt is still arriving cannot interleave the two.
+        """
+        upload_dir = self._upload_dir(upload_id)
+        upload_dir.mkdir(exist_ok=True)
+        part_path = self._part_path(upload_id, index)
+        tmp_path = part_path.with_name(f".{part_path.name}.{uuid.uuid4().hex}.tmp")
+
+        written, digest = await self._stream_to_file(chunks, tmp_path, max_bytes)
+        os.replace(tmp_path, part_path)
+        return written, digest
+
+    def discard_upload_part(self, upload_id: str, index: int):
+        """Remove a stored part (e.g. when it fails size validation)"""
+        self._part_path(upload_id, index).unlink(missing_ok=True)
+
+    def assemble_upload(self, upload_id: str, total_chunks: int, filename: str, request_id: str) -> Tuple[str, int, str]:
+        """Concatenate all parts of an upload into the request directory (blocking).
+
+        Returns (stored_path, bytes_written, sha256_hex). Parts are left in place so the
+        caller can verify the checksum first; remove them with cleanup_upload_parts.
+        """
+        request_dir = self.storage_dir / request_id
+        request_dir.mkdir(exist_ok=True)
+        file_path = request_dir / filename
+
+        hasher = hashlib.sha256()
+        written = 0
+        with open(file_path, "wb") as out:
+            for index in range(total_chunks):
+                with open(self._part_path(upload_id, index), "rb") as part:
+                    while True:
+                        chunk = part.read(self.upload_chunk_size)
+                        if not chunk:
+                            break
+                        out.write(chunk)
+                        hasher.update(chunk)
+                        written += len(chunk)
+
+        logger.info(f"Assembled upload {upload_id} ({total_chunks} parts, {written} bytes) for request {request_id}")
+        return str(file_path), written, hasher.hexdigest()
+
+    def cleanup_upload_parts(self, upload_id: str):
+        """Remove all stored parts of a resumable upload"""
+        upload_dir = self._upload_dir(upload_id)
+        if upload_dir.exists():
+            shutil.rmtree(upload_dir)
+
+    # ---- Streaming helpers ------------------------------------------------------
+
+    async def _iter_upload(self, upload) -> AsyncIterator[bytes]:
+        while True:
+            chunk = await upload.read(self.upload_chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+    async def _stream_to_file(self, chunks: AsyncIterator[bytes], file_path: Path, limit: Optional[int]) -> Tuple[int, str]:
+        """Write an async byte stream to file_path, enforcing limit and hashing as it goes"""
+        hasher = hashlib.sha256()
+        written = 0
+        f = await asyncio.to_thread(open, file_path, "wb")
+        try:
+            async for chunk in chunks:
+                written += len(chunk)
+                if limit and written > limit:
+                    raise UploadTooLargeError(limit)
+                # Disk write and hashing both release the GIL, keep them off the event loop
+                await asyncio.to_thread(self._write_chunk, f, hasher, chunk)
+        except BaseException:
+            await asyncio.to_thread(f.close)
+            file_path.unlink(missing_ok=True)
+            raise
+        await asyncio.to_thread(f.close)
+        return written, hasher.hexdigest()
+
+    @staticmethod
+    def _write_chunk(f, hasher, chunk: bytes):
+        f.write(chunk)
+        hasher.update(chunk)
     
     def get_file_path(self, request_id: str, filename: str) -> Optional[str]:
         """Get file path if it exists"""
@@ -42,15 +170,69 @@ class FileStorage:
             shutil.rmtree(request_dir)
             logger.info(f"Cleaned up all files for request {request_id}")
     
+    # ---- Content-addressed media cache -----------------------------------------
+
+    def cache_media_artifact(self, content_hash: str, src_path: str, suffix: str) -> Optional[str]:
+        """Keep a derived artifact (e.g. the normalized WAV) under its source content hash.
+
+        Uses a hard link so the cached copy survives per-request cleanup without
+        duplicating bytes on disk; falls back to a copy across filesystems.
+        """
+        cache_path = self.media_cache_dir / f"{content_hash}{suffix}"
+        try:
+            if not cache_path.exists():
+                self._link_or_copy(Path(src_path), cache_path)
+            return str(cache_path)
+        except Exception as e:
+            logger.warning(f"Failed to cache media artifact {src_path}: {e}")
+            return None
+
+    def link_cached_artifact(self, cached_path: str, request_id: str, filename: str) -> Optional[str]:
+        """Materialize a cached artifact inside a request directory; None if it has expired"""
+        source = Path(cached_path)
+        if not source.exists():
+            return None
+        request_dir = self.storage_dir / request_id
+        request_dir.mkdir(exist_ok=True)
+        target = request_dir / filename
+        try:
+            target.unlink(missing_ok=True)
+            self._link_or_copy(source, target)
+            return str(target)
+        except Exception as e:
+            logger.warning(f"Failed to reuse cached artifact {cached_path}: {e}")
+            return None
+
+    @staticmethod
+    def _link_or_copy(source: Path, target: Path):
+        try:
+            os.link(source, target)
+        except OSError:
+            shutil.copyfile(source, target)
+
     def cleanup_old_files(self, hours_old: int = 24):
-        """Clean up files older than specified hours"""
+        """Clean up files older than specified hours.
+
+        Resumable upload directories are kept for at least RESUMABLE_UPLOAD_TTL_HOURS,
+        so a session that is still valid never loses its parts.
+        """
         cutoff_time = datetime.now() - timedelta(hours=hours_old)
+        upload_cutoff_time = datetime.now() - timedelta(hours=max(hours_old, settings.RESUMABLE_UPLOAD_TTL_HOURS))
+        
+        # Cached artifacts expire individually; the directory itself is kept
+        for cached_file in self.media_cache_dir.iterdir():
+            if datetime.fromtimestamp(cached_file.stat().st_mtime) < cutoff_time:
+                cached_file.unlink(missing_ok=True)
+                logger.info(f"Cleaned up cached media artifact: {cached_file}")
         
         for request_dir in self.storage_dir.iterdir():
+            if request_dir == self.media_cache_dir:
+                continue
             if request_dir.is_dir():
                 # Check directory modification time
                 dir_mtime = datetime.fromtimestamp(request_dir.stat().st_mtime)
-                if dir_mtime < cutoff_time:
+                is_upload = request_dir.name.startswith("upload_")
+                if dir_mtime < (upload_cutoff_time if is_upload else cutoff_time):
                     shutil.rmtree(request_dir)
                     logger.info(f"Cleaned up old request directory: {request_dir}")
 
@@ -0,0 +1,66 @@
+import logging
+import threading
+from typing import Optional
+import httpx
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+class HTTPClientPool:
+    """Shared outbound HTTP clients for every provider.
+
+    httpx keeps a keep-alive pool per origin, so repeated calls to Jio, Hugging Face
+    and S3 reuse TCP+TLS connections (multiplexed over HTTP/2 when h2 is installed).
+    The async client serves coroutine-based providers on the event loop; the sync
+    client serves code that still runs in worker threads. Both share one set of limits.
+    """
+
+    def __init__(self):
+        self.http2 = settings.HTTP2_ENABLED and HTTP2_AVAILABLE
+        self.limits = httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY_SECONDS
+        )
+        # Per-call read timeouts are passed by each provider; this is the default for the rest
+        self.timeout = httpx.Timeout(settings.HTTP_TIMEOUT_SECONDS, connect=settings.HTTP_CONNECT_TIMEOUT_SECONDS)
+        self._async_client: Optional[httpx.AsyncClient] = None
+        self._sync_client: Optional[httpx.Client] = None
+        self._lock = threading.Lock()
+
+    @property
+    def async_client(self) -> httpx.AsyncClient:
+        """Pooled client for use on the event loop (created on first use)"""
+        if self._async_client is None or self._async_client.is_closed:
+            self._async_client = httpx.AsyncClient(http2=self.http2, limits=self.limits, timeout=self.timeout)
+            logger.info(f"Async HTTP client pool created (http2={self.http2}, max_connections={self.limits.max_connections})")
+        return self._async_client
+
+    @property
+    def sync_client(self) -> httpx.Client:
+        """Pooled client for blocking code running in worker threads (created on first use)"""
+        with self._lock:
+            if self._sync_client is None or self._sync_client.is_closed:
+                self._sync_client = httpx.Client(http2=self.http2, limits=self.limits, timeout=self.timeout)
+                logger.info(f"Sync HTTP client pool created (http2={self.http2}, max_connections={self.limits.max_connections})")
+            return self._sync_client
+
+    async def aclose(self):
+        """Close both pools; called on application shutdown"""
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+        with self._lock:
+            if self._sync_client is not None:
+                self._sync_client.close()
+                self._sync_client = None
+        logger.info("HTTP client pools closed")
+
+# Global HTTP client pool
+http_clients = HTTPClientPool()
@@ -0,0 +1,409 @@
+import re
+import time
+import zlib
+import logging
+import threading
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+import numpy as np
+from pymongo import ASCENDING, DESCENDING
+from app.core.config import settings
+from app.core.database import get_sync_database
+
+logger = logging.getLogger(__name__)
+
+# Letters, digits and Indic combining marks (which are not \w)
+WORD_PATTERN = re.compile(r"[\wऀ-ॿঀ-෿]+")
+
+# Keyword lexicons per language. All are applied to every text, since issues are often
+# written in one language with terms from another.
+URGENT_TERMS = {
+    "en": ["accident", "injured", "injury", "death", "died", "dead", "fire", "flood", "collapse", "collapsed",
+           "electrocution", "live wire", "snake", "outbreak", "cholera", "dengue", "malaria", "contaminated",
+           "poison", "emergency", "ambulance", "danger", "dangerous", "urgent", "no drinking water", "sewage overflow"],
+    "hi": ["दुर्घटना", "घायल", "मौत", "मृत्यु", "आग लग", "बाढ़", "गिर गया", "गिर गई", "करंट", "बिजली का तार", "सांप",
+           "बीमारी फैल", "हैजा", "डेंगू", "मलेरिया", "दूषित", "गंदा पानी", "जहर", "आपातकाल", "एम्बुलेंस", "खतरा",
+           "खतरनाक", "तुरंत", "पीने का पानी नहीं"],
+    "mr": ["अपघात", "जखमी", "मृत्यू", "आग लाग", "पूर", "कोसळ", "करंट", "साप", "साथीचा रोग", "दूषित", "विषबाधा",
+           "आणीबाणी", "रुग्णवाहिका", "धोका", "धोकादायक", "तातडीने", "पिण्याचे पाणी नाही"],
+}
+NEGATIVE_TERMS = {
+    "en": ["broken", "damaged", "not working", "no water", "no electricity", "dirty", "garbage", "leak", "leaking",
+           "problem", "complaint", "pothole", "blocked", "corruption", "delay", "pending", "bad", "poor"],
+    "hi": ["टूटा", "टूटी", "खराब", "बंद", "पानी नहीं", "बिजली नहीं", "गंदगी", "कचरा", "रिसाव", "समस्या",
+           "शिकायत", "गड्ढा", "भ्रष्टाचार", "देरी", "परेशानी", "नहीं मिल"],
+    "mr": ["तुटले", "खराब", "बंद", "पाणी नाही", "वीज नाही", "घाण", "कचरा", "गळती", "समस्या", "तक्रार",
+           "खड्डा", "भ्रष्टाचार", "उशीर", "त्रास"],
+}
+POSITIVE_TERMS = {
+    "en": ["thank", "good work", "appreciate", "resolved", "fixed", "improved", "happy", "satisfied"],
+    "hi": ["धन्यवाद", "शुक्रिया", "अच्छा काम", "सराहना", "हल हो गया", "ठीक हो गया", "सुधार", "खुश", "संतुष्ट"],
+    "mr": ["धन्यवाद", "आभार", "चांगले काम", "कौतुक", "सुटली", "दुरुस्त", "सुधारणा", "आनंदी", "समाधानी"],
+}
+STOPWORDS = {
+    "the", "a", "an", "is", "are", "was", "were", "in", "on", "of", "to", "and", "or", "for", "from", "with",
+    "this", "that", "it", "our", "we", "my", "i", "there", "has", "have", "been", "not", "no", "please",
+    "है", "हैं", "का", "की", "के", "को", "में", "से", "और", "यह", "वह", "पर", "भी", "था", "थी", "हम", "नहीं", "कृपया",
+    "आहे", "आहेत", "चा", "ची", "चे", "ला", "मध्ये", "आणि", "हे", "ते", "आम्ही", "नाही", "कृपया",
+}
+
+SENTIMENT_LABELS = ["POSITIVE", "NEGATIVE", "NEUTRAL", "MIXED"]
+PRIORITIES = ["NORMAL", "URGENT"]
+
+# Hashed unigram/bigram features plus three lexicon counts
+HASH_DIMENSIONS = 2048
+TRAINING_EPOCHS = 300
+LEARNING_RATE = 0.5
+L2_PENALTY = 1e-4
+
+# Share of the stored analyses held out to measure each class's accuracy at the confidence threshold
+VALIDATION_FRACTION = 0.25
+# A class or language is only answered locally once this many held-out predictions back its precision
+VALIDATION_MIN_SUPPORT = 10
+
+def _language_key(language: Optional[str]) -> str:
+    """Primary language subtag, e.g. "hi" for "hi-IN"; "unknown" when missing"""
+    return re.split(r"[-_]", language.strip().lower())[0] if language and language.strip() else "unknown"
+
+def _compile_lexicon(lexicon: Dict[str, List[str]]) -> "re.Pattern":
+    """Match terms at the start of a word, so stems also match inflected forms"""
+    terms = sorted({term for terms in lexicon.values() for term in terms}, key=len, reverse=True)
+    return re.compile(r"(?<![\wऀ-ॿঀ-෿])(?:" + "|".join(re.escape(term) for term in terms) + ")", re.IGNORECASE)
+
+URGENT_PATTERN = _compile_lexicon(URGENT_TERMS)
+NEGATIVE_PATTERN = _compile_lexicon(NEGATIVE_TERMS)
+POSITIVE_PATTERN = _compile_lexicon(POSITIVE_TERMS)
+
+def _train_softmax(features: np.ndarray, labels: np.ndarray, classes: int) -> np.ndarray:
+    """Multinomial logistic regression by full-batch gradient descent; returns weights incl. bias row"""
+    x = np.hstack([features, np.ones((features.shape[0], 1), dtype=np.float32)])
+    targets = np.eye(classes, dtype=np.float32)[labels]
+    weights = np.zeros((x.shape[1], classes), dtype=np.float32)
+    for _ in range(TRAINING_EPOCHS):
+        probabilities = _softmax(x @ weights)
+        gradient = x.T @ (probabilities - targets) / x.shape[0] + L2_PENALTY * weights
+        weights -= LEARNING_RATE * gradient
+    return weights
+
+def _softmax(logits: np.ndarray) -> np.ndarray:
+    exp = np.exp(logits - logits.max(axis=-1, keepdims=True))
+    return exp / exp.sum(axis=-1, keepdims=True)
+
+class IssuePreclassifier:
+    """CPU-only first pass over issue text before the Bedrock analysis.
+
+    Features are keyword-lexicon hits (English, Hindi, Marathi) and hashed word
+    unigrams/bigrams. Two small linear models, for sentiment and urgency, are trained
+    on past Bedrock analyses that are recorded in MongoDB, and retrained in the
+    background as more accumulate. A held-out split measures how often a confident
+    prediction of each class is right; only classes that are right at least as often
+    as the confidence threshold are answered locally, and NORMAL only if confident
+    NORMAL predictions also rarely miss a held-out URGENT issue. The same held-out
+    split is checked per language, and languages that were not validated are always
+    escalated. NORMAL is never answered for text with an urgent keyword. Until enough
+    analyses exist, only issues in a lexicon language with several urgent keywords are
+    answered. Everything else is escalated to Bedrock.
+
+    Recorded issue texts expire after ISSUE_PRECLASSIFIER_RETENTION_DAYS and only the
+    newest ISSUE_PRECLASSIFIER_MAX_SAMPLES are kept.
+    """
+
+    def __init__(self):
+        # (sentiment weights, urgency weights, trusted sentiment labels, trusted priorities,
+        #  trusted languages, validation report)
+        self._models = None
+        self._collection = None
+        self._lock = threading.Lock()
+        self._training = False
+        self._recorded_since_training = 0
+        self._loaded = False
+        self._counts = {"local": 0, "escalated": 0}
+
+    def _get_collection(self):
+        if self._collection is None:
+            collection = get_sync_database()["issue_analyses"]
+            self._ensure_indexes(collection)
+            self._collection = collection
+        return self._collection
+
+    @staticmethod
+    def _ensure_indexes(collection):
+        # The TTL index also serves the newest-first training query
+        if "created_at_-1" in collection.index_information():
+            collection.drop_index("created_at_-1")
+        collection.create_index(
+            [("created_at", ASCENDING)],
+            expireAfterSeconds=settings.ISSUE_PRECLASSIFIER_RETENTION_DAYS * 86400
+        )
+
+    # ---- Features ---------------------------------------------------------------
+
+    @staticmethod
+    def _lexicon_hits(text: str) -> Dict[str, List[str]]:
+        return {
+            "urgent": [match.lower() for match in URGENT_PATTERN.findall(text)],
+            "negative": [match.lower() for match in NEGATIVE_PATTERN.findall(text)],
+            "positive": [match.lower() for match in POSITIVE_PATTERN.findall(text)],
+        }
+
+    def _features(self, texts: List[str]) -> np.ndarray:
+        matrix = np.zeros((len(texts), HASH_DIMENSIONS + 3), dtype=np.float32)
+        for row, text in enumerate(texts):
+            words = WORD_PATTERN.findall(text.lower())
+            for term in words + [f"{a} {b}" for a, b in zip(words, words[1:])]:
+                matrix[row, zlib.crc32(term.encode("utf-8")) % HASH_DIMENSIONS] += 1.0
+            norm = np.linalg.norm(matrix[row, :HASH_DIMENSIONS])
+            if norm:
+                matrix[row, :HASH_DIMENSIONS] /= norm
+            hits = self._lexicon_hits(text)
+            matrix[row, HASH_DIMENSIONS:] = [min(len(hits[name]), 3) / 3.0 for name in ("urgent", "negative", "positive")]
+        return matrix
+
+    @staticmethod
+    def _key_phrases(text: str, hits: Dict[str, List[str]]) -> List[str]:
+        phrases = list(dict.fromkeys(hits["urgent"] + hits["negative"] + hits["positive"]))
+        words = [word for word in WORD_PATTERN.findall(text.lower()) if word not in STOPWORDS and len(word) > 2]
+        for word, _ in Counter(words).most_common():
+            if len(phrases) >= 10:
+                break
+            if word not in phrases:
+                phrases.append(word)
+        return phrases[:10]
+
+    # ---- Classification ---------------------------------------------------------
+
+    def classify(self, text: str, language: str = "en") -> Optional[Dict[str, Any]]:
+        """Analysis in the Bedrock result format with "source": "local", or None to escalate"""
+        if not settings.ISSUE_PRECLASSIFIER_ENABLED or not text or not text.strip():
+            return None
+        if not self._loaded:
+            self._loaded = True
+            self._start_training()
+
+        text = text[:settings.COMPREHEND_MAX_TEXT_CHARS]
+        hits = self._lexicon_hits(text)
+        models = self._models
+        result = None
+
+        if models is not None:
+            sentiment_weights, urgency_weights, trusted_sentiments, trusted_priorities, trusted_languages, _ = models
+            x = np.append(self._features([text])[0], 1.0).astype(np.float32)
+            sentiment_probabilities = _softmax(x @ sentiment_weights)
+            urgency_probabilities = _softmax(x @ urgency_weights)
+            sentiment_index = int(sentiment_probabilities.argmax())
+            urgency_index = int(urgency_probabilities.argmax())
+            threshold = settings.ISSUE_PRECLASSIFIER_CONFIDENCE
+            if (_language_key(language) in trusted_languages
+                    and sentiment_probabilities[sentiment_index] >= threshold
+                    and urgency_probabilities[urgency_index] >= threshold
+                    and SENTIMENT_LABELS[sentiment_index] in trusted_sentiments
+                    and PRIORITIES[urgency_index] in trusted_priorities
+                    and not (PRIORITIES[urgency_index] == "NORMAL" and hits["urgent"])):
+                result = {
+                    "sentiment": {
+                        "label": SENTIMENT_LABELS[sentiment_index],
+                        "score": round(float(sentiment_probabilities[sentiment_index]), 3),
+                        "scores": {label.lower(): round(float(p), 3)
+                                   for label, p in zip(SENTIMENT_LABELS, sentiment_probabilities)},
+                    },
+                    "suggestedPriority": PRIORITIES[urgency_index],
+                }
+        elif _language_key(language) in URGENT_TERMS and len(set(hits["urgent"])) >= 2 and not hits["positive"]:
+            # No model yet: only clear-cut emergencies in a lexicon language are decided from the lexicon
+            result = {
+                "sentiment": {"label": "NEGATIVE", "score": 0.9,
+                              "scores": {"positive": 0.0, "negative": 0.9, "neutral": 0.1, "mixed": 0.0}},
+                "suggestedPriority": "URGENT",
+            }
+
+        with self._lock:
+            self._counts["local" if result else "escalated"] += 1
+        if result is None:
+            return None
+        # Keyword hits and frequent words, not Bedrock's extracted phrases
+        result["keyPhrases"] = self._key_phrases(text, hits)
+        result["keyPhrasesSource"] = "keywords"
+        result["source"] = "local"
+        logger.info(f"[IssuePreclassifier] Local result: sentiment={result['sentiment']['label']}, "
+                    f"priority={result['suggestedPriority']}")
+        return result
+
+    # ---- Training ---------------------------------------------------------------
+
+    def record(self, text: str, language: str, analysis: Dict[str, Any]):
+        """Store a Bedrock analysis as a training example"""
+        if not settings.ISSUE_PRECLASSIFIER_ENABLED or not text or not text.strip():
+            return
+        sentiment = (analysis.get("sentiment") or {}).get("label")
+        priority = analysis.get("suggestedPriority", "NORMAL")
+        if sentiment not in SENTIMENT_LABELS or priority not in PRIORITIES:
+            return
+        try:
+            self._get_collection().insert_one({
+                "text": text[:settings.COMPREHEND_MAX_TEXT_CHARS],
+                "language": language,
+                "sentiment": sentiment,
+                "priority": priority,
+                "created_at": datetime.utcnow(),
+            })
+        except Exception as e:
+            logger.warning(f"[IssuePreclassifier] Failed to record analysis: {e}")
+            return
+
+        with self._lock:
+            self._recorded_since_training += 1
+            retrain = self._recorded_since_training >= settings.ISSUE_PRECLASSIFIER_RETRAIN_EVERY
+        if retrain:
+            self._start_training()
+
+    def _start_training(self):
+        with self._lock:
+            if self._training:
+                return
+            self._training = True
+            self._recorded_since_training = 0
+        threading.Thread(target=self._train, name="issue-preclassifier-training", daemon=True).start()
+
+    def _train(self):
+        try:
+            collection = self._get_collection()
+            docs = list(collection.find(
+                {}, {"text": 1, "language": 1, "sentiment": 1, "priority": 1, "created_at": 1}
+            ).sort("created_at", DESCENDING).limit(settings.ISSUE_PRECLASSIFIER_MAX_SAMPLES))
+            if len(docs) == settings.ISSUE_PRECLASSIFIER_MAX_SAMPLES:
+                # Older analyses would never be trained on again
+                pruned = collection.delete_many({"created_at": {"$lt": docs[-1]["created_at"]}}).deleted_count
+                if pruned:
+                    logger.info(f"[IssuePreclassifier] Dropped {pruned} analyses beyond the newest {len(docs)}")
+            if len(docs) < settings.ISSUE_PRECLASSIFIER_MIN_SAMPLES:
+                logger.info(f"[IssuePreclassifier] {len(docs)} stored analyses, "
+                            f"need {settings.ISSUE_PRECLASSIFIER_MIN_SAMPLES} to train")
+                return
+
+            started = time.monotonic()
+            self._models = self._fit(docs)
+            report = self._models[5]
+            logger.info(f"[IssuePreclassifier] Trained on {report['trained_on']} analyses in "
+                        f"{time.monotonic() - started:.1f}s; answering locally: "
+                        f"sentiment {report['trusted_sentiments'] or 'none'}, "
+                        f"priority {report['trusted_priorities'] or 'none'}, "
+                        f"languages {report['trusted_languages'] or 'none'}")
+        except Exception as e:
+            logger.warning(f"[IssuePreclassifier] Training failed: {e}")
+        finally:
+            with self._lock:
+                self._training = False
+
+    def _fit(self, docs: List[Dict[str, Any]]):
+        """Train on part of docs and decide from the held-out rest which classes and languages to trust"""
+        texts = [doc["text"] for doc in docs]
+        languages = np.array([_language_key(doc.get("language")) for doc in docs])
+        features = self._features(texts)
+        sentiment_labels = np.array([SENTIMENT_LABELS.index(doc["sentiment"]) for doc in docs])
+        urgency_labels = np.array([PRIORITIES.index(doc["priority"]) for doc in docs])
+        urgent_hits = np.array([bool(URGENT_PATTERN.search(text)) for text in texts])
+
+        order = np.random.default_rng(0).permutation(len(docs))
+        held_out = max(1, int(len(docs) * VALIDATION_FRACTION))
+        validation, training = order[:held_out], order[held_out:]
+
+        sentiment_weights = _train_softmax(features[training], sentiment_labels[training], len(SENTIMENT_LABELS))
+        urgency_weights = _train_softmax(features[training], urgency_labels[training], len(PRIORITIES))
+
+        x = np.hstack([features[validation], np.ones((len(validation), 1), dtype=np.float32)])
+        threshold = settings.ISSUE_PRECLASSIFIER_CONFIDENCE
+        sentiment_probabilities = _softmax(x @ sentiment_weights)
+        sentiment_report = self._validate(sentiment_probabilities, sentiment_labels[validation], SENTIMENT_LABELS)
+        urgency_probabilities = _softmax(x @ urgency_weights)
+        urgency_report = self._validate(urgency_probabilities, urgency_labels[validation], PRIORITIES)
+
+        # URGENT issues that would be answered NORMAL locally: the lexicon guard escalates those with keywords
+        urgent = urgency_labels[validation] == PRIORITIES.index("URGENT")
+        missed = (
+            urgent
+            & (urgency_probabilities.argmax(axis=1) == PRIORITIES.index("NORMAL"))
+            & (urgency_probabilities.max(axis=1) >= threshold)
+            & ~urgent_hits[validation]
+        )
+        urgent_support = int(urgent.sum())
+        urgent_caught = 1.0 - float(missed.sum()) / urgent_support if urgent_support else None
+        urgency_report["URGENT"]["caught"] = round(urgent_caught, 3) if urgent_caught is not None else None
+
+        trusted_sentiments = {label for label, metrics in sentiment_report.items() if metrics["trusted"]}
+        trusted_priorities = {label for label, metrics in urgency_report.items() if metrics["trusted"]}
+        if not (urgent_support >= VALIDATION_MIN_SUPPORT and urgent_caught >= threshold):
+            # Too few held-out urgent issues to show that NORMAL answers don't hide emergencies
+            trusted_priorities.discard("NORMAL")
+
+        # Replay classify()'s gate on the held-out issues, then check each language on its own
+        sentiment_predicted = sentiment_probabilities.argmax(axis=1)
+        urgency_predicted = urgency_probabilities.argmax(axis=1)
+        answered = (
+            (sentiment_probabilities.max(axis=1) >= threshold)
+            & (urgency_probabilities.max(axis=1) >= threshold)
+            & np.isin(sentiment_predicted, [SENTIMENT_LABELS.index(label) for label in trusted_sentiments])
+            & np.isin(urgency_predicted, [PRIORITIES.index(label) for label in trusted_priorities])
+            & ~((urgency_predicted == PRIORITIES.index("NORMAL")) & urgent_hits[validation])
+        )
+        correct = answered & (sentiment_predicted == sentiment_labels[validation]) & (urgency_predicted == urgency_labels[validation])
+        language_report = {}
+        for language in sorted(set(languages[validation])):
+            in_language = languages[validation] == language
+            support = int((answered & in_language).sum())
+            precision = int((correct & in_language).sum()) / support if support else None
+            language_report[language] = {
+                "answered": support,
+                "precision": round(precision, 3) if precision is not None else None,
+                "trusted": support >= VALIDATION_MIN_SUPPORT and precision >= threshold,
+            }
+        trusted_languages = {language for language, metrics in language_report.items() if metrics["trusted"]}
+        trusted_languages.discard("unknown")
+
+        report = {
+            "trained_on": len(training),
+            "validated_on": len(validation),
+            "sentiment": sentiment_report,
+            "priority": urgency_report,
+            "language": language_report,
+            "trusted_sentiments": sorted(trusted_sentiments),
+            "trusted_priorities": sorted(trusted_priorities),
+            "trusted_languages": sorted(trusted_languages),
+        }
+        return sentiment_weights, urgency_weights, trusted_sentiments, trusted_priorities, trusted_languages, report
+
+    @staticmethod
+    def _validate(probabilities: np.ndarray, labels: np.ndarray, classes: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Per class: precision of confident predictions, recall, and whether it passes the threshold"""
+        threshold = settings.ISSUE_PRECLASSIFIER_CONFIDENCE
+        predicted = probabilities.argmax(axis=1)
+        confident = probabilities.max(axis=1) >= threshold
+        report = {}
+        for index, label in enumerate(classes):
+            answered = confident & (predicted == index)
+            support = int(answered.sum())
+            actual = int((labels == index).sum())
+            correct = int((answered & (labels == index)).sum())
+            precision = correct / support if support else None
+            report[label] = {
+                "answered": support,
+                "precision": round(precision, 3) if precision is not None else None,
+                "recall": round(correct / actual, 3) if actual else None,
+                "trusted": support >= VALIDATION_MIN_SUPPORT and precision >= threshold,
+            }
+        return report
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = dict(self._counts)
+        total = counts["local"] + counts["escalated"]
+        return {
+            "enabled": settings.ISSUE_PRECLASSIFIER_ENABLED,
+            "trained_on": self._models[5]["trained_on"] if self._models else 0,
+            "validation": self._models[5] if self._models else None,
+            **counts,
+            "local_rate": round(counts["local"] / total, 3) if total else None,
+        }
+
+# Global pre-classifier
+issue_preclassifier = IssuePreclassifier()
@@ -1,16 +1,29 @@
 import os
+import asyncio
 import logging
-import requests
 import json
 import base64
 import subprocess
 import wave
-from pydub import AudioSegment
 import tempfile
 from app.core.config import settings
+from app.services.wav_chunker import WavChunkReader, build_wav_header
+from app.services.voice_activity import voice_activity_detector
+from app.services.http_client import http_clients
 
 logger = logging.getLogger(__name__)
 
+class IncompleteTranscriptionError(Exception):
+    """Some chunks still had no API result after every retry"""
+
+    def __init__(self, missing_chunks, total_chunks):
+        self.missing_chunks = missing_chunks
+        self.total_chunks = total_chunks
+        super().__init__(
+            f"{len(missing_chunks)} of {total_chunks} chunks could not be transcribed "
+            f"(chunks {', '.join(str(index + 1) for index in missing_chunks)}); finished chunks are kept, so retrying the same media only sends the rest"
+        )
+
 class JioTranslateSTTTranscriber:
     """Jio Translate STT Transcriber using the correct API format"""
     
@@ -19,7 +32,13 @@ class JioTranslateSTTTranscriber:
         self.endpoint = "https://sit.translate.jio/translator/stt"
         self.chunk_length_ms = 60 * 1000
         self.overlap_ms = 3 * 1000
-        logger.info(f"Jio STT initialized: API key loaded -> {bool(self.api_key)}")
+        # Provider-wide cap on in-flight API calls, shared by every request on this process
+        self.max_concurrency = max(1, settings.JIO_STT_MAX_CONCURRENCY)
+        # Each slot is one in-flight request on the shared async HTTP pool
+        self._async_request_slots = asyncio.Semaphore(self.max_concurrency)
+        self.chunk_retries = max(0, settings.JIO_STT_CHUNK_RETRIES)
+        self.retry_base_seconds = settings.JIO_STT_RETRY_BASE_SECONDS
+        logger.info(f"Jio STT initialized: API key loaded -> {bool(self.api_key)}, max concurrency -> {self.max_concurrency}")
     
     def convert_to_wav(self, input_path, output_path):
         """Convert any audio file to 16kHz mono WAV format with 16-bit PCM encoding"""
@@ -49,81 +68,84 @@ class JioTranslateSTTTranscriber:
             return False
 
     def process_audio(self, input_path):
-        """Ensure audio is in correct format for API"""
+        """Ensure audio is in correct format for API.
+
+        Returns (wav_path, is_temporary). The pipeline hands over the canonical artifact
+        from AudioExtractor, which is used in place; only other inputs are converted.
+        """
+        if input_path.lower().endswith('.wav') and self.validate_wav_format(input_path):
+            return input_path, False
+        
+        logger.warning(f"Input is not canonical 16kHz mono WAV, converting: {input_path}")
         temp_wav = tempfile.NamedTemporaryFile(suffix='.wav', delete=False)
         temp_wav.close()
-        
-        if not input_path.lower().endswith('.wav'):
-            return self.convert_to_wav(input_path, temp_wav.name)
-        
-        if not self.validate_wav_format(input_path):
-            return self.convert_to_wav(input_path, temp_wav.name)
-        
-        import shutil
-        shutil.copy2(input_path, temp_wav.name)
-        return temp_wav.name
+        try:
+            return self.convert_to_wav(input_path, temp_wav.name), True
+        except Exception:
+            os.unlink(temp_wav.name)
+            raise
 
-    def get_audio_duration(self, wav_path):
-        """Get duration in seconds from WAV file"""
-        with wave.open(wav_path, 'rb') as wav_file:
-            frames = wav_file.getnframes()
-            rate = wav_file.getframerate()
-            return frames / float(rate)
+    async def transcribe_wav_bytes_async(self, audio_bytes, duration, language="Hindi"):
+        """Send an in-memory WAV buffer to JioTranslate STT API without holding a thread"""
+        async with self._async_request_slots:
+            return await self._send_wav_bytes_async(audio_bytes, duration, language)
 
-    def transcribe_chunk(self, wav_path, language="Hindi"):
-        """Send audio chunk to JioTranslate STT API using correct format"""
+    async def _send_wav_bytes_async(self, audio_bytes, duration, language):
+        # Callers must hold an _async_request_slots slot
         try:
-            if not os.path.exists(wav_path):
-                logger.error(f"Audio file does not exist: {wav_path}")
-                return None
+            headers, body = self._build_request(audio_bytes, duration, language)
             
-            with open(wav_path, "rb") as f:
-                audio_bytes = f.read()
-                audio_base64 = base64.b64encode(audio_bytes).decode("utf-8")
-            
-            duration = self.get_audio_duration(wav_path)
-            
-            payload = {
-                "audio": {
-                    "content": audio_base64
-                },
-                "config": {
-                    "encoding": "LINEAR16",
-                    "language": language,
-                    "sampleRateHertz": 16000
-                },
-                "platform": "jiotranslate",
-                "duration": int(duration)
-            }
-            
-            headers = {
-                "Content-Type": "application/json",
-                "Accept": "application/json",
-                "Authorization": self.api_key
-            }
-            
-            response = requests.post(
+            response = await http_clients.async_client.post(
                 self.endpoint,
                 headers=headers,
-                data=json.dumps(payload),
+                content=body,
                 timeout=300
             )
             
-            if response.status_code == 200:
-                try:
-                    result = response.json()
-                    return result
-                except json.JSONDecodeError as e:
-                    logger.error(f"Failed to parse JSON response: {e}")
-                    return None
-            else:
-                logger.error(f"Jio API error: {response.status_code} - {response.text}")
-                return None
+            return self._parse_response(response)
                 
         except Exception as e:
             logger.error(f"Chunk transcription failed: {e}")
             return None
 
+    def _build_request(self, audio_bytes, duration, language):
+        """Headers and JSON body for one STT call"""
+        audio_base64 = base64.b64encode(audio_bytes).decode("utf-8")
+        
+        payload = {
+            "audio": {
+                "content": audio_base64
+            },
+            "config": {
+                "encoding": "LINEAR16",
+                "language": language,
+                "sampleRateHertz": 16000
+            },
+            "platform": "jiotranslate",
+            "duration": int(duration)
+        }
+        
+        headers = {
+            "Content-Type": "application/json",
+            "Accept": "application/json",
+            "Authorization": self.api_key
+        }
+        
+        return headers, json.dumps(payload)
+
+    def _parse_response(self, response):
+        """Raw API result, or None on any error"""
+        if response.status_code == 200:
+            try:
+                result = response.json()
+                return result
+            except json.JSONDecodeError as e:
+                logger.error(f"Failed to parse JSON response: {e}")
+                return None
+        else:
+            logger.error(f"Jio API error: {response.status_code} - {response.text}")
+            return None
+
     def extract_transcript_from_result(self, result):
         """Extract transcript text from API result - Updated for new Jio API format"""
         try:
@@ -160,7 +182,7 @@ class JioTranslateSTTTranscriber:
             logger.error(f"Error extracting transcript: {e}")
             return ""
 
-    def create_smart_chunks(self, audio, total_length):
+    def create_smart_chunks(self, total_length):
         """Create overlapping chunks with smart boundary detection"""
         chunks_info = []
         step_size = self.chunk_length_ms - self.overlap_ms
@@ -187,6 +209,18 @@ class JioTranslateSTTTranscriber:
         logger.info(f"Created {len(chunks_info)} overlapping chunks")
         return chunks_info
 
+    def plan_chunks(self, reader):
+        """Cut chunks in silences when VAD is enabled; fall back to fixed overlapping chunks"""
+        if voice_activity_detector.enabled:
+            try:
+                chunks_info = voice_activity_detector.plan_chunks(reader, self.chunk_length_ms)
+                if chunks_info:
+                    return chunks_info
+                logger.warning("VAD found no speech, falling back to fixed chunks")
+            except Exception as e:
+                logger.warning(f"VAD chunk planning failed, falling back to fixed chunks: {e}")
+        return self.create_smart_chunks(reader.duration_ms)
+
     def remove_overlap_from_transcript(self, current_transcript, previous_transcript, overlap_seconds):
         """Remove overlapping content from transcript using word-level matching"""
         if not previous_transcript or overlap_seconds <= 0:
@@ -228,10 +262,15 @@ class JioTranslateSTTTranscriber:
         
         return current_transcript
 
-    def transcribe_audio(self, audio_file_path: str, language: str = "Hindi") -> str:
-        """Transcribe audio using Jio Translate with smart overlapping chunks"""
+    async def transcribe_audio(self, audio_file_path: str, language: str = "Hindi", checkpoint=None) -> str:
+        """Transcribe audio using Jio Translate with smart overlapping chunks.
+
+        With a ChunkCheckpoint, chunks transcribed by an earlier attempt are reused and
+        each new chunk result is persisted as soon as it arrives.
+        """
         processed_path = None
-        chunk_files = []
+        processed_is_temporary = False
+        reader = None
         
         try:
             if not self.api_key:
@@ -239,12 +278,15 @@ class JioTranslateSTTTranscriber:
             
             logger.info(f"Starting Jio transcription for: {audio_file_path}")
             
-            processed_path = self.process_audio(audio_file_path)
-            audio = AudioSegment.from_wav(processed_path)
-            total_length = len(audio)
+            processed_path, processed_is_temporary = await asyncio.to_thread(self.process_audio, audio_file_path)
+            # Memory-map the PCM instead of decoding it; chunks are sliced straight from the mapping
+            reader = WavChunkReader(processed_path)
+            total_length = reader.duration_ms
             
             if total_length <= self.chunk_length_ms:
-                result = self.transcribe_chunk(processed_path, language)
+                result = await self.transcribe_wav_bytes_async(
+                    reader.wav_bytes(0, total_length), total_length / 1000, language
+                )
                 if result:
                     transcript = self.extract_transcript_from_result(result)
                     if transcript and transcript.strip():
@@ -255,90 +297,236 @@ class JioTranslateSTTTranscriber:
                     raise Exception("Direct transcription failed")
             
             logger.info(f"Audio duration: {total_length/1000:.1f}s, creating chunks")
-            chunks_info = self.create_smart_chunks(audio, total_length)
-            
-            transcripts = []
-            failed_chunks = 0
-            empty_chunks = 0
-            
-            for chunk_info in chunks_info:
-                start = chunk_info['start']
-                end = chunk_info['end']
-                chunk_index = chunk_info['index']
-                
-                try:
-                    chunk = audio[start:end]
-                    
-                    chunk_file = tempfile.NamedTemporaryFile(suffix=f'_chunk_{chunk_index}.wav', delete=False)
-                    chunk_file.close()
-                    chunk_files.append(chunk_file.name)
-                    
-                    chunk.export(chunk_file.name, format="wav")
-                    
-                    result = self.transcribe_chunk(chunk_file.name, language)
-                    
-                    if result:
-                        chunk_transcript = self.extract_transcript_from_result(result)
-                        
-                        if chunk_transcript and chunk_transcript.strip():
-                            if chunk_index > 0 and transcripts:
-                                overlap_seconds = self.overlap_ms / 1000
-                                previous_transcript = transcripts[-1]
-                                chunk_transcript = self.remove_overlap_from_transcript(
-                                    chunk_transcript, previous_transcript, overlap_seconds
-                                )
-                                
-                                if not chunk_transcript or not chunk_transcript.strip():
-                                    chunk_transcript = self.extract_transcript_from_result(result)
-                            
-                            if chunk_transcript and chunk_transcript.strip():
-                                transcripts.append(chunk_transcript.strip())
-                            else:
-                                empty_chunks += 1
-                        else:
-                            empty_chunks += 1
-                    else:
-                        failed_chunks += 1
-                        
-                except Exception as e:
-                    logger.error(f"Error processing chunk {chunk_index + 1}: {e}")
-                    failed_chunks += 1
-                    continue
-            
-            successful_chunks = len(transcripts)
-            logger.info(f"Processing summary: {successful_chunks} successful, {empty_chunks} empty, {failed_chunks} failed out of {len(chunks_info)} total")
-            
-            if not transcripts:
-                error_msg = f"No chunks produced valid transcripts. Empty: {empty_chunks}, Failed: {failed_chunks}, Total: {len(chunks_info)}"
-                logger.error(error_msg)
-                raise Exception(error_msg)
+            chunks_info = await asyncio.to_thread(self.plan_chunks, reader)
+            if checkpoint and await checkpoint.load():
+                reused = sum(1 for chunk_info in chunks_info if checkpoint.get(chunk_info))
+                logger.info(f"Resuming transcription: {reused} of {len(chunks_info)} chunks already done")
             
-            combined_transcript = self._combine_transcripts_safely(transcripts)
+            # Transcribe chunks concurrently; results come back indexed by chunk position
+            chunk_results = await asyncio.gather(*(
+                self._transcribe_chunk_segment(reader, chunk_info, language, checkpoint)
+                for chunk_info in chunks_info
+            ))
             
-            if combined_transcript and combined_transcript.strip():
-                logger.info(f"Jio transcription successful, final length: {len(combined_transcript)} characters")
-                return combined_transcript.strip()
-            else:
-                error_msg = f"Combined transcript is empty despite {successful_chunks} successful chunks"
-                logger.error(error_msg)
-                raise Exception(error_msg)
+            return self._assemble_chunk_results(chunks_info, chunk_results)
                 
         except Exception as e:
             logger.error(f"Jio transcription failed: {e}")
             raise
         finally:
-            if processed_path and os.path.exists(processed_path):
+            if reader:
+                reader.close()
+            
+            if processed_is_temporary and os.path.exists(processed_path):
                 try:
                     os.unlink(processed_path)
                 except:
                     pass
+
+    async def transcribe_stream(self, pcm_blocks, language: str = "Hindi", checkpoint=None) -> str:
+        """Transcribe 16kHz mono 16-bit PCM while it is still being decoded.
+
+        pcm_blocks is a blocking iterator (e.g. AudioExtractor.stream_pcm); it is advanced
+        in a worker thread. Each chunk is submitted as soon as enough audio has arrived,
+        cut at the quietest point near the chunk limit, so extraction and transcription
+        overlap. Chunks that are pure silence are never sent. Decoding is deterministic,
+        so a resumed stream finds the same chunks in the checkpoint and skips them.
+        """
+        if not self.api_key:
+            raise Exception("Jio API key not configured")
+        if checkpoint:
+            await checkpoint.load()
+        
+        sample_rate = 16000
+        bytes_per_ms = sample_rate * 2 // 1000
+        chunk_bytes = self.chunk_length_ms * bytes_per_ms
+        
+        chunks_info = []
+        chunk_results = []
+        tasks = {}  # chunk position -> task for chunks that still need the API
+        buffer = bytearray()
+        position_ms = 0
+        # Backpressure: decoding pauses (ffmpeg blocks on its pipe) while too many chunks wait for the API
+        pending_slots = asyncio.Semaphore(self.max_concurrency * 2)
+        
+        async def run_chunk(pcm, chunk_info):
+            try:
+                result = await self._send_with_retries(
+                    chunk_info, lambda: self._transcribe_pcm_segment(pcm, sample_rate, chunk_info, language)
+                )
+                if result and checkpoint:
+                    await checkpoint.save(chunk_info, result)
+                return result
+            finally:
+                pending_slots.release()
+        
+        async def submit(pcm):
+            nonlocal position_ms
+            duration_ms = len(pcm) // bytes_per_ms
+            chunk_info = {
+                'index': len(chunks_info),
+                'start': position_ms,
+                'end': position_ms + duration_ms,
+                'is_first': not chunks_info,
+                'is_last': False,
+                'overlap_start': 0,
+                'overlap_end': 0
+            }
+            position_ms += duration_ms
+            
+            if voice_activity_detector.enabled and not voice_activity_detector.has_speech(
+                    voice_activity_detector.pcm_energies(pcm, sample_rate)):
+                logger.info(f"Skipping silent chunk at {chunk_info['start'] / 1000:.1f}s")
+                return
+            
+            stored = checkpoint.get(chunk_info) if checkpoint else None
+            if stored:
+                chunks_info.append(chunk_info)
+                chunk_results.append(stored)
+                logger.info(f"Reusing checkpointed chunk {chunk_info['index'] + 1}")
+                return
             
-            for chunk_file in chunk_files:
-                if os.path.exists(chunk_file):
-                    try:
-                        os.unlink(chunk_file)
-                    except:
-                        pass
+            await pending_slots.acquire()
+            tasks[len(chunks_info)] = asyncio.create_task(run_chunk(pcm, chunk_info))
+            chunks_info.append(chunk_info)
+            chunk_results.append(None)
+            logger.info(f"Submitted streamed chunk {chunk_info['index'] + 1} "
+                        f"({chunk_info['start'] / 1000:.1f}s-{chunk_info['end'] / 1000:.1f}s)")
+        
+        blocks = iter(pcm_blocks)
+        try:
+            while True:
+                block = await asyncio.to_thread(next, blocks, None)
+                if block is None:
+                    break
+                buffer += block
+                while len(buffer) >= chunk_bytes:
+                    window = bytes(buffer[:chunk_bytes])
+                    cut = chunk_bytes
+                    if voice_activity_detector.enabled:
+                        cut_ms = voice_activity_detector.streaming_cut_ms(
+                            voice_activity_detector.pcm_energies(window, sample_rate), self.chunk_length_ms
+                        )
+                        cut = cut_ms * bytes_per_ms
+                    await submit(window[:cut])
+                    del buffer[:cut]
+            
+            if len(buffer) >= bytes_per_ms:
+                await submit(bytes(buffer))
+            
+            for position, result in zip(tasks, await asyncio.gather(*tasks.values())):
+                chunk_results[position] = result
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            raise
+        
+        if not chunks_info:
+            raise Exception("Streamed audio contained no speech")
+        chunks_info[-1]['is_last'] = True
+        logger.info(f"Streamed {position_ms / 1000:.1f}s of audio in {len(chunks_info)} chunks")
+        return self._assemble_chunk_results(chunks_info, chunk_results)
+
+    async def _transcribe_pcm_segment(self, pcm, sample_rate, chunk_info, language):
+        """Frame one streamed PCM chunk as WAV and send it to the API; returns the raw API result or None"""
+        try:
+            header = build_wav_header(len(pcm), sample_rate, 1, 2)
+            duration = (chunk_info['end'] - chunk_info['start']) / 1000
+            return await self.transcribe_wav_bytes_async(header + pcm, duration, language)
+        except Exception as e:
+            logger.error(f"Error processing chunk {chunk_info['index'] + 1}: {e}")
+            return None
+
+    def _assemble_chunk_results(self, chunks_info, chunk_results):
+        """Join per-chunk API results in chunk order into one transcript.
+
+        Raises IncompleteTranscriptionError if any chunk has no result, so a transcript
+        with gaps is never returned.
+        """
+        missing_chunks = [chunk_info['index'] for chunk_info, result in zip(chunks_info, chunk_results) if not result]
+        if missing_chunks:
+            error = IncompleteTranscriptionError(missing_chunks, len(chunks_info))
+            logger.error(f"Jio transcription incomplete: {error}")
+            raise error
+        
+        transcripts = []
+        empty_chunks = 0
+        
+        # Overlap trimming compares against the previous transcript, so it must run in chunk order
+        for chunk_info, result in zip(chunks_info, chunk_results):
+            chunk_index = chunk_info['index']
+            chunk_transcript = self.extract_transcript_from_result(result)
+            
+            if chunk_transcript and chunk_transcript.strip():
+                if chunk_index > 0 and transcripts:
+                    overlap_seconds = chunk_info['overlap_start'] / 1000
+                    previous_transcript = transcripts[-1]
+                    chunk_transcript = self.remove_overlap_from_transcript(
+                        chunk_transcript, previous_transcript, overlap_seconds
+                    )
+                    
+                    if not chunk_transcript or not chunk_transcript.strip():
+                        chunk_transcript = self.extract_transcript_from_result(result)
+                
+                if chunk_transcript and chunk_transcript.strip():
+                    transcripts.append(chunk_transcript.strip())
+                else:
+                    empty_chunks += 1
+            else:
+                empty_chunks += 1
+        
+        successful_chunks = len(transcripts)
+        logger.info(f"Processing summary: {successful_chunks} successful, {empty_chunks} empty out of {len(chunks_info)} total")
+        
+        if not transcripts:
+            error_msg = f"No chunks produced valid transcripts. Empty: {empty_chunks}, Total: {len(chunks_info)}"
+            logger.error(error_msg)
+            raise Exception(error_msg)
+        
+        combined_transcript = self._combine_transcripts_safely(transcripts)
+        
+        if combined_transcript and combined_transcript.strip():
+            logger.info(f"Jio transcription successful, final length: {len(combined_transcript)} characters")
+            return combined_transcript.strip()
+        else:
+            error_msg = f"Combined transcript is empty despite {successful_chunks} successful chunks"
+            logger.error(error_msg)
+            raise Exception(error_msg)
+
+    async def _transcribe_chunk_segment(self, reader, chunk_info, language, checkpoint=None):
+        """Slice one chunk out of the mapped WAV and send it to the API; returns the raw API result or None"""
+        stored = checkpoint.get(chunk_info) if checkpoint else None
+        if stored:
+            return stored
+        
+        async def send():
+            try:
+                # Slice only once a slot is free, so queued chunks don't hold their bytes in memory
+                async with self._async_request_slots:
+                    chunk_bytes = reader.wav_bytes(chunk_info['start'], chunk_info['end'])
+                    duration = (chunk_info['end'] - chunk_info['start']) / 1000
+                    return await self._send_wav_bytes_async(chunk_bytes, duration, language)
+            except Exception as e:
+                logger.error(f"Error processing chunk {chunk_info['index'] + 1}: {e}")
+                return None
+        
+        result = await self._send_with_retries(chunk_info, send)
+        if result and checkpoint:
+            await checkpoint.save(chunk_info, result)
+        return result
+
+    async def _send_with_retries(self, chunk_info, send):
+        """Await send() until it returns a result, retrying with exponential backoff; None if it never does"""
+        for attempt in range(self.chunk_retries + 1):
+            if attempt:
+                delay = self.retry_base_seconds * (2 ** (attempt - 1))
+                logger.warning(f"Retrying chunk {chunk_info['index'] + 1} in {delay:.1f}s (retry {attempt} of {self.chunk_retries})")
+                await asyncio.sleep(delay)
+            result = await send()
+            if result:
+                return result
+        return None
 
     def _combine_transcripts_safely(self, transcripts):
         """Safely combine transcripts with validation"""
@@ -364,7 +552,7 @@ class JioOnlySTTTranscriber:
         self.jio_transcriber = JioTranslateSTTTranscriber()
         logger.info(f"Jio-Only STT Transcriber initialized")
     
-    def transcribe_audio(self, audio_file_path: str, language: str = "Hindi") -> str:
+    async def transcribe_audio(self, audio_file_path: str, language: str = "Hindi", checkpoint=None) -> str:
         """Transcribe audio using only Jio Translate API with smart chunking"""
         try:
             if not self.jio_transcriber.api_key:
@@ -372,7 +560,7 @@ class JioOnlySTTTranscriber:
                 raise Exception("Jio API key not configured properly. Check your .env file.")
             
             logger.info(f"Starting Jio Translate transcription for: {audio_file_path}")
-            result = self.jio_transcriber.transcribe_audio(audio_file_path, language)
+            result = await self.jio_transcriber.transcribe_audio(audio_file_path, language, checkpoint)
             
             if result and result.strip():
                 logger.info(f"Jio Translate transcription successful, length: {len(result)}")
@@ -384,5 +572,24 @@ class JioOnlySTTTranscriber:
             logger.error(f"Jio Translate transcription failed: {e}")
             raise Exception(f"Jio Translate transcription failed: {str(e)}")
 
+    async def transcribe_stream(self, pcm_blocks, language: str = "Hindi", checkpoint=None) -> str:
+        """Transcribe PCM blocks as they are decoded using only Jio Translate API"""
+        try:
+            if not self.jio_transcriber.api_key:
+                logger.error("Jio API key not configured properly. Check your .env file.")
+                raise Exception("Jio API key not configured properly. Check your .env file.")
+            
+            result = await self.jio_transcriber.transcribe_stream(pcm_blocks, language, checkpoint)
+            
+            if result and result.strip():
+                logger.info(f"Jio Translate streaming transcription successful, length: {len(result)}")
+                return result.strip()
+            else:
+                raise Exception("Jio Translate returned empty transcription")
+                
+        except Exception as e:
+            logger.error(f"Jio Translate streaming transcription failed: {e}")
+            raise Exception(f"Jio Translate transcription failed: {str(e)}")
+
 # Create global instance
 jio_only_stt_transcriber = JioOnlySTTTranscriber()
\ No newline at end of file
@@ -0,0 +1,227 @@
+import os
+import uuid
+import socket
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional
+from pymongo import ASCENDING, ReturnDocument
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from app.core.config import settings
+from app.core.database import RequestStatus
+
+logger = logging.getLogger(__name__)
+
+# Lease owner identity of this process (API replica or worker)
+PROCESS_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+# Requests in these states have not finished and may need to be picked up again
+UNFINISHED_STATUSES = [RequestStatus.INITIATED, RequestStatus.PROCESSING, RequestStatus.RESUMED]
+
+class QueueState:
+    QUEUED = "queued"
+    LEASED = "leased"
+    DONE = "done"
+
+class JobQueue:
+    """MongoDB-backed job queue built on the `requests` collection.
+
+    The API marks a request as queued; workers claim it with an atomic
+    find_one_and_update that sets a lease, renew the lease with heartbeats while the
+    pipeline runs, and release it when done. Inline jobs run by an API process are
+    leased to that process the same way. A lease that is not renewed expires, so a
+    job held by a dead process becomes claimable again.
+    """
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.db = db
+        self.requests_collection = db.requests
+        self.meta_collection = db.job_queue_meta
+        self.lease_seconds = settings.JOB_LEASE_SECONDS
+
+    async def setup(self):
+        """Create indexes and retire requests that predate the queue; run at every start"""
+        await self.ensure_indexes()
+        await self.fail_legacy_requests()
+
+    async def ensure_indexes(self):
+        await self.requests_collection.create_index(
+            [("queue_state", ASCENDING), ("job_priority", ASCENDING), ("enqueued_at", ASCENDING)]
+        )
+        await self.requests_collection.create_index([("queue_state", ASCENDING), ("lease_expires_at", ASCENDING)])
+        await self.requests_collection.create_index([("status", ASCENDING), ("updated_at", ASCENDING)])
+
+    async def queue_created_at(self) -> Optional[datetime]:
+        """When the first process with a job queue started against this database"""
+        meta = await self.meta_collection.find_one({"_id": "queue"})
+        return meta["created_at"] if meta else None
+
+    async def fail_legacy_requests(self) -> int:
+        """Mark unfinished requests created before the queue existed as failed.
+
+        They were never leased, so nothing can tell whether their process is still
+        running them; without this, recovery would restart every stale request in the
+        collection on the first deploy.
+        """
+        now = datetime.utcnow()
+        meta = await self.meta_collection.find_one_and_update(
+            {"_id": "queue"},
+            {"$setOnInsert": {"created_at": now}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        result = await self.requests_collection.update_many(
+            {
+                "status": {"$in": UNFINISHED_STATUSES},
+                "queue_state": {"$exists": False},
+                "created_at": {"$lt": meta["created_at"]}
+            },
+            {
+                "$set": {
+                    "status": RequestStatus.FAILED,
+                    "error_message": "Processing was interrupted before the job queue was introduced",
+                    "queue_state": QueueState.DONE,
+                    "updated_at": now
+                }
+            }
+        )
+        if result.modified_count:
+            logger.warning(f"Marked {result.modified_count} unfinished requests from before the job queue as failed")
+        return result.modified_count
+
+    async def enqueue(self, request_id: str, job_type: str, priority: int):
+        """Make a request claimable by workers"""
+        await self.requests_collection.update_one(
+            {"request_id": request_id},
+            {
+                "$set": {
+                    "job_type": job_type,
+                    "job_priority": priority,
+                    "queue_state": QueueState.QUEUED,
+                    "enqueued_at": datetime.utcnow(),
+                    "updated_at": datetime.utcnow()
+                },
+                "$unset": {"lease_owner": "", "lease_expires_at": ""}
+            }
+        )
+        logger.info(f"Enqueued {job_type} job {request_id}")
+
+    async def count_pending(self) -> int:
+        return await self.requests_collection.count_documents({"queue_state": QueueState.QUEUED})
+
+    async def claim(self, worker_id: str, job_types: List[str]) -> Optional[Dict[str, Any]]:
+        """Atomically lease the highest-priority claimable job of one of job_types"""
+        now = datetime.utcnow()
+        return await self.requests_collection.find_one_and_update(
+            {
+                "job_type": {"$in": job_types},
+                "$or": [
+                    {"queue_state": QueueState.QUEUED},
+                    # Lease ran out without a heartbeat: the worker holding it is gone
+                    {
+                        "queue_state": QueueState.LEASED,
+                        "lease_expires_at": {"$lt": now},
+                        "attempts": {"$lt": settings.JOB_MAX_ATTEMPTS}
+                    }
+                ]
+            },
+            {
+                "$set": {
+                    "queue_state": QueueState.LEASED,
+                    "lease_owner": worker_id,
+                    "lease_expires_at": now + timedelta(seconds=self.lease_seconds),
+                    "heartbeat_at": now
+                },
+                "$inc": {"attempts": 1}
+            },
+            sort=[("job_priority", ASCENDING), ("enqueued_at", ASCENDING)],
+            return_document=ReturnDocument.AFTER
+        )
+
+    async def lease(self, request_id: str, job_type: str, priority: int, owner: str):
+        """Lease a job to this process directly (inline execution); renewed by renew_leases"""
+        now = datetime.utcnow()
+        await self.requests_collection.update_one(
+            {"request_id": request_id},
+            {
+                "$set": {
+                    "job_type": job_type,
+                    "job_priority": priority,
+                    "queue_state": QueueState.LEASED,
+                    "lease_owner": owner,
+                    "lease_expires_at": now + timedelta(seconds=self.lease_seconds),
+                    "heartbeat_at": now,
+                    "enqueued_at": now
+                },
+                "$inc": {"attempts": 1}
+            }
+        )
+
+    async def renew_leases(self, owner: str) -> int:
+        """Extend every lease held by owner in one round trip; returns how many were renewed"""
+        now = datetime.utcnow()
+        result = await self.requests_collection.update_many(
+            {"queue_state": QueueState.LEASED, "lease_owner": owner},
+            {"$set": {"lease_expires_at": now + timedelta(seconds=self.lease_seconds), "heartbeat_at": now}}
+        )
+        return result.modified_count
+
+    async def expire_leases(self, owner: str):
+        """Give up this process's leases at shutdown so unfinished jobs are recoverable at once"""
+        result = await self.requests_collection.update_many(
+            {"queue_state": QueueState.LEASED, "lease_owner": owner},
+            {"$set": {"lease_expires_at": datetime.utcnow()}}
+        )
+        if result.modified_count:
+            logger.info(f"Released {result.modified_count} unfinished job leases for recovery")
+
+    async def claim_interrupted(self, owner: str) -> Optional[Dict[str, Any]]:
+        """Lease one unfinished request whose previous owner stopped renewing it.
+
+        Also matches requests created since the queue existed whose process died before
+        leasing them (e.g. during the upload), once they have not been updated for a
+        full lease period. Older requests are left to fail_legacy_requests.
+        """
+        now = datetime.utcnow()
+        interrupted = [{"queue_state": QueueState.LEASED, "lease_expires_at": {"$lt": now}}]
+        queue_created_at = await self.queue_created_at()
+        if queue_created_at is not None:
+            interrupted.append({
+                "queue_state": {"$exists": False},
+                "created_at": {"$gte": queue_created_at},
+                "updated_at": {"$lt": now - timedelta(seconds=self.lease_seconds)}
+            })
+        return await self.requests_collection.find_one_and_update(
+            {
+                "status": {"$in": UNFINISHED_STATUSES},
+                "$or": interrupted
+            },
+            {
+                "$set": {
+                    "queue_state": QueueState.LEASED,
+                    "lease_owner": owner,
+                    "lease_expires_at": now + timedelta(seconds=self.lease_seconds),
+                    "heartbeat_at": now
+                },
+                "$inc": {"attempts": 1}
+            },
+            return_document=ReturnDocument.AFTER
+        )
+
+    async def heartbeat(self, request_id: str, worker_id: str) -> bool:
+        """Extend a lease; False means the lease was lost to another worker"""
+        now = datetime.utcnow()
+        result = await self.requests_collection.update_one(
+            {"request_id": request_id, "queue_state": QueueState.LEASED, "lease_owner": worker_id},
+            {"$set": {"lease_expires_at": now + timedelta(seconds=self.lease_seconds), "heartbeat_at": now}}
+        )
+        return result.matched_count == 1
+
+    async def release(self, request_id: str, worker_id: str):
+        """Mark a leased job as finished (the pipeline records success or failure itself)"""
+        await self.requests_collection.update_one(
+            {"request_id": request_id, "lease_owner": worker_id},
+            {
+                "$set": {"queue_state": QueueState.DONE, "updated_at": datetime.utcnow()},
+                "$unset": {"lease_owner": "", "lease_expires_at": ""}
+            }
+        )
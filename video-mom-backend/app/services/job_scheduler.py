@@ -0,0 +1,152 @@
+import asyncio
+import heapq
+import itertools
+import logging
+from typing import Awaitable, Callable, Dict, Any, Optional
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+class JobType:
+    TRANSCRIPTION = "transcription"
+    LLM = "llm"
+    TRANSLATION = "translation"
+
+# Lower runs first: interactive translation ahead of LLM generation ahead of bulk transcription
+JOB_PRIORITIES = {
+    JobType.TRANSLATION: 0,
+    JobType.LLM: 1,
+    JobType.TRANSCRIPTION: 2,
+}
+
+class QueueFullError(Exception):
+    """Raised when the scheduler cannot accept more work; maps to HTTP 429."""
+
+    def __init__(self, job_type: str, retry_after: int):
+        self.job_type = job_type
+        self.retry_after = retry_after
+        super().__init__(f"Too many pending {job_type} jobs, retry in {retry_after}s")
+
+class JobScheduler:
+    """In-process scheduler for background pipelines.
+
+    Jobs wait in a bounded priority queue and start only when their job type has a
+    free slot, so a burst of uploads cannot run every ffmpeg, STT and LLM call at
+    once. Running tasks are referenced until they finish and are drained on shutdown.
+    Must only be used from the event loop thread.
+    """
+
+    def __init__(self):
+        self.limits = {
+            JobType.TRANSCRIPTION: max(1, settings.JOB_MAX_TRANSCRIPTION),
+            JobType.LLM: max(1, settings.JOB_MAX_LLM),
+            JobType.TRANSLATION: max(1, settings.JOB_MAX_TRANSLATION),
+        }
+        self.max_pending = settings.JOB_QUEUE_MAX_PENDING
+        self.retry_after = settings.JOB_RETRY_AFTER_SECONDS
+        self._pending = []  # heap of (priority, seq, job_type, job_id, job_func, on_discard)
+        self._running = {job_type: 0 for job_type in self.limits}
+        self._tasks = set()
+        self._seq = itertools.count()
+        self._accepting = True
+
+    def check_capacity(self, job_type: str):
+        """Admission gate; call before accepting (and reading) a request's payload"""
+        if not self._accepting:
+            raise QueueFullError(job_type, self.retry_after)
+        if self._running[job_type] < self.limits[job_type]:
+            return
+        if len(self._pending) >= self.max_pending:
+            raise QueueFullError(job_type, self.retry_after)
+
+    def available_slots(self, job_type: str) -> int:
+        """Jobs of this type that could start right now"""
+        waiting = sum(1 for item in self._pending if item[2] == job_type)
+        return max(0, self.limits[job_type] - self._running[job_type] - waiting)
+
+    def submit(self, job_type: str, job_id: str, job_func: Callable[[], Awaitable[Any]], priority: int = None,
+               on_discard: Optional[Callable[[QueueFullError], None]] = None):
+        """Queue a job and start it as soon as its type has a free slot.
+
+        Admission is decided by check_capacity; a request that already passed it is
+        always queued, so an accepted upload is never thrown away here. If shutdown
+        drops the job before it starts, on_discard is called so a waiting caller can answer.
+        """
+        if priority is None:
+            priority = JOB_PRIORITIES[job_type]
+        heapq.heappush(self._pending, (priority, next(self._seq), job_type, job_id, job_func, on_discard))
+        logger.info(f"Queued {job_type} job {job_id} (pending: {len(self._pending)}, running: {self._running})")
+        self._dispatch()
+
+    def _dispatch(self):
+        """Start the highest-priority pending jobs whose type has a free slot"""
+        deferred = []
+        while self._pending:
+            item = heapq.heappop(self._pending)
+            job_type = item[2]
+            if self._running[job_type] < self.limits[job_type]:
+                self._start(item)
+            else:
+                deferred.append(item)
+        for item in deferred:
+            heapq.heappush(self._pending, item)
+
+    def _start(self, item):
+        _, _, job_type, job_id, job_func, _ = item
+        self._running[job_type] += 1
+        task = asyncio.create_task(self._run(job_type, job_id, job_func), name=f"{job_type}:{job_id}")
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, job_type: str, job_id: str, job_func: Callable[[], Awaitable[Any]]):
+        try:
+            await job_func()
+        except asyncio.CancelledError:
+            logger.warning(f"{job_type} job {job_id} cancelled")
+            raise
+        except Exception:
+            # Pipelines record their own failures; this only guards the scheduler
+            logger.exception(f"Unhandled error in {job_type} job {job_id}")
+        finally:
+            self._running[job_type] -= 1
+            if self._accepting:
+                self._dispatch()
+
+    def stats(self) -> Dict[str, Any]:
+        pending_by_type = {job_type: 0 for job_type in self.limits}
+        for item in self._pending:
+            pending_by_type[item[2]] += 1
+        return {
+            "accepting": self._accepting,
+            "running": dict(self._running),
+            "pending": pending_by_type,
+            "limits": dict(self.limits),
+            "max_pending": self.max_pending
+        }
+
+    async def drain(self, timeout: float):
+        """Stop accepting work and give running jobs up to timeout seconds to finish"""
+        self._accepting = False
+        if self._pending:
+            # Not started yet; their requests stay pending in MongoDB
+            logger.warning(f"Shutting down with {len(self._pending)} queued jobs not started")
+            discarded, self._pending = self._pending, []
+            for _, _, job_type, job_id, _, on_discard in discarded:
+                if on_discard:
+                    try:
+                        on_discard(QueueFullError(job_type, self.retry_after))
+                    except Exception:
+                        logger.exception(f"Discard callback failed for {job_type} job {job_id}")
+
+        if not self._tasks:
+            return
+        logger.info(f"Draining {len(self._tasks)} running jobs (timeout {timeout}s)")
+        _, still_running = await asyncio.wait(set(self._tasks), timeout=timeout)
+        for task in still_running:
+            task.cancel()
+        if still_running:
+            logger.warning(f"Cancelled {len(still_running)} jobs that did not finish within {timeout}s")
+            await asyncio.gather(*still_running, return_exceptions=True)
+
+# Global job scheduler instance
+job_scheduler = JobScheduler()
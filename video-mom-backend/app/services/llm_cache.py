@@ -0,0 +1,129 @@
+import json
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+from pymongo import ASCENDING
+from app.core.config import settings
+from app.core.database import get_sync_database
+
+logger = logging.getLogger(__name__)
+
+# After a MongoDB error the shared tier is skipped for this long, so an outage doesn't slow every call
+DB_RETRY_SECONDS = 60
+
+def fingerprint(*parts: Any) -> str:
+    """Stable SHA-256 of JSON-serializable parts, used as a content-addressed cache key"""
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class TwoTierCache:
+    """Content-addressed cache with an in-process LRU in front of a MongoDB collection.
+
+    Lookups hit the LRU first, then MongoDB (shared by every API replica and worker),
+    promoting MongoDB hits into the LRU. Entries expire through a TTL index. Used
+    from worker threads, so MongoDB is accessed with the blocking driver and the LRU
+    is guarded by a lock. MongoDB errors degrade to LRU-only caching for a while.
+    """
+
+    def __init__(self, collection_name: str, max_entries: int, ttl_hours: int):
+        self.collection_name = collection_name
+        self.max_entries = max(0, max_entries)
+        self.ttl = timedelta(hours=ttl_hours)
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._collection = None
+        self._db_retry_at = 0.0
+        self._metrics: Dict[str, Dict[str, int]] = {}
+
+    def _get_collection(self):
+        if time.monotonic() < self._db_retry_at:
+            return None
+        if self._collection is None:
+            # Short timeouts: during an outage a lookup becomes a quick miss instead of blocking the request
+            collection = get_sync_database(settings.LLM_CACHE_DB_TIMEOUT_MS)[self.collection_name]
+            collection.create_index([("expires_at", ASCENDING)], expireAfterSeconds=0)
+            self._collection = collection
+        return self._collection
+
+    def _db_failed(self, action: str, error: Exception):
+        logger.warning(f"{self.collection_name} {action} failed, using in-process cache only for {DB_RETRY_SECONDS}s: {error}")
+        self._db_retry_at = time.monotonic() + DB_RETRY_SECONDS
+
+    def _count(self, namespace: str, outcome: str):
+        with self._lock:
+            counters = self._metrics.setdefault(namespace, {"memory_hits": 0, "db_hits": 0, "misses": 0, "stores": 0})
+            counters[outcome] += 1
+
+    def _remember(self, key: str, value: Any):
+        if not self.max_entries:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                value = self._entries[key]
+            else:
+                value = None
+        if value is not None:
+            self._count(namespace, "memory_hits")
+            return value
+
+        doc = None
+        try:
+            collection = self._get_collection()
+            if collection is not None:
+                doc = collection.find_one({"_id": key, "expires_at": {"$gt": datetime.utcnow()}})
+        except Exception as e:
+            self._db_failed("lookup", e)
+        if doc is None:
+            self._count(namespace, "misses")
+            return None
+
+        self._count(namespace, "db_hits")
+        self._remember(key, doc["value"])
+        return doc["value"]
+
+    def set(self, namespace: str, key: str, value: Any):
+        self._remember(key, value)
+        self._count(namespace, "stores")
+        try:
+            collection = self._get_collection()
+            if collection is not None:
+                now = datetime.utcnow()
+                collection.replace_one(
+                    {"_id": key},
+                    {"namespace": namespace, "value": value, "created_at": now, "expires_at": now + self.ttl},
+                    upsert=True
+                )
+        except Exception as e:
+            self._db_failed("store", e)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            namespaces = {namespace: dict(counters) for namespace, counters in self._metrics.items()}
+            memory_entries = len(self._entries)
+        totals = {"memory_hits": 0, "db_hits": 0, "misses": 0, "stores": 0}
+        for counters in namespaces.values():
+            for name, count in counters.items():
+                totals[name] += count
+        lookups = totals["memory_hits"] + totals["db_hits"] + totals["misses"]
+        return {
+            **totals,
+            "hit_rate": round((totals["memory_hits"] + totals["db_hits"]) / lookups, 3) if lookups else None,
+            "memory_entries": memory_entries,
+            "max_memory_entries": self.max_entries,
+            "namespaces": namespaces
+        }
+
+# Global LLM response cache
+llm_response_cache = TwoTierCache("llm_cache", settings.LLM_CACHE_MAX_ENTRIES, settings.LLM_CACHE_TTL_HOURS)
@@ -1,19 +1,72 @@
 import os
-import requests
+import httpx
 import json
 import logging
+import random
 import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, Any, Optional
+from botocore.exceptions import ClientError
 from app.core.config import settings # Make sure settings is imported
+from app.services.http_client import http_clients
+from app.services.token_estimator import token_estimator
+from app.services.llm_cache import llm_response_cache, fingerprint
+from app.services.translation_memory import translation_memory
+from app.services.rate_limiter import bedrock_rate_limiter
 
 logger = logging.getLogger(__name__)
 
+# Sampling temperature for every chat request (part of the response cache key)
+LLM_TEMPERATURE = 0.3
+
+# Cached responses from these call sites must contain JSON, so an unparseable reply is never replayed
+JSON_CACHE_NAMESPACES = {"correction", "agenda", "agenda_translation", "translation_batch"}
+
+# Bedrock error codes that mean "slow down" rather than "this request is bad"
+BEDROCK_THROTTLING_CODES = {"ThrottlingException", "ServiceUnavailableException", "TooManyRequestsException"}
+
+# Transcript correction returns the chunk twice (corrected + Hindi) plus an English translation
+CORRECTION_MAX_OUTPUT_TOKENS = 8000
+CORRECTION_OUTPUT_FACTOR = 3.0
+# With language fan-out only the corrected text comes back (plus JSON and some growth)
+CORRECTION_FANOUT_OUTPUT_FACTOR = 1.2
+CORRECTION_PROMPT_OVERHEAD_TOKENS = 400
+
+# Output reserved for a full three-language MOM, and the most rounds of key-point condensing
+MOM_MAX_OUTPUT_TOKENS = 8000
+MOM_MAX_REDUCE_ROUNDS = 3
+
+# AWS Translate accepts at most 10,000 bytes of UTF-8 per request
+AWS_TRANSLATE_MAX_BYTES = 9000
+
+# Language fan-out: content is generated in English and translated to these
+FANOUT_CANONICAL_LANGUAGE = "english"
+FANOUT_LANGUAGE_ALIASES = {"en": "english", "english": "english", "hi": "hindi", "hindi": "hindi"}
+
+# Batch translation packs: input tokens and strings per LLM request
+BATCH_TRANSLATION_PACK_TOKENS = 1500
+BATCH_TRANSLATION_PACK_ITEMS = 100
+
+class LLMThrottledError(Exception):
+    """The provider rejected a request because of rate limits or load; safe to retry."""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        self.retry_after = retry_after
+        super().__init__(message)
+
 class LLMService:
     def __init__(self):
         # Provider selection
         self.llm_provider = getattr(settings, "LLM_PROVIDER", "huggingface").lower()
         self.translation_provider = getattr(settings, "TRANSLATION_PROVIDER", "llm").lower()
 
+        # Shared by every caller in this process, so parallel chunks and concurrent
+        # pipelines together stay within the provider's rate limits
+        self.max_concurrency = max(1, settings.LLM_MAX_CONCURRENCY)
+        self._request_slots = threading.BoundedSemaphore(self.max_concurrency)
+
         # HuggingFace config (optional — only needed when llm_provider == "huggingface")
         self.api_key = settings.HF_TOKEN
         self.hugging_face_api_url = settings.HUGGING_FACE_LLM_ENDPOINT
@@ -111,7 +164,7 @@ class LLMService:
                 "messages": converse_messages,
                 "inferenceConfig": {
                     "maxTokens": bedrock_max,
-                    "temperature": 0.3,
+                    "temperature": LLM_TEMPERATURE,
                     "topP": 0.9,
                 },
             }
@@ -119,6 +172,7 @@ class LLMService:
                 kwargs["system"] = system_parts
 
             logger.info(f"Making Bedrock Converse request with {len(converse_messages)} messages, max_tokens={bedrock_max}")
+            bedrock_rate_limiter.acquire()
             response = self.bedrock_client.converse(**kwargs)
 
             # Extract text from Bedrock response
@@ -138,6 +192,10 @@ class LLMService:
             }
 
         except Exception as e:
+            error_code = e.response["Error"]["Code"] if isinstance(e, ClientError) else None
+            if error_code in BEDROCK_THROTTLING_CODES:
+                bedrock_rate_limiter.penalize()
+                raise LLMThrottledError(f"Bedrock throttled request: {error_code}")
             logger.error(f"Bedrock Converse API error: {e}")
             return None
 
@@ -163,87 +221,56 @@ class LLMService:
         lang_code = self._AWS_LANG_CODES.get(target_language.lower(), target_language.lower())
 
         try:
-            resp = self.translate_client.translate_text(
-                Text=text,
-                SourceLanguageCode="auto",
-                TargetLanguageCode=lang_code,
-            )
-            translated = resp.get("TranslatedText", "")
-            logger.info(f"AWS Translate success, target={lang_code}, length={len(translated)}")
+            # Long documents (e.g. full MOMs) are translated piece by piece within the request size limit
+            translated_parts = []
+            for part in self._split_for_aws_translate(text):
+                resp = self.translate_client.translate_text(
+                    Text=part,
+                    SourceLanguageCode="auto",
+                    TargetLanguageCode=lang_code,
+                )
+                # AWS trims surrounding whitespace, so restore the boundary between pieces
+                translated_parts.append(resp.get("TranslatedText", "").strip())
+                translated_parts.append("\n" if part.endswith("\n") else " ")
+            translated = "".join(translated_parts).strip()
+            logger.info(f"AWS Translate success, target={lang_code}, length={len(translated)}, requests={len(translated_parts) // 2}")
             return translated
         except Exception as e:
             logger.error(f"AWS Translate error: {e}")
             return None
 
-    # ---- Chat request (first definition — used for transcription correction) ----
-
-    def _make_chat_request(self, messages: list, max_tokens: int = 8000) -> Optional[Dict]:
-        """Make request to Hugging Face chat completions API with proper token validation"""
-        # --- Provider branch: Bedrock ---
-        if self.llm_provider == "bedrock":
-            return self._make_bedrock_request(messages, max_tokens)
-
-        if not self.api_key:
-            logger.error("HF_TOKEN not configured - cannot make API requests")
-            return None
+    def _split_for_aws_translate(self, text: str) -> list:
+        """Split text at line, then sentence, then character boundaries into pieces under AWS_TRANSLATE_MAX_BYTES"""
+        if len(text.encode("utf-8")) <= AWS_TRANSLATE_MAX_BYTES:
+            return [text]
         
-        # Validate and cap max_tokens for Cohere model
-        model_max_tokens = 8192  # Cohere command-a-03-2025 limit
-        if max_tokens > model_max_tokens:
-            logger.warning(f"Requested {max_tokens} tokens exceeds model limit {model_max_tokens}, capping to safe limit")
-            max_tokens = min(4000, model_max_tokens - 500)  # Leave buffer for input tokens
-            
-        try:
-            logger.info(f"Making chat request to Hugging Face API with {len(messages)} messages")
-            logger.debug(f"Request payload: model={self.model_name}, max_tokens={max_tokens}")
-            
-            payload = {
-                "model": self.model_name,
-                "messages": messages,
-                "max_tokens": max_tokens,
-                "temperature": 0.3,
-                "top_p": 0.9
-            }
-            
-            response = requests.post(
-                self.hugging_face_api_url,
-                headers=self._get_headers(), 
-                json=payload, 
-                timeout=600
-            )
-            
-            logger.info(f"Hugging Face API response status: {response.status_code}")
-            
-            if response.status_code == 200:
-                result = response.json()
-                logger.info("Hugging Face API request successful")
-                logger.debug(f"Response keys: {list(result.keys()) if isinstance(result, dict) else 'Not a dict'}")
-                return result
-            elif response.status_code == 400:
-                # Handle token limit errors specifically
-                error_text = response.text
-                if "too many tokens" in error_text:
-                    logger.error(f"Token limit error: {error_text}")
-                logger.error(f"Bad request: {error_text}")
-                return None
-            elif response.status_code == 503:
-                logger.warning(f"Model {self.model_name} is loading - service unavailable")
-                return None
-            else:
-                logger.error(f"Hugging Face API error: {response.status_code}")
-                logger.error(f"Response text: {response.text}")
-                return None
-                
-        except requests.exceptions.Timeout as e:
-            logger.error(f"Timeout error for Hugging Face API: {e}")
-            return None
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Network error for Hugging Face API: {e}")
-            return None
-        except Exception as e:
-            logger.error(f"Unexpected error for Hugging Face API: {e}")
-            return None
-    
+        pieces = []
+        for line in text.splitlines(keepends=True):
+            if len(line.encode("utf-8")) <= AWS_TRANSLATE_MAX_BYTES:
+                pieces.append(line)
+                continue
+            # Each sentence keeps the whitespace that followed it, so a line's newline survives
+            segments = re.split(r'(?<=[।.!?])(\s+)', line)
+            for sentence in map("".join, zip(segments[0::2], segments[1::2] + [""])):
+                while len(sentence.encode("utf-8")) > AWS_TRANSLATE_MAX_BYTES:
+                    # 3 bytes per character covers every Indic script
+                    cut = AWS_TRANSLATE_MAX_BYTES // 3
+                    pieces.append(sentence[:cut])
+                    sentence = sentence[cut:]
+                if sentence:
+                    pieces.append(sentence)
+        
+        parts = []
+        current = ""
+        for piece in pieces:
+            if current and len((current + piece).encode("utf-8")) > AWS_TRANSLATE_MAX_BYTES:
+                parts.append(current)
+                current = ""
+            current += piece
+        if current:
+            parts.append(current)
+        return parts
+
     def correct_transcription(self, transcription: str) -> Dict[str, str]:
         """
         Correct and enhance transcription using Hugging Face chat API.
@@ -282,10 +309,11 @@ class LLMService:
         logger.info("Using expert rural development prompt for transcription correction")
         
         # Check if transcription is too long for single request
-        max_chars = 2000  # Safe limit for Cohere model
+        token_budget = self._correction_token_budget()
+        transcription_tokens = token_estimator.count(transcription)
         
-        if len(transcription) > max_chars:
-            logger.info(f"Transcription too long ({len(transcription)} chars), using chunked processing")
+        if transcription_tokens > token_budget:
+            logger.info(f"Transcription too long (~{transcription_tokens} tokens, budget {token_budget}), using chunked processing")
             return self._process_transcription_in_chunks(transcription)
         
         # Process normally for shorter transcriptions
@@ -293,25 +321,33 @@ class LLMService:
     
     def _process_transcription_in_chunks(self, transcription: str) -> Optional[Dict[str, str]]:
         """Process large transcription in overlapping chunks with improved merging"""
-        chunk_size = 1500
-        overlap = 200
+        token_budget = self._correction_token_budget()
+        overlap_tokens = token_budget // 10
         
         # Clean transcription before chunking
         cleaned_transcription = self._preprocess_transcription(transcription)
-        chunks = self._split_into_smart_chunks(cleaned_transcription, chunk_size, overlap)
+        chunks = self._split_into_smart_chunks(cleaned_transcription, token_budget, overlap_tokens)
         
         logger.info(f"Split transcription into {len(chunks)} chunks for processing")
         
+        # Chunks are corrected concurrently (bounded by the provider-wide request slots);
+        # map() returns the results in chunk order for merging
+        workers = min(len(chunks), self.max_concurrency) or 1
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="llm-chunk") as executor:
+            results = list(executor.map(
+                lambda indexed: self._process_indexed_chunk(indexed[0], indexed[1], len(chunks)),
+                enumerate(chunks)
+            ))
+        
         enhanced_chunks = []
         english_chunks = []
         hindi_chunks = []
         processing_errors = []
         
-        for i, chunk in enumerate(chunks):
-            logger.info(f"Processing chunk {i+1}/{len(chunks)} (length: {len(chunk)})")
-            
+        for i, (chunk, (result, exception)) in enumerate(zip(chunks, results)):
             try:
-                result = self._process_single_transcription_chunk(chunk)
+                if exception:
+                    raise exception
                 
                 if result and not result.get("error"):
                     enhanced_chunks.append({
@@ -417,6 +453,27 @@ class LLMService:
         logger.info(f"Chunked processing completed. Success rate: {final_result['processing_summary']['successful_chunks']}/{len(chunks)}")
         return final_result
 
+    def _correction_token_budget(self) -> int:
+        """Input tokens per correction request, so the corrected output and both translations fit the response"""
+        if settings.LLM_CHUNK_TOKEN_BUDGET:
+            return settings.LLM_CHUNK_TOKEN_BUDGET
+        max_output = CORRECTION_MAX_OUTPUT_TOKENS
+        if self.llm_provider == "bedrock":
+            max_output = min(max_output, settings.BEDROCK_MAX_TOKENS)
+        output_factor = CORRECTION_FANOUT_OUTPUT_FACTOR if settings.LLM_LANGUAGE_FANOUT else CORRECTION_OUTPUT_FACTOR
+        by_output = int(max_output / output_factor)
+        # Input and output share the context window
+        by_context = int((token_estimator.context_window - CORRECTION_PROMPT_OVERHEAD_TOKENS) / (1 + output_factor))
+        return max(200, min(by_output, by_context))
+
+    def _process_indexed_chunk(self, index: int, chunk: str, total: int):
+        """Correct one chunk in a worker thread; returns (result, exception) so one failure can't abort the rest"""
+        logger.info(f"Processing chunk {index+1}/{total} (length: {len(chunk)})")
+        try:
+            return self._process_single_transcription_chunk(chunk), None
+        except Exception as e:
+            return None, e
+
     def _preprocess_transcription(self, transcription: str) -> str:
         """Clean and preprocess transcription before chunking"""
         if not transcription:
@@ -457,10 +514,10 @@ class LLMService:
         return text.strip()
 
     def _split_into_smart_chunks(self, text: str, chunk_size: int, overlap: int) -> list:
-        """Split text into overlapping chunks at natural boundaries"""
+        """Split text into overlapping chunks at natural boundaries; sizes are in tokens"""
         import re
         
-        if len(text) <= chunk_size:
+        if token_estimator.count(text) <= chunk_size:
             return [text]
         
         # First try to split by sentences (Hindi and English)
@@ -476,7 +533,7 @@ class LLMService:
             if not sentence:
                 continue
                 
-            sentence_length = len(sentence)
+            sentence_length = token_estimator.count(sentence)
             
             # If adding this sentence would exceed chunk size and we have content
             if current_length + sentence_length > chunk_size and current_chunk:
@@ -489,7 +546,7 @@ class LLMService:
                 if len(current_chunk) > 2:
                     overlap_sentences = current_chunk[-2:]  # Keep last 2 sentences for context
                     current_chunk = overlap_sentences + [sentence]
-                    current_length = sum(len(s) for s in current_chunk) + len(current_chunk)
+                    current_length = sum(token_estimator.count(s) for s in current_chunk)
                 else:
                     current_chunk = [sentence]
                     current_length = sentence_length
@@ -504,7 +561,7 @@ class LLMService:
                 chunks.append(chunk_text + '.')
         
         # If sentence-based splitting didn't work well, fall back to word-based
-        if len(chunks) == 1 and len(text) > chunk_size:
+        if len(chunks) == 1 and token_estimator.count(text) > chunk_size:
             logger.info("Sentence-based chunking ineffective, using word-based chunking")
             return self._split_by_words(text, chunk_size, overlap)
         
@@ -512,18 +569,19 @@ class LLMService:
         return chunks
 
     def _split_by_words(self, text: str, chunk_size: int, overlap: int) -> list:
-        """Fallback method to split by words"""
+        """Fallback method to split by words; sizes are in tokens"""
         words = text.split()
+        word_tokens = [token_estimator.count(word) for word in words]
         chunks = []
         
         start = 0
         while start < len(words):
-            # Calculate words that fit in chunk_size characters
+            # Calculate words that fit in chunk_size tokens
             current_chunk_words = []
             current_length = 0
             
             for i in range(start, len(words)):
-                word_length = len(words[i]) + 1  # +1 for space
+                word_length = word_tokens[i]
                 if current_length + word_length <= chunk_size:
                     current_chunk_words.append(words[i])
                     current_length += word_length
@@ -533,8 +591,15 @@ class LLMService:
             if current_chunk_words:
                 chunks.append(' '.join(current_chunk_words))
                 
-                # Move start with overlap
-                overlap_words = min(overlap // 10, len(current_chunk_words) // 2)  # Roughly 10 chars per word
+                # Move start with overlap: trailing words worth up to `overlap` tokens
+                overlap_words = 0
+                overlap_length = 0
+                end = start + len(current_chunk_words)
+                while overlap_words < len(current_chunk_words) // 2:
+                    overlap_length += word_tokens[end - overlap_words - 1]
+                    if overlap_length > overlap:
+                        break
+                    overlap_words += 1
                 start += len(current_chunk_words) - overlap_words
             else:
                 # If even a single word is too long, include it anyway
@@ -612,18 +677,31 @@ class LLMService:
 
     def _process_single_transcription_chunk(self, transcription: str) -> Optional[Dict[str, str]]:
         """Process a single transcription chunk with improved error handling"""
-        system_prompt_content = (
-            "You are an expert in rural development and deeply familiar with Indian Panchayat-level issues and regional languages. "
-            "Given the following potentially inaccurate transcription, correct it based on your expertise and provide "
-            "the corrected transcription, its English translation and Hindi translation."
-            "\n\nIMPORTANT: Your entire response MUST be a single, valid JSON object. Do not include any text, explanations, or markdown formatting before or after the JSON block. "
-            "The JSON object must have these exact keys:\n"
-            "{\n"
-            "  \"corrected_transcription\": \"<The corrected and improved transcription>\",\n"
-            "  \"english_translation\": \"<An accurate English translation of the corrected text>\",\n"
-            "  \"hindi_translation\": \"<The corrected Hindi transcription, identical to the corrected_transcription value>\"\n"
-            "}"
-        )
+        if settings.LLM_LANGUAGE_FANOUT:
+            # Only the correction is generated; English is translated separately below
+            system_prompt_content = (
+                "You are an expert in rural development and deeply familiar with Indian Panchayat-level issues and regional languages. "
+                "Given the following potentially inaccurate transcription, correct it based on your expertise and provide "
+                "the corrected transcription."
+                "\n\nIMPORTANT: Your entire response MUST be a single, valid JSON object. Do not include any text, explanations, or markdown formatting before or after the JSON block. "
+                "The JSON object must have this exact key:\n"
+                "{\n"
+                "  \"corrected_transcription\": \"<The corrected and improved transcription>\"\n"
+                "}"
+            )
+        else:
+            system_prompt_content = (
+                "You are an expert in rural development and deeply familiar with Indian Panchayat-level issues and regional languages. "
+                "Given the following potentially inaccurate transcription, correct it based on your expertise and provide "
+                "the corrected transcription, its English translation and Hindi translation."
+                "\n\nIMPORTANT: Your entire response MUST be a single, valid JSON object. Do not include any text, explanations, or markdown formatting before or after the JSON block. "
+                "The JSON object must have these exact keys:\n"
+                "{\n"
+                "  \"corrected_transcription\": \"<The corrected and improved transcription>\",\n"
+                "  \"english_translation\": \"<An accurate English translation of the corrected text>\",\n"
+                "  \"hindi_translation\": \"<The corrected Hindi transcription, identical to the corrected_transcription value>\"\n"
+                "}"
+            )
 
         messages = [
             {
@@ -638,7 +716,7 @@ class LLMService:
         
         try:
             # Use conservative token limit to avoid truncation
-            result = self._make_chat_request(messages, max_tokens=8000)
+            result = self._make_chat_request(messages, max_tokens=8000, cache_namespace="correction")
                    
             if result and "choices" in result and len(result["choices"]) > 0:
                 choice = result["choices"][0]
@@ -652,6 +730,10 @@ class LLMService:
                 logger.info(f"Received expert correction response, length: {len(content)}, finish_reason: {finish_reason}")
                 
                 parsed = self._parse_expert_json_response(content, transcription)
+                if parsed and settings.LLM_LANGUAGE_FANOUT and not parsed.get("error"):
+                    # A failed translation leaves English empty without losing the correction
+                    english = self.translate_text(parsed["enhanced_original"], FANOUT_CANONICAL_LANGUAGE)
+                    parsed["enhanced_english"] = english["text"] if english["status"] == "success" else ""
                 if parsed:
                     return parsed
                 else:
@@ -680,7 +762,63 @@ class LLMService:
                 "error": f"Processing exception: {str(e)}"
             }
 
-    def _make_chat_request(self, messages: list, max_tokens: int = 8000) -> Optional[Dict]:
+    def _make_chat_request(self, messages: list, max_tokens: int = 8000, cache_namespace: Optional[str] = None) -> Optional[Dict]:
+        """Send a chat request to the configured provider within the shared concurrency limit.
+
+        Call sites that pass a cache_namespace opt in to the response cache: identical
+        requests (model, messages, max_tokens, temperature) are answered from it.
+        """
+        if not (cache_namespace and settings.LLM_CACHE_ENABLED):
+            return self._make_uncached_chat_request(messages, max_tokens)
+        
+        model_id = settings.BEDROCK_MODEL_ID if self.llm_provider == "bedrock" else self.model_name
+        cache_key = fingerprint(self.llm_provider, model_id, messages, max_tokens, LLM_TEMPERATURE)
+        cached = llm_response_cache.get(cache_namespace, cache_key)
+        if cached is not None:
+            logger.info(f"LLM cache hit ({cache_namespace})")
+            return cached
+        
+        result = self._make_uncached_chat_request(messages, max_tokens)
+        if self._is_cacheable_response(result, cache_namespace):
+            llm_response_cache.set(cache_namespace, cache_key, result)
+        return result
+
+    def _is_cacheable_response(self, result: Optional[Dict], cache_namespace: str) -> bool:
+        """Only complete, non-empty replies are cached"""
+        try:
+            choice = result["choices"][0]
+            content = choice["message"]["content"].strip()
+        except (TypeError, KeyError, IndexError, AttributeError):
+            return False
+        if not content or choice.get("finish_reason") == "length":
+            return False
+        if cache_namespace in JSON_CACHE_NAMESPACES:
+            match = re.search(r"[\{\[].*[\}\]]", content, re.DOTALL)
+            try:
+                json.loads(match.group(0) if match else content)
+            except ValueError:
+                return False
+        return True
+
+    def _make_uncached_chat_request(self, messages: list, max_tokens: int = 8000) -> Optional[Dict]:
+        """Throttled requests are retried with exponential backoff and jitter; the slot is
+        given up while waiting so other callers can proceed."""
+        max_retries = max(0, settings.LLM_MAX_RETRIES)
+        for attempt in range(max_retries + 1):
+            try:
+                with self._request_slots:
+                    return self._send_chat_request(messages, max_tokens)
+            except LLMThrottledError as e:
+                if attempt == max_retries:
+                    logger.error(f"LLM request still throttled after {max_retries} retries: {e}")
+                    return None
+                delay = e.retry_after or settings.LLM_RETRY_BASE_SECONDS * (2 ** attempt)
+                delay += random.uniform(0, settings.LLM_RETRY_BASE_SECONDS)
+                logger.warning(f"{e}; retrying in {delay:.1f}s (attempt {attempt + 1}/{max_retries})")
+                time.sleep(delay)
+        return None
+
+    def _send_chat_request(self, messages: list, max_tokens: int = 8000) -> Optional[Dict]:
         """Make request to Hugging Face chat completions API with proper token validation"""
         # --- Provider branch: Bedrock ---
         if self.llm_provider == "bedrock":
@@ -704,11 +842,11 @@ class LLMService:
                 "model": self.model_name,
                 "messages": messages,
                 "max_tokens": max_tokens,
-                "temperature": 0.3,
+                "temperature": LLM_TEMPERATURE,
                 "top_p": 0.9
             }
             
-            response = requests.post(
+            response = http_clients.sync_client.post(
                 self.hugging_face_api_url,
                 headers=self._get_headers(), 
                 json=payload, 
@@ -729,36 +867,142 @@ class LLMService:
                     logger.error(f"Token limit error: {error_text}")
                 logger.error(f"Bad request: {error_text}")
                 return None
-            elif response.status_code == 503:
-                logger.warning(f"Model {self.model_name} is loading - service unavailable")
-                return None
+            elif response.status_code in (429, 503):
+                # Rate limited, or the model is still loading
+                retry_after = response.headers.get("Retry-After")
+                raise LLMThrottledError(
+                    f"Hugging Face API returned {response.status_code} for {self.model_name}",
+                    retry_after=float(retry_after) if retry_after and retry_after.isdigit() else None
+                )
             else:
                 logger.error(f"Hugging Face API error: {response.status_code}")
                 logger.error(f"Response text: {response.text}")
                 return None
                 
-        except requests.exceptions.Timeout as e:
+        except LLMThrottledError:
+            raise
+        except httpx.TimeoutException as e:
             logger.error(f"Timeout error for Hugging Face API: {e}")
             return None
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             logger.error(f"Network error for Hugging Face API: {e}")
             return None
         except Exception as e:
             logger.error(f"Unexpected error for Hugging Face API: {e}")
             return None
     
-    def generate_multilingual_mom(self, transcription: str, primary_language: str = "en") -> Dict[str, str]:
-        """Generate Minutes of Meeting in multiple languages"""
+    def generate_multilingual_mom(self, transcription: str, primary_language: str = "en",
+                                  on_language_ready=None) -> Dict[str, str]:
+        """Generate Minutes of Meeting in multiple languages.
+
+        on_language_ready(key, value) is called from a worker thread as each language
+        version is finished when language fan-out is enabled.
+        """
         primary_language = primary_language.lower()
         mom_input = transcription
+        fan_out = settings.LLM_LANGUAGE_FANOUT
+        
+        threshold = self._mom_single_pass_max_tokens()
+        input_tokens = token_estimator.count(mom_input)
+        if input_tokens > threshold:
+            logger.info(f"Transcription is ~{input_tokens} tokens (single-pass limit {threshold}), using map-reduce MOM")
+            result = self._generate_mom_map_reduce(mom_input, primary_language, canonical_only=fan_out)
+        else:
+            # Generate multilingual MOM
+            result = self._generate_multilingual_mom_with_llm(mom_input, primary_language, canonical_only=fan_out)
         
-        # Generate multilingual MOM
-        result = self._generate_multilingual_mom_with_llm(mom_input, primary_language)
+        if fan_out:
+            return self._fan_out_languages(result, "mom", primary_language, on_language_ready)
         return result
 
-    def _generate_multilingual_mom_with_llm(self, transcription: str, primary_language: str) -> Dict[str, str]:
-        """Generate MOM in multiple languages using LLM"""
+    def _mom_single_pass_max_tokens(self) -> int:
+        """Largest transcript sent in one MOM prompt; bounded by the model's context window"""
+        by_context = token_estimator.context_window - MOM_MAX_OUTPUT_TOKENS - CORRECTION_PROMPT_OVERHEAD_TOKENS
+        return max(1000, min(settings.MOM_MAP_REDUCE_THRESHOLD_TOKENS, by_context))
+
+    def _generate_mom_map_reduce(self, transcription: str, primary_language: str, canonical_only: bool = False) -> Dict[str, str]:
+        """Extract key points from transcript segments in parallel, then synthesize one MOM from them"""
+        threshold = self._mom_single_pass_max_tokens()
+        segment_tokens = min(settings.MOM_SEGMENT_TOKENS, threshold)
+        text = transcription
+        
+        for round_number in range(1, MOM_MAX_REDUCE_ROUNDS + 1):
+            segments = self._split_into_smart_chunks(text, segment_tokens, segment_tokens // 20)
+            logger.info(f"MOM map round {round_number}: extracting key points from {len(segments)} segments")
+            
+            workers = min(len(segments), self.max_concurrency) or 1
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="llm-mom") as executor:
+                key_points = list(executor.map(
+                    lambda indexed: self._extract_mom_key_points(indexed[1], indexed[0], len(segments)),
+                    enumerate(segments)
+                ))
+            
+            extracted = [(i, points) for i, points in enumerate(key_points) if points]
+            if not extracted:
+                error_msg = "MOM generation failed: Could not extract key points from the transcription."
+                return {
+                    f"{primary_language}_mom": error_msg,
+                    "english_mom": error_msg,
+                    "hindi_mom": error_msg,
+                    "status": "failed_map_step"
+                }
+            if len(extracted) < len(segments):
+                logger.warning(f"Key point extraction failed for {len(segments) - len(extracted)} of {len(segments)} segments")
+            
+            text = "\n\n".join(f"Part {i + 1} of {len(segments)}:\n{points}" for i, points in extracted)
+            # Key points of very long meetings may still be too long; condense them again
+            if token_estimator.count(text) <= threshold or len(segments) == 1:
+                break
+        
+        return self._synthesize_final_mom(text, primary_language, canonical_only)
+
+    def _extract_mom_key_points(self, segment: str, index: int, total: int) -> Optional[str]:
+        """Map step: key points, decisions and action items from one part of the meeting, in English"""
+        logger.info(f"Extracting MOM key points from segment {index + 1}/{total} (~{token_estimator.count(segment)} tokens)")
+        system_prompt = (
+            "You are an experienced Gram Sabha secretary. You will be given one part of a Gram Sabha meeting transcription. "
+            "List, in English plain text, everything from this part that belongs in the meeting minutes:\n"
+            "- Attendees, date, time and location if mentioned\n"
+            "- Each issue raised, who raised it, and any responses\n"
+            "- Decisions made, with specifics\n"
+            "- Action items: who will do what, and by when\n\n"
+            "RULES:\n"
+            "- Keep names, locations, dates and amounts exactly as mentioned.\n"
+            "- Do not add information not present in the transcript.\n"
+            "- Return only the points, one per line, with no introduction."
+        )
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": f"Part {index + 1} of {total} of the meeting transcription:\n\n---\n{segment}"}
+        ]
+        
+        try:
+            result = self._make_chat_request(messages, max_tokens=2000)
+            if result and "choices" in result and len(result["choices"]) > 0:
+                content = result["choices"][0]["message"]["content"].strip()
+                if content:
+                    return content
+            logger.error(f"No key points returned for segment {index + 1}/{total}")
+        except Exception as e:
+            logger.error(f"Exception extracting key points from segment {index + 1}/{total}: {e}")
+        return None
+
+    def _generate_multilingual_mom_with_llm(self, transcription: str, primary_language: str,
+                                            canonical_only: bool = False) -> Dict[str, str]:
+        """Generate MOM in multiple languages using LLM; canonical_only writes just the English version"""
         primary_language = primary_language.lower()
+        if canonical_only:
+            output_keys = '  "english_mom": "Plain text MOM in English (no markdown formatting)"\n'
+            language_rule = "2. Write the MOM in English only.\n"
+            requested_keys = "Return as JSON with the english_mom key."
+        else:
+            output_keys = (
+                '  "english_mom": "Plain text MOM in English (no markdown formatting)",\n'
+                '  "hindi_mom": "Plain text MOM in Hindi (no markdown formatting)",\n'
+                f'  "{primary_language}_mom": "MOM in the requested primary language"\n'
+            )
+            language_rule = "2. Ensure all three language versions cover the same content.\n"
+            requested_keys = f"Return as JSON with {primary_language}_mom, english_mom, and hindi_mom keys."
         # Use regular string concatenation to avoid f-string brace conflicts
         system_prompt = (
             "You are an experienced Gram Sabha secretary who writes clear, readable meeting minutes. "
@@ -783,14 +1027,12 @@ class LLMService:
 
             "OUTPUT FORMAT: A VALID JSON STRING (parseable with json.loads()) with these exact keys:\n"
             "{\n"
-            '  "english_mom": "Plain text MOM in English (no markdown formatting)",\n'
-            '  "hindi_mom": "Plain text MOM in Hindi (no markdown formatting)",\n'
-            f'  "{primary_language}_mom": "MOM in the requested primary language"\n'
+            + output_keys +
             "}\n\n"
 
             "RULES:\n"
             "1. Do not add any information not present in the transcript.\n"
-            "2. Ensure all three language versions cover the same content.\n"
+            + language_rule +
             "3. Plain text only inside JSON values — no markdown, no bullet characters, no special formatting.\n"
             "4. Return ONLY the JSON object, no additional text."
         )
@@ -807,7 +1049,7 @@ class LLMService:
                     f"Transcription:\n{transcription}\n\n"
                     f"Primary language requested: {primary_language}\n\n"
                     "Create comprehensive, well-structured MOMs that capture all key discussions, decisions, and action items.\n"
-                    f"Return as JSON with {primary_language}_mom, english_mom, and hindi_mom keys."
+                    + requested_keys
                 )
             }
         ]
@@ -826,7 +1068,7 @@ class LLMService:
             
             if "choices" in result and len(result["choices"]) > 0:
                 content = result["choices"][0]["message"]["content"].strip()
-                parsed = self._parse_multilingual_response(content, primary_language, "mom")
+                parsed = self._parse_multilingual_response(content, primary_language, "mom", canonical_only)
                 
                 if parsed:
                     parsed["status"] = "success"
@@ -860,10 +1102,20 @@ class LLMService:
                 "status": "failed_exception"
             }
 
-    def _synthesize_final_mom(self, combined_summary: str, primary_language: str) -> Dict[str, str]:
+    def _synthesize_final_mom(self, combined_summary: str, primary_language: str, canonical_only: bool = False) -> Dict[str, str]:
         """Creates a final, structured MOM from a collection of key points."""
         logger.info(f"Synthesizing MOM from combined summary of length {len(combined_summary)}")
         primary_language = primary_language.lower()
+        if canonical_only:
+            output_keys = "- english_mom: The MOM in English.\n\n"
+            language_rule = "- Write the MOM in English only.\n"
+        else:
+            output_keys = (
+                f"- {primary_language}_mom: The MOM in the requested language.\n"
+                "- english_mom: The MOM in English.\n"
+                "- hindi_mom: The MOM in Hindi.\n\n"
+            )
+            language_rule = f"- Provide all three language versions ({primary_language}, English, Hindi) with the same content.\n"
         # Use string concatenation to avoid f-string brace conflicts
         system_prompt = (
             "You are an experienced Gram Sabha secretary who writes clear, readable meeting minutes. "
@@ -875,9 +1127,7 @@ class LLMService:
             "- Be specific with names, locations, dates, and amounts where available.\n"
             "- Avoid bureaucratic jargon — keep it conversational and direct.\n\n"
             "Return your response as a single JSON object with these keys:\n"
-            f"- {primary_language}_mom: The MOM in the requested language.\n"
-            "- english_mom: The MOM in English.\n"
-            "- hindi_mom: The MOM in Hindi.\n\n"
+            + output_keys +
             "MOM STRUCTURE:\n"
             "1. Meeting Overview (Date, Time, Attendees - if available)\n"
             "2. Issues Discussed (Organized by topic, with problems raised and responses)\n"
@@ -886,7 +1136,7 @@ class LLMService:
             "RULES:\n"
             "- Do not add information not present in the source points.\n"
             "- Organize by topic, not chronologically.\n"
-            f"- Provide all three language versions ({primary_language}, English, Hindi) with the same content.\n"
+            + language_rule +
             "- Plain text only — no markdown or special formatting.\n"
             "- Return ONLY the JSON object, no additional text."
         )
@@ -897,14 +1147,11 @@ class LLMService:
         ]
 
         try:
-            result = self._make_chat_request(messages, max_tokens=8000)
-            
-            # DEBUG: Save LLM result to file for synthesis step too
-            self._save_llm_debug_result(result, combined_summary, primary_language, "mom_synthesis")
+            result = self._make_chat_request(messages, max_tokens=MOM_MAX_OUTPUT_TOKENS)
             
             if result and "choices" in result and len(result["choices"]) > 0:
                 content = result["choices"][0]["message"]["content"].strip()
-                parsed = self._parse_multilingual_response(content, primary_language, "mom")
+                parsed = self._parse_multilingual_response(content, primary_language, "mom", canonical_only)
                 if parsed:
                     parsed["status"] = "success"
                     return parsed
@@ -940,7 +1187,8 @@ class LLMService:
             normalized.append(new_item)
         return normalized
 
-    def generate_multilingual_agenda_from_issues(self, issues: list, primary_language: str = "en") -> Dict[str, str]:
+    def generate_multilingual_agenda_from_issues(self, issues: list, primary_language: str = "en",
+                                                 on_language_ready=None) -> Dict[str, str]:
         """Generate agenda from issues in multiple languages"""
         primary_language = primary_language.lower()
         logger.info(f"Starting multilingual agenda generation for language: {primary_language}")
@@ -954,7 +1202,10 @@ class LLMService:
                 "status": "failed_no_issues"
             }
 
-        result = self._generate_multilingual_agenda_with_llm(issues, primary_language)
+        fan_out = settings.LLM_LANGUAGE_FANOUT
+        result = self._generate_multilingual_agenda_with_llm(issues, primary_language, canonical_only=fan_out)
+        if fan_out:
+            result = self._fan_out_languages(result, "agenda", primary_language, on_language_ready)
         # --- Normalize agenda items in all languages ---
         for lang in [primary_language, 'english', 'hindi']:
             key = f"{lang}_agenda"
@@ -962,10 +1213,12 @@ class LLMService:
                 result[key] = self._normalize_agenda_items(result[key])
         return result
 
-    def _generate_multilingual_agenda_with_llm(self, issues: list, primary_language: str) -> Dict[str, str]:
+    def _generate_multilingual_agenda_with_llm(self, issues: list, primary_language: str,
+                                               canonical_only: bool = False) -> Dict[str, str]:
         """Generate agenda from issues in multiple languages using LLM with consistent format"""
         primary_language = primary_language.lower()
         issues_text = self._format_issues_for_prompt(issues)
+        output_keys, language_rule, requested_keys = self._agenda_output_spec(primary_language, canonical_only)
         
         # Use regular string concatenation to avoid f-string brace conflicts
         system_prompt = (
@@ -992,9 +1245,7 @@ class LLMService:
 
             "OUTPUT FORMAT: A VALID JSON STRING (parseable with json.loads()) with these exact keys:\n"
             "{\n"
-            f'  "{primary_language}_agenda": [list of agenda items in the requested language],\n'
-            '  "english_agenda": [list of agenda items in English],\n'
-            '  "hindi_agenda": [list of agenda items in Hindi]\n'
+            + output_keys +
             "}\n\n"
 
             "Each agenda item must be a JSON object:\n"
@@ -1018,7 +1269,7 @@ class LLMService:
 
             "RULES:\n"
             "1. Each issue ID must appear in exactly one agenda item — never split across multiple.\n"
-            "2. Ensure all three language versions have the same groupings and issue_ids.\n"
+            "2. " + language_rule +
             "3. Return ONLY the JSON object, no additional text."
         )
 
@@ -1037,12 +1288,12 @@ class LLMService:
 
                 Create comprehensive, well-structured agendas that properly group similar issues together.
                 "Ensure each agenda item contains BOTH 'linked_issues' (array of issue IDs) and 'issue_ids' (mapping of issue IDs to short labels)."
-                Return as JSON with {primary_language}_agenda, english_agenda, and hindi_agenda keys."""
+                {requested_keys}"""
             }
         ]
 
         try:
-            result = self._make_chat_request(messages, max_tokens=8000)
+            result = self._make_chat_request(messages, max_tokens=8000, cache_namespace="agenda")
             
             if result and "choices" in result and len(result["choices"]) > 0:
                 choice = result["choices"][0]
@@ -1053,7 +1304,7 @@ class LLMService:
                 if finish_reason == "length":
                     logger.warning("⚠️ LLM response was likely cut off due to token limit")
 
-                parsed = self._parse_multilingual_response(content, primary_language, "agenda")
+                parsed = self._parse_multilingual_response(content, primary_language, "agenda", canonical_only)
                 
                 if parsed:
                     parsed["status"] = "success"
@@ -1085,7 +1336,8 @@ class LLMService:
                 "status": "failed_exception"
             }
 
-    def update_multilingual_agenda_with_issues(self, current_agenda: list, new_issues: list, primary_language: str = "en") -> Dict[str, str]:
+    def update_multilingual_agenda_with_issues(self, current_agenda: list, new_issues: list, primary_language: str = "en",
+                                               on_language_ready=None) -> Dict[str, str]:
         """Update agenda with new issues in multiple languages"""
         primary_language = primary_language.lower()
         logger.info(f"Starting multilingual agenda update for language: {primary_language}")
@@ -1097,9 +1349,12 @@ class LLMService:
         
         if not current_agenda and new_issues:
             # Generate new agenda from issues if no current agenda
-            return self.generate_multilingual_agenda_from_issues(new_issues, primary_language)
+            return self.generate_multilingual_agenda_from_issues(new_issues, primary_language, on_language_ready)
 
-        result = self._update_multilingual_agenda_with_llm(current_agenda, new_issues, primary_language)
+        fan_out = settings.LLM_LANGUAGE_FANOUT
+        result = self._update_multilingual_agenda_with_llm(current_agenda, new_issues, primary_language, canonical_only=fan_out)
+        if fan_out:
+            result = self._fan_out_languages(result, "agenda", primary_language, on_language_ready)
         # --- Normalize agenda items in all languages ---
         for lang in [primary_language, 'english', 'hindi']:
             key = f"{lang}_agenda"
@@ -1107,12 +1362,14 @@ class LLMService:
                 result[key] = self._normalize_agenda_items(result[key])
         return result
 
-    def _update_multilingual_agenda_with_llm(self, current_agenda: list, new_issues: list, primary_language: str) -> Dict[str, str]:
+    def _update_multilingual_agenda_with_llm(self, current_agenda: list, new_issues: list, primary_language: str,
+                                             canonical_only: bool = False) -> Dict[str, str]:
         """Update agenda with new issues in multiple languages using LLM with consistent format"""
         
         current_agenda_text = json.dumps(current_agenda, indent=2, ensure_ascii=False)
         new_issues_text = self._format_issues_for_prompt(new_issues)
         primary_language = primary_language.lower()
+        output_keys, language_rule, requested_keys = self._agenda_output_spec(primary_language, canonical_only)
         system_prompt = (
             "You are an expert secretary for Gram Sabha meetings with deep knowledge of Indian Panchayat governance, "
             "rural development schemes, and regional languages.\n\n"
@@ -1135,9 +1392,7 @@ class LLMService:
 
             "OUTPUT FORMAT: A VALID JSON STRING (parseable with json.loads()) with these exact keys:\n"
             "{\n"
-            f'  "{primary_language}_agenda": [updated list of agenda items in the requested language],\n'
-            '  "english_agenda": [updated list of agenda items in English],\n'
-            '  "hindi_agenda": [updated list of agenda items in Hindi]\n'
+            + output_keys.replace("[list", "[updated list") +
             "}\n\n"
 
             "Each agenda item must be a JSON object with these 4 fields:\n"
@@ -1156,7 +1411,7 @@ class LLMService:
             "RULES:\n"
             "1. Each issue ID must appear in exactly one agenda item — never split across multiple.\n"
             "2. Preserve all existing issue IDs from the current agenda — do not drop any.\n"
-            "3. Ensure all three language versions have the same groupings and issue_ids.\n"
+            "3. " + language_rule +
             "4. Return ONLY the JSON object, no additional text."
         )
 
@@ -1178,16 +1433,16 @@ class LLMService:
                 Primary language requested: {primary_language}
 
                 Create updated, well-structured agendas that properly integrate the new issues.
-                Return as JSON with {primary_language}_agenda, english_agenda, and hindi_agenda keys."""
+                {requested_keys}"""
             }
         ]
 
         try:
-            result = self._make_chat_request(messages, max_tokens=8000)
+            result = self._make_chat_request(messages, max_tokens=8000, cache_namespace="agenda")
             
             if result and "choices" in result and len(result["choices"]) > 0:
                 content = result["choices"][0]["message"]["content"].strip()
-                parsed = self._parse_multilingual_response(content, primary_language, "agenda")
+                parsed = self._parse_multilingual_response(content, primary_language, "agenda", canonical_only)
                 
                 if parsed:
                     parsed["status"] = "success"
@@ -1219,6 +1474,22 @@ class LLMService:
                 "status": "failed_exception"
             }
 
+    def _agenda_output_spec(self, primary_language: str, canonical_only: bool):
+        """JSON keys, language rule and closing instruction for the agenda prompts"""
+        if canonical_only:
+            return (
+                '  "english_agenda": [list of agenda items in English]\n',
+                "Write every agenda item in English only.\n",
+                "Return as JSON with the english_agenda key."
+            )
+        return (
+            f'  "{primary_language}_agenda": [list of agenda items in the requested language],\n'
+            '  "english_agenda": [list of agenda items in English],\n'
+            '  "hindi_agenda": [list of agenda items in Hindi]\n',
+            "Ensure all three language versions have the same groupings and issue_ids.\n",
+            f"Return as JSON with {primary_language}_agenda, english_agenda, and hindi_agenda keys."
+        )
+
     def _format_issues_for_prompt(self, issues: list) -> str:
         """Format issues data for the LLM prompt with all available context"""
         formatted_issues = []
@@ -1237,8 +1508,9 @@ class LLMService:
             formatted_issues.append("\n".join(parts))
         return "\n".join(formatted_issues)
 
-    def _parse_multilingual_response(self, content: str, primary_language: str, content_type: str) -> Optional[Dict[str, str]]:
-        """Parse multilingual response from LLM"""
+    def _parse_multilingual_response(self, content: str, primary_language: str, content_type: str,
+                                     canonical_only: bool = False) -> Optional[Dict[str, str]]:
+        """Parse multilingual response from LLM; canonical_only expects just the English version"""
         primary_language = primary_language.lower()
         try:
             if not content:
@@ -1262,6 +1534,14 @@ class LLMService:
             
             result = {}
             
+            if canonical_only:
+                if english_key not in parsed_json:
+                    logger.error(f"English key {english_key} not found in canonical {content_type} response")
+                    return None
+                result[english_key] = parsed_json[english_key]
+                logger.info(f"Successfully parsed canonical {content_type} response")
+                return result
+            
             # Extract each language version
             if primary_key in parsed_json:
                 result[primary_key] = parsed_json[primary_key]
@@ -1311,7 +1591,7 @@ class LLMService:
         ]
 
         try:
-            result = self._make_chat_request(messages, max_tokens=8000)
+            result = self._make_chat_request(messages, max_tokens=8000, cache_namespace="agenda")
             
             if result and "choices" in result and len(result["choices"]) > 0:
                 content = result["choices"][0]["message"]["content"].strip()
@@ -1338,6 +1618,155 @@ class LLMService:
                 "status": "fallback_exception"
             }
 
+    # ---- Language fan-out -------------------------------------------------------
+
+    def _fan_out_languages(self, result: Dict[str, Any], content_type: str, primary_language: str,
+                           on_language_ready=None) -> Dict[str, Any]:
+        """Translate canonical English content into the primary language and Hindi concurrently.
+
+        Each language succeeds or fails on its own: a failed language gets a placeholder
+        and is listed in failed_languages instead of failing the whole result.
+        """
+        if result.get("status") != "success":
+            # Canonical generation failed; the error result already fills every language key
+            return result
+        
+        english_key = f"english_{content_type}"
+        canonical = result[english_key]
+        self._publish_language(on_language_ready, content_type, english_key, canonical)
+        
+        # Output key -> language to translate into (the primary language may be English or Hindi)
+        language_names = {code: name for name, code in self._AWS_LANG_CODES.items()}
+        targets = {}
+        for key_language in (primary_language, "hindi"):
+            language = FANOUT_LANGUAGE_ALIASES.get(key_language) or language_names.get(key_language, key_language)
+            targets[f"{key_language}_{content_type}"] = language
+        languages = {language for language in targets.values() if language != FANOUT_CANONICAL_LANGUAGE}
+        
+        translations = {FANOUT_CANONICAL_LANGUAGE: canonical}
+        if languages:
+            logger.info(f"Translating {content_type} into {sorted(languages)} concurrently")
+            with ThreadPoolExecutor(max_workers=len(languages), thread_name_prefix="llm-lang") as executor:
+                futures = {
+                    executor.submit(self._translate_content, canonical, language): language
+                    for language in languages
+                }
+                for future in as_completed(futures):
+                    language = futures[future]
+                    try:
+                        translations[language] = future.result()
+                    except Exception as e:
+                        logger.error(f"Translating {content_type} into {language} failed: {e}")
+                        translations[language] = None
+                    if translations[language] is not None:
+                        for key, target in targets.items():
+                            if target == language:
+                                self._publish_language(on_language_ready, content_type, key, translations[language])
+        
+        failed_languages = []
+        for key, language in targets.items():
+            if translations.get(language) is not None:
+                result[key] = translations[language]
+                if language == FANOUT_CANONICAL_LANGUAGE and key != english_key:
+                    self._publish_language(on_language_ready, content_type, key, canonical)
+            else:
+                result[key] = f"{language.capitalize()} {content_type} not generated"
+                failed_languages.append(language)
+        
+        if failed_languages:
+            logger.warning(f"{content_type} translation failed for: {failed_languages}")
+            result["status"] = "partial_success"
+            result["failed_languages"] = sorted(set(failed_languages))
+        return result
+
+    def _publish_language(self, on_language_ready, content_type: str, key: str, value):
+        """Hand one finished language version to the caller; a failing callback never fails generation"""
+        if not on_language_ready:
+            return
+        if content_type == "agenda" and isinstance(value, list):
+            value = self._normalize_agenda_items(value)
+        try:
+            on_language_ready(key, value)
+        except Exception as e:
+            logger.warning(f"Failed to publish {key}: {e}")
+
+    def _translate_content(self, content, target_language: str):
+        """Translate MOM text or a list of agenda items; None on failure"""
+        if isinstance(content, list):
+            return self._translate_agenda_items(content, target_language)
+        translation = self.translate_text(content, target_language)
+        return translation["text"] if translation["status"] == "success" else None
+
+    def _translate_agenda_items(self, items: list, target_language: str) -> Optional[list]:
+        """Translate agenda titles and descriptions, keeping grouping and issue ids unchanged"""
+        if self.translation_provider != "aws_translate":
+            translated = self._translate_agenda_items_with_llm(items, target_language)
+            if translated is not None:
+                return translated
+            logger.warning(f"Batch agenda translation to {target_language} failed, translating field by field")
+        
+        translated_items = []
+        for item in items:
+            new_item = dict(item)
+            for field in ("title", "description"):
+                value = item.get(field)
+                if isinstance(value, dict):
+                    value = value.get("en")
+                if isinstance(value, str) and value.strip():
+                    translation = self.translate_text(value, target_language)
+                    if translation["status"] != "success":
+                        return None
+                    new_item[field] = translation["text"]
+            translated_items.append(new_item)
+        return translated_items
+
+    def _translate_agenda_items_with_llm(self, items: list, target_language: str) -> Optional[list]:
+        """Translate all agenda titles and descriptions in one LLM call"""
+        fields = [
+            {
+                "title": item.get("title", "") if not isinstance(item.get("title"), dict) else item["title"].get("en", ""),
+                "description": item.get("description", "") if not isinstance(item.get("description"), dict) else item["description"].get("en", "")
+            }
+            for item in items
+        ]
+        payload = json.dumps(fields, ensure_ascii=False)
+        messages = [
+            {
+                "role": "system",
+                "content": (
+                    f"You are an expert translator. Translate the \"title\" and \"description\" values of every object "
+                    f"in the given JSON array to {target_language}. Keep the keys, the number of objects and their order unchanged. "
+                    "Return ONLY the JSON array, no additional text."
+                )
+            },
+            {"role": "user", "content": payload}
+        ]
+        
+        try:
+            max_tokens = min(8000, token_estimator.count(payload) * 3 + 200)
+            result = self._make_chat_request(messages, max_tokens=max_tokens, cache_namespace="agenda_translation")
+            if not result or "choices" not in result or not result["choices"]:
+                return None
+            content = result["choices"][0]["message"]["content"].strip()
+            match = re.search(r"\[.*\]", content, re.DOTALL)
+            translated = json.loads(match.group(0) if match else content)
+            if not isinstance(translated, list) or len(translated) != len(items):
+                logger.error(f"Agenda translation returned {len(translated) if isinstance(translated, list) else 'no'} items for {len(items)}")
+                return None
+            
+            translated_items = []
+            for item, fields in zip(items, translated):
+                if not isinstance(fields, dict):
+                    return None
+                new_item = dict(item)
+                new_item["title"] = fields.get("title") or item.get("title")
+                new_item["description"] = fields.get("description") or item.get("description")
+                translated_items.append(new_item)
+            return translated_items
+        except Exception as e:
+            logger.error(f"Exception during agenda translation to {target_language}: {e}")
+            return None
+
     def translate_text(self, text: str, target_language: str) -> Dict[str, Any]:
         """Translate text. Uses AWS Translate when TRANSLATION_PROVIDER=aws_translate,
         falling back to LLM translation on failure."""
@@ -1354,6 +1783,22 @@ class LLMService:
 
         input_text_stripped = text.strip()
 
+        if settings.TRANSLATION_MEMORY_ENABLED:
+            # Sentences translated before come from memory; only the rest reach the provider
+            return translation_memory.translate(
+                input_text_stripped, target_language, self._translate_with_provider, self._translation_variant()
+            )
+        return self._translate_with_provider(input_text_stripped, target_language)
+
+    def _translation_variant(self) -> str:
+        """Provider and model behind translations; translation memory entries are kept per variant"""
+        if self.translation_provider == "aws_translate":
+            return "aws_translate"
+        model_id = settings.BEDROCK_MODEL_ID if self.llm_provider == "bedrock" else self.model_name
+        return f"{self.llm_provider}:{model_id}"
+
+    def _translate_with_provider(self, input_text_stripped: str, target_language: str) -> Dict[str, Any]:
+        """Translate with the configured provider, falling back from AWS Translate to the LLM"""
         # --- AWS Translate path ---
         if self.translation_provider == "aws_translate":
             aws_result = self._translate_with_aws(input_text_stripped, target_language)
@@ -1410,7 +1855,7 @@ class LLMService:
             max_tokens_for_translation = max(200, estimated_output_tokens)
 
             logger.info("Sending translation request to Hugging Face API")
-            result = self._make_chat_request(messages, max_tokens=max_tokens_for_translation) 
+            result = self._make_chat_request(messages, max_tokens=max_tokens_for_translation, cache_namespace="translation")
             
             if result and "choices" in result and len(result["choices"]) > 0:
                 translated = result["choices"][0]["message"]["content"].strip()
@@ -1424,6 +1869,128 @@ class LLMService:
             logger.error(f"Exception during translation with Hugging Face API: {e}")
         return None
 
+    # ---- Batch translation ------------------------------------------------------
+
+    def translate_batch(self, segments: list, target_languages: list) -> Dict[str, Any]:
+        """Translate many segments into many languages; languages run concurrently.
+
+        Every distinct sentence is translated at most once per language (and not at all
+        when it is in the translation memory), packed into as few provider requests as
+        the request size limits allow. Failed segments are None.
+        """
+        languages = list(dict.fromkeys(target_languages))
+        translations = {}
+        memory_hits = {}
+        with ThreadPoolExecutor(max_workers=len(languages) or 1, thread_name_prefix="translate-batch") as executor:
+            futures = {
+                language: executor.submit(
+                    translation_memory.translate_many, segments, language,
+                    self._translate_sentence_batch, settings.TRANSLATION_MEMORY_ENABLED, self._translation_variant()
+                )
+                for language in languages
+            }
+            for language, future in futures.items():
+                try:
+                    translations[language], memory_hits[language] = future.result()
+                except Exception as e:
+                    logger.error(f"Batch translation to {language} failed: {e}")
+                    translations[language], memory_hits[language] = [None] * len(segments), 0
+        
+        failed = {
+            language: [i for i, value in enumerate(values) if value is None and (segments[i] or "").strip()]
+            for language, values in translations.items()
+        }
+        return {
+            "translations": translations,
+            "failed": {language: indices for language, indices in failed.items() if indices},
+            "memory_hits": memory_hits
+        }
+
+    def _translate_sentence_batch(self, sentences: list, target_language: str) -> list:
+        """Translate sentences in order using as few provider requests as possible"""
+        packs = self._pack_sentences(sentences)
+        logger.info(f"Translating {len(sentences)} sentences to {target_language} in {len(packs)} requests")
+        workers = min(len(packs), self.max_concurrency) or 1
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="translate-pack") as executor:
+            results = list(executor.map(lambda pack: self._translate_pack(pack, target_language), packs))
+        return [value for pack_result in results for value in pack_result]
+
+    def _pack_sentences(self, sentences: list) -> list:
+        """Group sentences under the provider's request limit (bytes for AWS Translate, tokens for the LLM)"""
+        if self.translation_provider == "aws_translate":
+            size_of = lambda sentence: len(sentence.encode("utf-8")) + 1
+            limit, max_items = AWS_TRANSLATE_MAX_BYTES, len(sentences)
+        else:
+            size_of = token_estimator.count
+            limit, max_items = BATCH_TRANSLATION_PACK_TOKENS, BATCH_TRANSLATION_PACK_ITEMS
+        
+        packs = []
+        current, current_size = [], 0
+        for sentence in sentences:
+            size = size_of(sentence)
+            if current and (current_size + size > limit or len(current) >= max_items):
+                packs.append(current)
+                current, current_size = [], 0
+            current.append(sentence)
+            current_size += size
+        if current:
+            packs.append(current)
+        return packs
+
+    def _translate_pack(self, pack: list, target_language: str) -> list:
+        """Translate one pack in a single request, falling back to one request per sentence"""
+        translated = None
+        if self.translation_provider == "aws_translate":
+            # One sentence per line; AWS Translate keeps line breaks
+            text = self._translate_with_aws("\n".join(pack), target_language)
+            if text is not None:
+                lines = [line.strip() for line in text.strip().split("\n")]
+                if len(lines) == len(pack):
+                    translated = lines
+        else:
+            translated = self._translate_pack_with_llm(pack, target_language)
+        
+        if translated is not None:
+            return translated
+        if len(pack) > 1:
+            logger.warning(f"Packed translation of {len(pack)} sentences to {target_language} failed, translating one by one")
+        results = []
+        for sentence in pack:
+            result = self._translate_with_provider(sentence, target_language)
+            results.append(result["text"] if result["status"] == "success" else None)
+        return results
+
+    def _translate_pack_with_llm(self, pack: list, target_language: str) -> Optional[list]:
+        """Translate a JSON array of strings in one LLM call; None unless every element comes back"""
+        payload = json.dumps(pack, ensure_ascii=False)
+        messages = [
+            {
+                "role": "system",
+                "content": (
+                    f"You are an expert translator. Translate every string in the given JSON array to {target_language}. "
+                    "Return ONLY a JSON array of the translations, in the same order and with the same number of elements."
+                )
+            },
+            {"role": "user", "content": payload}
+        ]
+        
+        try:
+            max_tokens = min(8000, token_estimator.count(payload) * 3 + 200)
+            result = self._make_chat_request(messages, max_tokens=max_tokens, cache_namespace="translation_batch")
+            if not result or "choices" not in result or not result["choices"]:
+                return None
+            content = result["choices"][0]["message"]["content"].strip()
+            match = re.search(r"\[.*\]", content, re.DOTALL)
+            translated = json.loads(match.group(0) if match else content)
+            if (not isinstance(translated, list) or len(translated) != len(pack)
+                    or not all(isinstance(value, str) and value.strip() for value in translated)):
+                logger.error(f"Packed translation returned an unusable array for {len(pack)} strings")
+                return None
+            return [value.strip() for value in translated]
+        except Exception as e:
+            logger.error(f"Exception during packed translation to {target_language}: {e}")
+            return None
+
     def _parse_expert_json_response(self, content: str, original_transcription: str) -> Optional[Dict[str, str]]:
         """Parse JSON response from expert LLM correction prompt"""
         try:
@@ -0,0 +1,49 @@
+import time
+import logging
+import threading
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate_per_minute` requests on average, bursts up to `burst`.
+
+    acquire() blocks the calling worker thread until a token is available. A rate of 0
+    disables limiting.
+    """
+
+    def __init__(self, rate_per_minute: float, burst: int):
+        self.rate = max(0.0, rate_per_minute) / 60.0
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Take tokens, waiting for them if needed; returns the seconds waited"""
+        if not self.rate:
+            return 0.0
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                delay = (tokens - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def penalize(self):
+        """Drain the bucket after the provider throttled us, so other callers back off too"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self._tokens, 0.0)
+
+# Shared by every Bedrock caller in this process (LLM service and issue analysis use the same quota)
+bedrock_rate_limiter = TokenBucket(settings.BEDROCK_REQUESTS_PER_MINUTE, settings.BEDROCK_BURST)
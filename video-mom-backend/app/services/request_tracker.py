@@ -7,11 +7,49 @@ from app.core.database import RequestStatus, RequestType
 
 logger = logging.getLogger(__name__)
 
+class ChunkCheckpoint:
+    """Per-chunk STT progress, so a retry only transcribes missing chunks.
+
+    Chunks are identified by scope, variant (provider and language) and their time span,
+    which is deterministic for the same normalized audio. The scope is the media content
+    hash when known, so a re-upload of the same file picks up where a failed request
+    stopped; otherwise it is the request ID.
+    """
+
+    def __init__(self, tracker: "RequestTracker", request_id: str, variant: str, media_sha256: Optional[str] = None):
+        self.tracker = tracker
+        self.scope = f"media:{media_sha256}" if media_sha256 else request_id
+        self.variant = variant
+        self._done: Dict[str, Any] = {}
+
+    async def load(self) -> int:
+        """Load stored chunk results; returns how many there are"""
+        self._done = await self.tracker.get_chunk_results(self.scope, self.variant)
+        return len(self._done)
+
+    def key(self, chunk_info: Dict[str, Any]) -> str:
+        return f"{self.variant}:{chunk_info['start']}-{chunk_info['end']}"
+
+    def get(self, chunk_info: Dict[str, Any]) -> Optional[Any]:
+        return self._done.get(self.key(chunk_info))
+
+    async def save(self, chunk_info: Dict[str, Any], result: Any):
+        key = self.key(chunk_info)
+        self._done[key] = result
+        await self.tracker.store_chunk_result(self.scope, self.variant, key, result)
+
+    async def clear(self):
+        """Drop this variant's chunks once the full transcription is stored"""
+        self._done = {}
+        await self.tracker.clear_chunk_results(self.scope, self.variant)
+
 class RequestTracker:
     def __init__(self, db: AsyncIOMotorDatabase):
         self.db = db
         self.requests_collection = db.requests
         self.objects_collection = db.request_objects
+        self.media_index_collection = db.media_index
+        self.chunks_collection = db.transcription_chunks
         
     async def create_request(self, request_type: str, initial_data: Dict[str, Any] = None) -> str:
         """Create a new request and return request ID"""
@@ -114,6 +152,92 @@ class RequestTracker:
             logger.error(f"Failed to retrieve object {object_type}: {e}")
             return None
     
+    async def get_media_entry(self, content_hash: str) -> Optional[Dict[str, Any]]:
+        """Look up artifacts already derived from media with this content hash"""
+        try:
+            return await self.media_index_collection.find_one({
+                "content_hash": content_hash,
+                "expires_at": {"$gt": datetime.utcnow()}
+            })
+        except Exception as e:
+            logger.error(f"Failed to read media index for {content_hash}: {e}")
+            return None
+    
+    async def record_media_artifact(self, content_hash: str, field: str, value: Any, ttl_hours: int = 24):
+        """Record an artifact (stored file, normalized audio, transcription) for a content hash"""
+        try:
+            await self.media_index_collection.update_one(
+                {"content_hash": content_hash},
+                {
+                    "$set": {
+                        field: value,
+                        "updated_at": datetime.utcnow(),
+                        "expires_at": datetime.utcnow() + timedelta(hours=ttl_hours)
+                    },
+                    "$setOnInsert": {"created_at": datetime.utcnow()}
+                },
+                upsert=True
+            )
+        except Exception as e:
+            logger.error(f"Failed to record media artifact {field} for {content_hash}: {e}")
+    
+    async def get_cached_transcription(self, content_hash: str, variant: str) -> Optional[str]:
+        """Raw transcription previously produced for this media with the same provider/language"""
+        entry = await self.get_media_entry(content_hash)
+        if not entry:
+            return None
+        return entry.get("transcriptions", {}).get(self._variant_key(variant))
+    
+    async def record_cached_transcription(self, content_hash: str, variant: str, transcription: str):
+        await self.record_media_artifact(content_hash, f"transcriptions.{self._variant_key(variant)}", transcription)
+    
+    @staticmethod
+    def _variant_key(variant: str) -> str:
+        # Mongo field names cannot contain dots or start with $
+        return variant.replace(".", "_").replace("$", "_")
+    
+    async def get_chunk_results(self, scope: str, variant: str) -> Dict[str, Any]:
+        """Checkpointed STT chunk results for a scope and variant, keyed by chunk key"""
+        try:
+            cursor = self.chunks_collection.find({
+                "scope": scope,
+                "variant": variant,
+                "expires_at": {"$gt": datetime.utcnow()}
+            })
+            return {doc["chunk_key"]: doc["result"] async for doc in cursor}
+        except Exception as e:
+            logger.error(f"Failed to read chunk checkpoints for {scope}: {e}")
+            return {}
+    
+    async def store_chunk_result(self, scope: str, variant: str, chunk_key: str, result: Any, ttl_hours: int = 24):
+        """Persist one STT chunk result as soon as it arrives"""
+        try:
+            await self.chunks_collection.replace_one(
+                {"scope": scope, "chunk_key": chunk_key},
+                {
+                    "scope": scope,
+                    "variant": variant,
+                    "chunk_key": chunk_key,
+                    "result": result,
+                    "created_at": datetime.utcnow(),
+                    "expires_at": datetime.utcnow() + timedelta(hours=ttl_hours)
+                },
+                upsert=True
+            )
+        except Exception as e:
+            logger.error(f"Failed to checkpoint chunk {chunk_key} for {scope}: {e}")
+    
+    async def clear_chunk_results(self, scope: str, variant: str):
+        """Drop the chunk checkpoints of one scope and variant"""
+        await self.chunks_collection.delete_many({"scope": scope, "variant": variant})
+    
+    async def store_partial_result(self, request_id: str, key: str, value: Any):
+        """Record one finished piece of a result (e.g. one language) before the request completes"""
+        await self.requests_collection.update_one(
+            {"request_id": request_id},
+            {"$set": {f"partial_results.{key}": value, "updated_at": datetime.utcnow()}}
+        )
+    
     async def get_request_status(self, request_id: str) -> Optional[Dict[str, Any]]:
         """Get current request status"""
         return await self.requests_collection.find_one({"request_id": request_id})
@@ -134,15 +258,17 @@ class RequestTracker:
         
         # Delete expired objects
         await self.objects_collection.delete_many({"expires_at": {"$lt": datetime.utcnow()}})
+        await self.media_index_collection.delete_many({"expires_at": {"$lt": datetime.utcnow()}})
+        await self.chunks_collection.delete_many({"expires_at": {"$lt": datetime.utcnow()}})
         
         logger.info("Cleaned up expired requests and objects")
     
     async def get_request_data(self, request_id: str) -> dict:
         """Get request data by ID"""
         try:
-            request_doc = await self.db.requests.find_one({"_id": request_id})
+            request_doc = await self.requests_collection.find_one({"request_id": request_id})
             if request_doc:
-                return request_doc.get("data", {})
+                return request_doc.get("initial_data", {})
             return {}
         except Exception as e:
             logger.error(f"Error getting request data: {e}")
@@ -152,8 +278,8 @@ class RequestTracker:
         """Update request data"""
         try:
             await self.requests_collection.update_one(
-                {"_id": request_id},
-                {"$set": {"data": data}}
+                {"request_id": request_id},
+                {"$set": {"initial_data": data, "updated_at": datetime.utcnow()}}
             )
             logger.info(f"Updated request data for {request_id}")
         except Exception as e:
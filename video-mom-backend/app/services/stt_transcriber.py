@@ -1,9 +1,10 @@
 from typing import List, Optional
-import requests
+import asyncio
 import json
 import os
 import logging
 from app.core.config import settings
+from app.services.http_client import http_clients
 
 logger = logging.getLogger(__name__)
 
@@ -37,15 +38,14 @@ class STTTranscriber:
             return lang
         return LANGUAGE_CODE_MAP.get(lang)
 
-    def transcribe_audio(self, audio_file_path: str, language: Optional[str] = None) -> str:
+    async def transcribe_audio(self, audio_file_path: str, language: Optional[str] = None) -> str:
         """Transcribe audio using HuggingFace Whisper API with optional language hint."""
         try:
             if not self.api_key or not self.endpoint:
                 logger.error("HuggingFace API not configured")
                 return ""
 
-            with open(audio_file_path, "rb") as f:
-                audio_data = f.read()
+            audio_data = await asyncio.to_thread(self._read_file, audio_file_path)
 
             lang_code = self._resolve_language_code(language)
 
@@ -65,7 +65,8 @@ class STTTranscriber:
                 payload["language"] = lang_code
 
             # Try multipart with parameters first
-            response = requests.post(
+            client = http_clients.async_client
+            response = await client.post(
                 self.endpoint,
                 headers=headers,
                 files=files,
@@ -77,10 +78,10 @@ class STTTranscriber:
             if response.status_code not in (200, 201):
                 logger.warning(f"Multipart request failed ({response.status_code}), retrying with raw audio bytes")
                 headers["Content-Type"] = self._get_content_type(audio_file_path)
-                response = requests.post(
+                response = await client.post(
                     self.endpoint,
                     headers=headers,
-                    data=audio_data,
+                    content=audio_data,
                     timeout=180,
                 )
 
@@ -97,6 +98,11 @@ class STTTranscriber:
             logger.error(f"Transcription failed: {e}", exc_info=True)
             return ""
 
+    @staticmethod
+    def _read_file(file_path: str) -> bytes:
+        with open(file_path, "rb") as f:
+            return f.read()
+
     def _get_content_type(self, file_path: str) -> str:
         """Get content type based on file extension"""
         ext = os.path.splitext(file_path)[1].lower()
@@ -0,0 +1,123 @@
+import os
+import re
+import logging
+from typing import Dict, Optional
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    from tokenizers import Tokenizer
+    TOKENIZERS_AVAILABLE = True
+except ImportError:
+    TOKENIZERS_AVAILABLE = False
+
+# Character classes counted separately, since BPE vocabularies cover them very differently
+SCRIPT_PATTERNS = {
+    "latin": re.compile(r"[A-Za-zÀ-ɏ]"),
+    "devanagari": re.compile(r"[ऀ-ॿ꣠-ꣿ]"),
+    "indic_other": re.compile(r"[ঀ-෿]"),  # Bengali through Malayalam
+    "digit": re.compile(r"[0-9]"),
+    # Indic vowel signs are not \w, so exclude those blocks explicitly
+    "punctuation": re.compile(r"[^\w\sऀ-ॿ꣠-ꣿঀ-෿]"),
+}
+
+# Tokens per character for each class. Indic scripts are split into far more tokens
+# per character than English, and how much more depends on the model's vocabulary.
+DEFAULT_TOKEN_RATIOS = {
+    "latin": 0.27,
+    "devanagari": 0.75,
+    "indic_other": 0.9,
+    "digit": 0.5,
+    "punctuation": 1.0,
+    "other": 0.5,
+}
+
+# Per model family, matched by substring of the configured model id
+MODEL_TOKEN_RATIOS = {
+    # Cohere Command A has a large multilingual vocabulary
+    "command": {"devanagari": 0.45, "indic_other": 0.6},
+    "claude": {"devanagari": 0.8, "indic_other": 1.0},
+    "nova": {"devanagari": 0.6, "indic_other": 0.75},
+    "llama": {"devanagari": 0.55, "indic_other": 0.75},
+}
+
+# Context windows in tokens, matched by substring of the configured model id
+MODEL_CONTEXT_WINDOWS = {
+    "command-a": 256000,
+    "command-r": 128000,
+    "claude-3": 200000,
+    "claude": 200000,
+    "nova-micro": 128000,
+    "nova-lite": 300000,
+    "nova-pro": 300000,
+    "llama3": 128000,
+    "llama-3": 128000,
+}
+DEFAULT_CONTEXT_WINDOW = 8192
+
+class TokenEstimator:
+    """Estimates prompt sizes in tokens for the configured LLM.
+
+    Uses the model's own tokenizer when LLM_TOKENIZER names one (a local
+    tokenizer.json or a Hugging Face Hub id) and the `tokenizers` package is
+    installed. Otherwise tokens are estimated per character class with ratios
+    calibrated for the model family, erring towards overestimating.
+    """
+
+    def __init__(self, model_name: Optional[str], tokenizer_name: Optional[str] = None):
+        self.model_name = (model_name or "").lower()
+        self.ratios = dict(DEFAULT_TOKEN_RATIOS)
+        for family, overrides in MODEL_TOKEN_RATIOS.items():
+            if family in self.model_name:
+                self.ratios.update(overrides)
+                break
+        self.tokenizer = self._load_tokenizer(tokenizer_name) if tokenizer_name else None
+        logger.info(f"Token estimator for '{model_name}': "
+                    f"{'tokenizer ' + tokenizer_name if self.tokenizer else 'per-script ratios'}, "
+                    f"context window {self.context_window}")
+
+    def _load_tokenizer(self, tokenizer_name: str):
+        if not TOKENIZERS_AVAILABLE:
+            logger.warning(f"LLM_TOKENIZER={tokenizer_name} set but the tokenizers package is not installed")
+            return None
+        try:
+            if os.path.isfile(tokenizer_name):
+                return Tokenizer.from_file(tokenizer_name)
+            return Tokenizer.from_pretrained(tokenizer_name)
+        except Exception as e:
+            logger.warning(f"Failed to load tokenizer {tokenizer_name}, using estimates: {e}")
+            return None
+
+    @property
+    def context_window(self) -> int:
+        if settings.LLM_CONTEXT_WINDOW:
+            return settings.LLM_CONTEXT_WINDOW
+        for family, window in MODEL_CONTEXT_WINDOWS.items():
+            if family in self.model_name:
+                return window
+        return DEFAULT_CONTEXT_WINDOW
+
+    def count(self, text: str) -> int:
+        """Number of tokens text is expected to take in a prompt or completion"""
+        if not text:
+            return 0
+        if self.tokenizer is not None:
+            return len(self.tokenizer.encode(text, add_special_tokens=False).ids)
+        return self._estimate(text)
+
+    def _estimate(self, text: str) -> int:
+        counts: Dict[str, int] = {name: len(pattern.findall(text)) for name, pattern in SCRIPT_PATTERNS.items()}
+        # Whitespace is mostly merged into the following token
+        counted = sum(counts.values()) + sum(1 for ch in text if ch.isspace())
+        counts["other"] = max(0, len(text) - counted)
+        tokens = sum(count * self.ratios[name] for name, count in counts.items())
+        return max(1, int(tokens + 0.5))
+
+def _configured_model_name() -> Optional[str]:
+    if getattr(settings, "LLM_PROVIDER", "huggingface").lower() == "bedrock":
+        return settings.BEDROCK_MODEL_ID
+    return settings.HF_LLM
+
+# Global token estimator for the configured LLM
+token_estimator = TokenEstimator(_configured_model_name(), settings.LLM_TOKENIZER)
@@ -0,0 +1,204 @@
+import re
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from app.core.config import settings
+from app.services.llm_cache import TwoTierCache, fingerprint
+
+logger = logging.getLogger(__name__)
+
+# Danda, double danda, ! and ? always end a sentence, as do line breaks. A period only does before
+# whitespace followed by a capital letter, Devanagari text (not a digit) or the end of the text,
+# so "2.5" and "Rs. 2.5 lakh" stay whole
+SEGMENT_BOUNDARY = re.compile(r"[।॥!?\n]+|\.(?=\s+(?:[A-Z\u0900-\u0965\u0970-\u097F]|$))")
+
+# Words that take a period without ending the sentence (compared lowercased, without the period)
+ABBREVIATIONS = {
+    "no", "nos", "rs", "re", "dr", "sh", "shri", "smt", "mr", "mrs", "ms", "km", "st", "sr", "jr",
+    "govt", "dept", "vill", "distt", "dist", "teh", "p.o", "vs", "approx", "sl", "dt", "ref",
+    "रु", "क्र", "डॉ", "श्री", "सं",
+}
+
+# Concurrent provider requests for the untranslated runs of one text
+MAX_PARALLEL_RUNS = 4
+
+def _is_abbreviation(text: str, period: int) -> bool:
+    """Whether the period at index `period` closes an abbreviation or an initial ("S. K. Sharma")"""
+    before = text[max(0, period - 16):period].split()
+    word = before[-1].lstrip("(\"'") if before else ""
+    return word.lower() in ABBREVIATIONS or (len(word) == 1 and word.isalpha())
+
+def sentence_ends(text: str) -> List[int]:
+    """Indexes just past each sentence terminator in text"""
+    return [
+        match.end() for match in SEGMENT_BOUNDARY.finditer(text)
+        if match.group() != "." or not _is_abbreviation(text, match.start())
+    ]
+
+def split_segments(text: str) -> List[Tuple[str, str, str]]:
+    """Split text into (leading whitespace, sentence, trailing whitespace) triples that rejoin to text"""
+    cuts = [0] + sentence_ends(text) + [len(text)]
+    segments = []
+    for piece in (text[start:end] for start, end in zip(cuts, cuts[1:])):
+        if not piece:
+            continue
+        stripped = piece.strip()
+        if not stripped:
+            # Pure whitespace belongs to the previous segment
+            if segments:
+                lead, sentence, trail = segments[-1]
+                segments[-1] = (lead, sentence, trail + piece)
+            else:
+                segments.append((piece, "", ""))
+            continue
+        start = piece.index(stripped[0])
+        segments.append((piece[:start], stripped, piece[start + len(stripped):]))
+    return segments
+
+class TranslationMemory:
+    """Sentence-level translation reuse across requests.
+
+    Entries are keyed by (normalized source text, target language, variant), where the
+    variant names the provider and model that produced them. Only pairs whose alignment
+    is certain are stored: whole texts, sentences translated on their own, and items of
+    a batch translation. Agenda boilerplate that repeats across panchayats is then
+    translated from memory.
+    """
+
+    def __init__(self, cache: TwoTierCache):
+        self.cache = cache
+
+    def _key(self, sentence: str, target_language: str, variant: str) -> str:
+        return fingerprint(" ".join(sentence.split()), target_language.strip().lower(), variant)
+
+    def translate(self, text: str, target_language: str,
+                  translate_func: Callable[[str, str], Dict[str, Any]], variant: str = "") -> Dict[str, Any]:
+        """Translate text reusing stored sentences; translate_func(text, language) handles the misses.
+
+        Consecutive unknown sentences are sent as one run so the provider keeps their
+        context. A run's translation is used whole; its sentences are only stored
+        individually when the run is a single sentence, since the sentence boundaries
+        of a translated run cannot be matched to the source with certainty.
+        """
+        segments = split_segments(text)
+        sentence_count = sum(1 for _, sentence, _ in segments if sentence)
+        whole = self.cache.get("segments", self._key(text, target_language, variant))
+        if whole is not None:
+            logger.info(f"Translation to {target_language} served from memory (whole text)")
+            return self._result([("", text, "")], [whole], "translation_memory", False, sentence_count)
+
+        translated: List[Optional[str]] = []
+        for _, sentence, _ in segments:
+            translated.append(self.cache.get("segments", self._key(sentence, target_language, variant)) if sentence else "")
+
+        # Consecutive misses are translated together so the provider keeps sentence context
+        runs: List[List[int]] = []
+        for index, value in enumerate(translated):
+            if value is not None:
+                continue
+            if runs and runs[-1][-1] == index - 1:
+                runs[-1].append(index)
+            else:
+                runs.append([index])
+
+        memory_hits = sentence_count - sum(len(run) for run in runs)
+        if not runs:
+            logger.info(f"Translation to {target_language} served from memory ({memory_hits} segments)")
+            return self._result(segments, translated, "translation_memory", False, memory_hits)
+
+        workers = min(len(runs), MAX_PARALLEL_RUNS)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tm-run") as executor:
+            run_results = list(executor.map(
+                lambda run: self._translate_run(segments, run, target_language, translate_func), runs
+            ))
+
+        provider = None
+        fallback_used = False
+        for run, run_result in zip(runs, run_results):
+            if run_result["status"] != "success":
+                return run_result
+            provider = run_result.get("provider", provider)
+            fallback_used = fallback_used or run_result.get("fallback_used", False)
+            run_text = run_result["text"].strip()
+            if len(run) == 1 and not run_result.get("fallback_used"):
+                self.cache.set("segments", self._key(segments[run[0]][1], target_language, variant), run_text)
+            # The run becomes one segment spanning from its first to its last sentence
+            segments[run[0]] = (segments[run[0]][0], "", segments[run[-1]][2])
+            translated[run[0]] = run_text
+            for index in run[1:]:
+                segments[index] = ("", "", "")
+                translated[index] = ""
+
+        result = self._result(segments, translated, provider, fallback_used, memory_hits)
+        if not fallback_used:
+            # A fallback provider's output must not be served as the configured provider's
+            self.cache.set("segments", self._key(text, target_language, variant), result["text"])
+        logger.info(f"Translation to {target_language}: {memory_hits} segments from memory, "
+                    f"{sum(len(run) for run in runs)} translated in {len(runs)} requests")
+        return result
+
+    def translate_many(self, texts: List[str], target_language: str,
+                       translate_batch: Callable[[List[str], str], List[Optional[str]]],
+                       remember: bool = True, variant: str = "") -> Tuple[List[Optional[str]], int]:
+        """Translate many short texts, sending each distinct unknown sentence to translate_batch once.
+
+        translate_batch returns one translation per sentence in order, so every stored
+        pair is aligned. Returns the translations in input order (None where a sentence
+        could not be translated) and the number of sentences served from memory.
+        """
+        split = [split_segments(text or "") for text in texts]
+        known: Dict[str, Optional[str]] = {}
+        memory_hits = 0
+        for segments in split:
+            for _, sentence, _ in segments:
+                if not sentence or sentence in known:
+                    continue
+                value = self.cache.get("segments", self._key(sentence, target_language, variant)) if remember else None
+                known[sentence] = value
+                if value is not None:
+                    memory_hits += 1
+
+        missing = [sentence for sentence, value in known.items() if value is None]
+        if missing:
+            for sentence, value in zip(missing, translate_batch(missing, target_language)):
+                if value:
+                    known[sentence] = value
+                    if remember:
+                        self.cache.set("segments", self._key(sentence, target_language, variant), value)
+        logger.info(f"Batch translation to {target_language}: {len(texts)} texts, "
+                    f"{memory_hits} sentences from memory, {len(missing)} sent to the provider")
+
+        translations = []
+        for segments in split:
+            if any(sentence and not known.get(sentence) for _, sentence, _ in segments):
+                translations.append(None)
+            else:
+                translations.append("".join(lead + known.get(sentence, "") + trail for lead, sentence, trail in segments).strip())
+        return translations, memory_hits
+
+    def _translate_run(self, segments, run: List[int], target_language: str, translate_func) -> Dict[str, Any]:
+        parts = []
+        for position, index in enumerate(run):
+            lead, sentence, trail = segments[index]
+            if position > 0:
+                parts.append(lead)
+            parts.append(sentence)
+            if position < len(run) - 1:
+                parts.append(trail)
+        return translate_func("".join(parts), target_language)
+
+    def _result(self, segments, translated, provider, fallback_used: bool, memory_hits: int) -> Dict[str, Any]:
+        text = "".join(lead + value + trail for (lead, _, trail), value in zip(segments, translated))
+        return {
+            "text": text.strip(),
+            "status": "success",
+            "error": None,
+            "fallback_used": fallback_used,
+            "provider": provider,
+            "memory_hits": memory_hits,
+        }
+
+# Global translation memory
+translation_memory = TranslationMemory(TwoTierCache(
+    "translation_memory", settings.TRANSLATION_MEMORY_MAX_ENTRIES, settings.TRANSLATION_MEMORY_TTL_DAYS * 24
+))
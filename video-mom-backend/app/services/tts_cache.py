@@ -0,0 +1,144 @@
+import os
+import uuid
+import logging
+import threading
+from pathlib import Path
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+class LocalAudioCache:
+    """Size-bounded local cache for synthesized audio, in front of the S3 cache.
+
+    A small in-memory hot set (LRU by bytes) sits over a disk LRU capped at
+    `max_disk_bytes`. Disk recency is kept in file mtimes, so the LRU order survives
+    restarts. Keys are the S3 cache keys (e.g. "tts-cache/hi/<sha256>.mp3").
+    """
+
+    def __init__(self, directory: str, max_disk_bytes: int, max_memory_bytes: int):
+        self.directory = Path(directory)
+        self.max_disk_bytes = max(0, max_disk_bytes)
+        self.max_memory_bytes = max(0, max_memory_bytes)
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_bytes = 0
+        self._disk: "OrderedDict[str, int]" = OrderedDict()  # key -> file size, least recent first
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+        self._counts = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+        if self.max_disk_bytes:
+            self._load_index()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key
+
+    def _load_index(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        files = []
+        for path in self.directory.rglob("*.mp3"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime, path.relative_to(self.directory).as_posix(), stat.st_size))
+        for _, key, size in sorted(files):
+            self._disk[key] = size
+            self._disk_bytes += size
+        self._evict_disk()
+        logger.info(f"[TTS] Local audio cache: {len(self._disk)} files, {self._disk_bytes / 1024 / 1024:.1f} MB")
+
+    def _remember(self, key: str, data: bytes):
+        """Add to the hot set; caller holds the lock"""
+        if len(data) > self.max_memory_bytes:
+            return
+        if key in self._memory:
+            self._memory_bytes -= len(self._memory.pop(key))
+        self._memory[key] = data
+        self._memory_bytes += len(data)
+        while self._memory_bytes > self.max_memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+
+    def _evict_disk(self):
+        """Drop least recently used files until under the cap; caller holds the lock"""
+        while self._disk_bytes > self.max_disk_bytes and self._disk:
+            key, size = self._disk.popitem(last=False)
+            self._disk_bytes -= size
+            self._path(key).unlink(missing_ok=True)
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                if key in self._disk:
+                    self._disk.move_to_end(key)
+                self._counts["memory_hits"] += 1
+                return data
+            on_disk = key in self._disk
+
+        if on_disk:
+            path = self._path(key)
+            try:
+                data = path.read_bytes()
+                os.utime(path)
+            except OSError:
+                data = None
+            with self._lock:
+                if data is not None:
+                    if key in self._disk:
+                        self._disk.move_to_end(key)
+                    self._remember(key, data)
+                    self._counts["disk_hits"] += 1
+                    return data
+                if key in self._disk:
+                    self._disk_bytes -= self._disk.pop(key)
+
+        with self._lock:
+            self._counts["misses"] += 1
+        return None
+
+    def set(self, key: str, data: bytes):
+        if not data:
+            return
+        with self._lock:
+            self._remember(key, data)
+        if not self.max_disk_bytes or len(data) > self.max_disk_bytes:
+            return
+
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write then rename, so readers never see a partial file
+            temp_path = path.with_name(f".{uuid.uuid4().hex}.tmp")
+            temp_path.write_bytes(data)
+            os.replace(temp_path, path)
+        except OSError as e:
+            logger.warning(f"[TTS] Failed to write local cache file {key}: {e}")
+            return
+
+        with self._lock:
+            if key in self._disk:
+                self._disk_bytes -= self._disk.pop(key)
+            self._disk[key] = len(data)
+            self._disk_bytes += len(data)
+            self._evict_disk()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self._counts,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "disk_entries": len(self._disk),
+                "disk_bytes": self._disk_bytes,
+                "max_disk_bytes": self.max_disk_bytes,
+            }
+
+# Global local tier of the TTS cache
+tts_local_cache = LocalAudioCache(
+    settings.TTS_CACHE_DIR,
+    settings.TTS_CACHE_DISK_MB * 1024 * 1024,
+    settings.TTS_CACHE_MEMORY_MB * 1024 * 1024
+)
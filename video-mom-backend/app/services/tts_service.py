@@ -1,16 +1,26 @@
+import bisect
 import hashlib
 import logging
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List, Optional
 import boto3
 from botocore.exceptions import ClientError
 from app.core.config import settings
+from app.services.tts_cache import tts_local_cache
+from app.services.translation_memory import sentence_ends
 
 logger = logging.getLogger(__name__)
 
+# Polly bills at most 3000 characters of text per SynthesizeSpeech request
+POLLY_MAX_CHARS = 3000
+
 
 class TTSService:
     """Text-to-Speech service using Amazon Polly with S3 caching.
 
+    Audio is looked up in the local cache (memory hot set, then disk LRU) before S3;
+    S3 hits and fresh Polly syntheses are both written to the local tier.
+
     Polly voice reference (ap-south-1):
       - Aditi:   hi-IN, standard  (Hindi female — widely available)
       - Kajal:   en-IN, neural/generative (English-Indian female)
@@ -86,24 +96,94 @@ class TTSService:
         except Exception as e:
             logger.warning(f"[TTS] Failed to cache audio: {e}")
 
+    @staticmethod
+    def split_text(text: str, max_chars: int = POLLY_MAX_CHARS) -> List[str]:
+        """Split text into segments of at most max_chars, at sentence boundaries where possible.
+
+        Text that fits in one request is not split. Segments are slices of the text, so
+        nothing is added or removed between sentences; decimals and abbreviations
+        ("Rs. 3.5 lakh") never end a sentence.
+        """
+        text = text.strip()
+        if len(text) <= max_chars:
+            return [text] if text else []
+
+        ends = sentence_ends(text)
+        segments = []
+        start = 0
+        while len(text) - start > max_chars:
+            limit = start + max_chars
+            # Furthest sentence end that fits; a longer sentence is cut at a space, then anywhere
+            index = bisect.bisect_right(ends, limit)
+            cut = ends[index - 1] if index and ends[index - 1] > start else 0
+            if not cut:
+                cut = text.rfind(" ", start + 1, limit)
+                cut = cut if cut > start else limit
+            segment = text[start:cut].strip()
+            if segment:
+                segments.append(segment)
+            start = cut
+        segment = text[start:].strip()
+        if segment:
+            segments.append(segment)
+        return segments
+
     def synthesize(self, text: str, language: str = "hi") -> bytes:
         """Synthesize text to speech. Returns MP3 audio bytes."""
         if not self.polly_client:
             raise RuntimeError("Polly client not initialized")
 
+        if len(text) > POLLY_MAX_CHARS:
+            # MP3 frames concatenate into one playable stream
+            return b"".join(self.synthesize_stream(text, language))
+        return self._synthesize_segment(text, language)
+
+    def synthesize_stream(self, text: str, language: str = "hi") -> Iterator[bytes]:
+        """Yield MP3 audio for text segment by segment, in order.
+
+        Segments are synthesized concurrently (up to TTS_STREAM_CONCURRENCY ahead of
+        the one being yielded) and cached individually, so a text that shares
+        sentences with an earlier one only synthesizes the new segments.
+        """
+        if not self.polly_client:
+            raise RuntimeError("Polly client not initialized")
+
+        segments = self.split_text(text)
+        logger.info(f"[TTS] Streaming {len(text)} chars as {len(segments)} segments")
+        workers = max(1, min(settings.TTS_STREAM_CONCURRENCY, len(segments)))
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tts-segment")
+        try:
+            pending = []
+            for segment in segments:
+                pending.append(executor.submit(self._synthesize_segment, segment, language))
+                if len(pending) >= workers:
+                    yield pending.pop(0).result()
+            for future in pending:
+                yield future.result()
+        finally:
+            # A client that disconnects closes the generator: drop queued segments instead of
+            # synthesizing (and paying for) audio nobody will receive
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _synthesize_segment(self, text: str, language: str) -> bytes:
+        """Synthesize one request-sized text, using the local and S3 caches."""
         lang_key = language.lower()
         cache_key = self._cache_key(text, lang_key)
 
-        # Check S3 cache first
+        # Local cache first, then S3
+        cached = tts_local_cache.get(cache_key)
+        if cached:
+            return cached
         cached = self._check_cache(cache_key)
         if cached:
+            tts_local_cache.set(cache_key, cached)
             return cached
 
         voice_id, engine, language_code = self.VOICE_CONFIG.get(lang_key, self.DEFAULT_VOICE)
 
         try:
             response = self.polly_client.synthesize_speech(
-                Text=text[:3000],  # Polly limit per request
+                Text=text[:POLLY_MAX_CHARS],  # Polly limit per request
                 OutputFormat="mp3",
                 VoiceId=voice_id,
                 Engine=engine,
@@ -112,7 +192,8 @@ class TTSService:
 
             audio_data = response["AudioStream"].read()
 
-            # Cache in S3 for subsequent reads
+            # Cache locally and in S3 for subsequent reads
+            tts_local_cache.set(cache_key, audio_data)
             self._store_cache(cache_key, audio_data)
 
             logger.info(f"[TTS] Synthesized {len(text)} chars with {voice_id} ({engine}, {language_code})")
@@ -0,0 +1,137 @@
+import uuid
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional
+from pymongo import ReturnDocument
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+class UploadStatus:
+    ACTIVE = "active"
+    FINALIZING = "finalizing"
+    FINALIZED = "finalized"
+
+class ResumableUploadManager:
+    """Tracks resumable (chunked) upload sessions in MongoDB.
+
+    Part bytes live on disk via FileStorage; this class only records which numbered
+    parts have been received so clients can query what is missing and resume.
+    """
+
+    FINALIZE_STALE_MINUTES = 10
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.db = db
+        self.sessions_collection = db.upload_sessions
+
+    async def create_session(self, filename: str, total_size: int, chunk_size: int,
+                             session_data: Dict[str, Any] = None, expected_sha256: str = None) -> Dict[str, Any]:
+        """Create a new upload session and return it"""
+        upload_id = str(uuid.uuid4())
+        total_chunks = max(1, -(-total_size // chunk_size))
+
+        session_doc = {
+            "upload_id": upload_id,
+            "filename": filename,
+            "total_size": total_size,
+            "chunk_size": chunk_size,
+            "total_chunks": total_chunks,
+            "expected_sha256": expected_sha256.lower() if expected_sha256 else None,
+            "session_data": session_data or {},
+            "received_chunks": [],
+            "status": UploadStatus.ACTIVE,
+            "request_id": None,
+            "created_at": datetime.utcnow(),
+            "updated_at": datetime.utcnow(),
+            "expires_at": datetime.utcnow() + timedelta(hours=settings.RESUMABLE_UPLOAD_TTL_HOURS)
+        }
+
+        await self.sessions_collection.insert_one(session_doc)
+        logger.info(f"Created upload session {upload_id} for {filename} ({total_size} bytes, {total_chunks} chunks)")
+        return session_doc
+
+    async def get_session(self, upload_id: str) -> Optional[Dict[str, Any]]:
+        """Get an upload session if it exists and has not expired"""
+        return await self.sessions_collection.find_one({
+            "upload_id": upload_id,
+            "expires_at": {"$gt": datetime.utcnow()}
+        })
+
+    def expected_chunk_size(self, session: Dict[str, Any], index: int) -> int:
+        """Size in bytes that part `index` must have"""
+        if index < session["total_chunks"] - 1:
+            return session["chunk_size"]
+        return session["total_size"] - session["chunk_size"] * (session["total_chunks"] - 1)
+
+    async def mark_chunk_received(self, upload_id: str, index: int):
+        """Record that a part has been fully stored"""
+        await self.sessions_collection.update_one(
+            {"upload_id": upload_id},
+            {
+                "$addToSet": {"received_chunks": index},
+                "$set": {"updated_at": datetime.utcnow()}
+            }
+        )
+
+    def missing_chunks(self, session: Dict[str, Any]) -> List[int]:
+        received = set(session.get("received_chunks", []))
+        return [i for i in range(session["total_chunks"]) if i not in received]
+
+    def received_ranges(self, session: Dict[str, Any]) -> List[List[int]]:
+        """Merge received parts into [start, end) byte ranges"""
+        ranges = []
+        for index in sorted(set(session.get("received_chunks", []))):
+            start = index * session["chunk_size"]
+            end = start + self.expected_chunk_size(session, index)
+            if ranges and ranges[-1][1] == start:
+                ranges[-1][1] = end
+            else:
+                ranges.append([start, end])
+        return ranges
+
+    async def begin_finalize(self, upload_id: str) -> Optional[Dict[str, Any]]:
+        """Atomically move an active session to finalizing; None if someone else got there first.
+
+        A session stuck in finalizing (e.g. the process died mid-assembly) can be taken over
+        once FINALIZE_STALE_MINUTES have passed.
+        """
+        stale_before = datetime.utcnow() - timedelta(minutes=self.FINALIZE_STALE_MINUTES)
+        return await self.sessions_collection.find_one_and_update(
+            {
+                "upload_id": upload_id,
+                "$or": [
+                    {"status": UploadStatus.ACTIVE},
+                    {"status": UploadStatus.FINALIZING, "updated_at": {"$lt": stale_before}}
+                ]
+            },
+            {"$set": {"status": UploadStatus.FINALIZING, "updated_at": datetime.utcnow()}},
+            return_document=ReturnDocument.AFTER
+        )
+
+    async def complete_finalize(self, upload_id: str, request_id: str):
+        await self.sessions_collection.update_one(
+            {"upload_id": upload_id},
+            {"$set": {"status": UploadStatus.FINALIZED, "request_id": request_id, "updated_at": datetime.utcnow()}}
+        )
+
+    async def abort_finalize(self, upload_id: str):
+        """Return a session to active so the client can retry finalization"""
+        await self.sessions_collection.update_one(
+            {"upload_id": upload_id, "status": UploadStatus.FINALIZING},
+            {"$set": {"status": UploadStatus.ACTIVE, "updated_at": datetime.utcnow()}}
+        )
+
+    async def reset_session(self, upload_id: str):
+        """Forget all received parts, e.g. after a checksum mismatch"""
+        await self.sessions_collection.update_one(
+            {"upload_id": upload_id},
+            {"$set": {"status": UploadStatus.ACTIVE, "received_chunks": [], "updated_at": datetime.utcnow()}}
+        )
+
+    async def cleanup_expired_sessions(self):
+        """Delete expired upload sessions"""
+        result = await self.sessions_collection.delete_many({"expires_at": {"$lt": datetime.utcnow()}})
+        if result.deleted_count:
+            logger.info(f"Cleaned up {result.deleted_count} expired upload sessions")
@@ -0,0 +1,195 @@
+import os
+import wave
+import logging
+from typing import List, Optional, Tuple
+import numpy as np
+from app.core.config import settings
+from app.services.wav_chunker import WavChunkReader
+
+logger = logging.getLogger(__name__)
+
+class VoiceActivityDetector:
+    """Energy-based voice activity detection on the normalized 16-bit mono PCM.
+
+    Frame energies are compared against the recording's own noise floor, so the same
+    settings work for a quiet panchayat office and a noisy open-air Gram Sabha.
+    """
+
+    # Frames analysed per numpy block; keeps memory flat for multi-hour recordings
+    BLOCK_FRAMES = 2000
+    # Buffers whose loudest frame stays below this (dBFS) are treated as silence
+    MIN_THRESHOLD_DB = -55.0
+    # Speech regions further apart than this are sent as separate chunks rather than
+    # one chunk that carries the silence in between
+    MAX_PACKED_GAP_MS = 2000
+    # When one speech region is longer than a chunk, cut at the quietest frame in this window
+    SPLIT_SEARCH_MS = 10000
+    # Don't bother rewriting audio that would shrink by less than this
+    MIN_COMPACT_SAVINGS_MS = 5000
+
+    def __init__(self):
+        self.enabled = settings.VAD_ENABLED
+        self.frame_ms = settings.VAD_FRAME_MS
+        self.threshold_db = settings.VAD_THRESHOLD_DB
+        self.min_silence_ms = settings.VAD_MIN_SILENCE_MS
+        self.speech_pad_ms = settings.VAD_SPEECH_PAD_MS
+        self.compact_gap_ms = settings.VAD_COMPACT_GAP_MS
+
+    def frame_energies(self, reader: WavChunkReader) -> Optional[np.ndarray]:
+        """Per-frame energy in dBFS, or None if the audio is not 16-bit mono PCM"""
+        if reader.channels != 1 or reader.sample_width != 2:
+            logger.warning(f"VAD skipped for {reader.wav_path}: expected 16-bit mono PCM")
+            return None
+
+        frame_len = reader.sample_rate * self.frame_ms // 1000
+        view = reader.pcm_view()
+        try:
+            return self._frame_energies(view, frame_len, self.BLOCK_FRAMES)
+        finally:
+            view.release()
+
+    @staticmethod
+    def _frame_energies(view: memoryview, frame_len: int, block_frames: int) -> np.ndarray:
+        # Samples are read straight from the mapped file; only one block is ever converted to float
+        samples = np.frombuffer(view, dtype="<i2")
+        n_frames = len(samples) // frame_len
+        energies = np.empty(n_frames, dtype=np.float64)
+        for first in range(0, n_frames, block_frames):
+            last = min(first + block_frames, n_frames)
+            block = samples[first * frame_len:last * frame_len].astype(np.float64).reshape(last - first, frame_len)
+            energies[first:last] = np.mean(block * block, axis=1)
+        return 10 * np.log10(energies / (32768.0 ** 2) + 1e-10)
+
+    def speech_regions(self, energies: np.ndarray) -> List[Tuple[int, int]]:
+        """Speech regions as (start_ms, end_ms), padded and with short pauses bridged"""
+        if energies is None or len(energies) == 0:
+            return []
+
+        noise_floor = float(np.percentile(energies, 10))
+        speech_level = float(np.percentile(energies, 90))
+        if speech_level - noise_floor < self.threshold_db:
+            # No pauses stand out from the rest (continuous speech or steady noise): keep it all
+            logger.info(f"VAD: dynamic range {speech_level - noise_floor:.1f} dB too small, keeping all audio")
+            return [(0, len(energies) * self.frame_ms)]
+        threshold = noise_floor + self.threshold_db
+        speech = energies > threshold
+
+        # Hangover: keep a little audio either side of detected speech so word edges survive
+        pad = self.speech_pad_ms // self.frame_ms
+        if pad:
+            speech = np.convolve(speech.astype(np.int32), np.ones(2 * pad + 1, dtype=np.int32), mode="same") > 0
+
+        edges = np.diff(np.concatenate(([0], speech.astype(np.int8), [0])))
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1)
+
+        min_gap = self.min_silence_ms // self.frame_ms
+        regions = []
+        for start, end in zip(starts, ends):
+            if regions and start - regions[-1][1] < min_gap:
+                regions[-1][1] = end
+            else:
+                regions.append([start, end])
+
+        logger.info(
+            f"VAD: threshold {threshold:.1f} dBFS (noise floor {noise_floor:.1f}), "
+            f"{len(regions)} speech regions"
+        )
+        return [(int(start) * self.frame_ms, int(end) * self.frame_ms) for start, end in regions]
+
+    def plan_chunks(self, reader: WavChunkReader, max_chunk_ms: int) -> List[dict]:
+        """Chunk plan whose boundaries fall in silences; long non-speech stretches are left out.
+
+        Returns chunk dicts in the same shape as JioTranslateSTTTranscriber.create_smart_chunks,
+        with zero overlap. An empty list means no usable speech was found.
+        """
+        energies = self.frame_energies(reader)
+        regions = self.speech_regions(energies)
+        if not regions:
+            return []
+
+        # Split regions that alone exceed the chunk limit at their quietest point
+        pieces = []
+        for start, end in regions:
+            while end - start > max_chunk_ms:
+                cut = self._quietest_point(energies, start + max_chunk_ms - self.SPLIT_SEARCH_MS, start + max_chunk_ms)
+                pieces.append((start, cut))
+                start = cut
+            pieces.append((start, end))
+
+        # Pack neighbouring pieces into chunks up to the limit
+        spans = []
+        for start, end in pieces:
+            if spans and end - spans[-1][0] <= max_chunk_ms and start - spans[-1][1] <= self.MAX_PACKED_GAP_MS:
+                spans[-1][1] = end
+            else:
+                spans.append([start, end])
+
+        speech_ms = sum(end - start for start, end in spans)
+        logger.info(
+            f"VAD plan: {len(spans)} chunks covering {speech_ms / 1000:.1f}s "
+            f"of {reader.duration_ms / 1000:.1f}s audio"
+        )
+
+        return [
+            {
+                'index': i,
+                'start': start,
+                'end': end,
+                'is_first': i == 0,
+                'is_last': i == len(spans) - 1,
+                'overlap_start': 0,
+                'overlap_end': 0
+            }
+            for i, (start, end) in enumerate(spans)
+        ]
+
+    def pcm_energies(self, pcm: bytes, sample_rate: int) -> np.ndarray:
+        """Per-frame energy in dBFS of an in-memory 16-bit mono PCM buffer"""
+        with memoryview(pcm) as view:
+            return self._frame_energies(view, sample_rate * self.frame_ms // 1000, self.BLOCK_FRAMES)
+
+    def has_speech(self, energies: np.ndarray) -> bool:
+        """False only for buffers that never rise above the absolute silence floor"""
+        return energies.size > 0 and float(energies.max()) > self.MIN_THRESHOLD_DB
+
+    def streaming_cut_ms(self, energies: np.ndarray, max_chunk_ms: int) -> int:
+        """Where to end a chunk of a still-growing stream: the quietest point before max_chunk_ms"""
+        return self._quietest_point(energies, max_chunk_ms - self.SPLIT_SEARCH_MS, max_chunk_ms) or max_chunk_ms
+
+    def _quietest_point(self, energies: np.ndarray, window_start_ms: int, window_end_ms: int) -> int:
+        lo = max(0, window_start_ms // self.frame_ms)
+        hi = max(lo + 1, min(len(energies), window_end_ms // self.frame_ms))
+        return int(lo + np.argmin(energies[lo:hi])) * self.frame_ms
+
+    def compact_silences(self, wav_path: str) -> str:
+        """Write a copy of the audio with long non-speech stretches shortened.
+
+        Returns the new path, or wav_path unchanged if there is little to remove.
+        """
+        with WavChunkReader(wav_path) as reader:
+            regions = self.speech_regions(self.frame_energies(reader))
+            if not regions:
+                return wav_path
+
+            total_ms = reader.duration_ms
+            kept_ms = sum(end - start for start, end in regions) + self.compact_gap_ms * (len(regions) - 1)
+            if total_ms - kept_ms < self.MIN_COMPACT_SAVINGS_MS:
+                return wav_path
+
+            out_path = f"{os.path.splitext(wav_path)[0]}.speech.wav"
+            gap = b"\x00" * (reader.sample_rate * self.compact_gap_ms // 1000 * reader.block_align)
+            with wave.open(out_path, "wb") as out:
+                out.setnchannels(reader.channels)
+                out.setsampwidth(reader.sample_width)
+                out.setframerate(reader.sample_rate)
+                for i, (start, end) in enumerate(regions):
+                    if i:
+                        out.writeframes(gap)
+                    with reader.pcm_view(start, end) as view:
+                        out.writeframes(view)
+
+        logger.info(f"VAD removed {(total_ms - kept_ms) / 1000:.1f}s of non-speech from {wav_path} ({total_ms / 1000:.1f}s total)")
+        return out_path
+
+voice_activity_detector = VoiceActivityDetector()
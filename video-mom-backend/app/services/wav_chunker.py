@@ -0,0 +1,113 @@
+import mmap
+import struct
+import logging
+
+logger = logging.getLogger(__name__)
+
+WAV_HEADER_SIZE = 44
+
+def build_wav_header(num_data_bytes: int, sample_rate: int, channels: int, sample_width: int) -> bytes:
+    """Canonical 44-byte PCM WAV header for a data chunk of num_data_bytes"""
+    block_align = channels * sample_width
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF", 36 + num_data_bytes, b"WAVE",
+        b"fmt ", 16, 1, channels, sample_rate, sample_rate * block_align, block_align, sample_width * 8,
+        b"data", num_data_bytes
+    )
+
+class WavChunkReader:
+    """Memory-mapped reader for PCM WAV files that emits WAV-framed slices.
+
+    Only the RIFF header is parsed; sample data is never decoded. Each slice is the
+    mapped byte range of the data chunk prefixed with a fresh header, so cutting a
+    long recording into chunks costs one copy per chunk and no temp files.
+    """
+
+    def __init__(self, wav_path: str):
+        self.wav_path = wav_path
+        self._file = open(wav_path, "rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._parse_header()
+        except Exception:
+            self.close()
+            raise
+
+    def _parse_header(self):
+        mm = self._mmap
+        if len(mm) < 12 or mm[0:4] != b"RIFF" or mm[8:12] != b"WAVE":
+            raise ValueError(f"Not a RIFF/WAVE file: {self.wav_path}")
+
+        fmt_found = False
+        offset = 12
+        while offset + 8 <= len(mm):
+            chunk_id = mm[offset:offset + 4]
+            chunk_size = struct.unpack_from("<I", mm, offset + 4)[0]
+            body = offset + 8
+
+            if chunk_id == b"fmt ":
+                audio_format, channels, sample_rate, _, block_align, bits = struct.unpack_from("<HHIIHH", mm, body)
+                if audio_format not in (1, 0xFFFE):
+                    raise ValueError(f"Unsupported WAV encoding {audio_format} (PCM required): {self.wav_path}")
+                self.channels = channels
+                self.sample_rate = sample_rate
+                self.sample_width = bits // 8
+                self.block_align = block_align
+                fmt_found = True
+            elif chunk_id == b"data":
+                if not fmt_found:
+                    raise ValueError(f"WAV data chunk precedes fmt chunk: {self.wav_path}")
+                self.data_offset = body
+                # Streamed writers (e.g. ffmpeg to a pipe) may leave a placeholder size
+                self.data_size = min(chunk_size, len(mm) - body)
+                self.data_size -= self.data_size % self.block_align
+                return
+
+            # Chunks are word-aligned
+            offset = body + chunk_size + (chunk_size & 1)
+
+        raise ValueError(f"WAV file has no data chunk: {self.wav_path}")
+
+    @property
+    def num_frames(self) -> int:
+        return self.data_size // self.block_align
+
+    @property
+    def duration_ms(self) -> int:
+        return int(self.num_frames * 1000 / self.sample_rate)
+
+    def byte_range(self, start_ms: int, end_ms: int):
+        """Absolute [start, end) byte offsets of the frames covering start_ms..end_ms"""
+        start_frame = min(self.num_frames, max(0, start_ms * self.sample_rate // 1000))
+        end_frame = min(self.num_frames, max(start_frame, end_ms * self.sample_rate // 1000))
+        return (self.data_offset + start_frame * self.block_align,
+                self.data_offset + end_frame * self.block_align)
+
+    def wav_bytes(self, start_ms: int, end_ms: int) -> bytes:
+        """A standalone WAV file holding the audio between start_ms and end_ms"""
+        start, end = self.byte_range(start_ms, end_ms)
+        header = build_wav_header(end - start, self.sample_rate, self.channels, self.sample_width)
+        with memoryview(self._mmap) as view:
+            return b"".join((header, view[start:end]))
+
+    def pcm_view(self, start_ms: int = 0, end_ms: int = None) -> memoryview:
+        """Zero-copy view of the raw PCM frames; release it before closing the reader"""
+        start, end = self.byte_range(start_ms, self.duration_ms if end_ms is None else end_ms)
+        if end_ms is None:
+            end = self.data_offset + self.data_size
+        return memoryview(self._mmap)[start:end]
+
+    def close(self):
+        if getattr(self, "_mmap", None) is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,117 @@
+"""Queue worker: runs transcription, LLM and translation pipelines claimed from MongoDB.
+
+Start with `python -m app.worker` alongside an API started with EXECUTION_MODE=queue.
+Workers need the same temp_storage volume as the API, since uploads are stored there.
+"""
+import signal
+import asyncio
+import logging
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from app.core.config import settings
+from app.core.database import connect_to_mongo, close_mongo_connection, get_database, RequestStatus
+from app.services.request_tracker import RequestTracker
+from app.services.job_queue import JobQueue, PROCESS_ID
+from app.services.job_scheduler import job_scheduler, JOB_PRIORITIES
+from app.services.http_client import http_clients
+from app.api.endpoints import REQUEST_PROCESSORS
+
+logger = logging.getLogger(__name__)
+
+class Worker:
+    """Claims queued requests while local per-type job slots are free and runs them"""
+
+    def __init__(self, db):
+        self.worker_id = PROCESS_ID
+        self.queue = JobQueue(db)
+        self.tracker = RequestTracker(db)
+        self._stopping = asyncio.Event()
+
+    def stop(self):
+        logger.info(f"Worker {self.worker_id} stopping")
+        self._stopping.set()
+
+    async def run(self):
+        await self.queue.setup()
+        logger.info(f"Worker {self.worker_id} started (limits: {job_scheduler.limits})")
+
+        while not self._stopping.is_set():
+            try:
+                claimed = await self._claim_next()
+            except Exception as e:
+                logger.error(f"Failed to claim job: {e}")
+                claimed = False
+
+            if not claimed:
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), timeout=settings.WORKER_POLL_INTERVAL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def _claim_next(self) -> bool:
+        """Claim one job of a type that can start immediately; False if nothing was claimed"""
+        free_types = [job_type for job_type in JOB_PRIORITIES if job_scheduler.available_slots(job_type) > 0]
+        if not free_types:
+            return False
+
+        job = await self.queue.claim(self.worker_id, free_types)
+        if not job:
+            return False
+
+        logger.info(f"Claimed {job['job_type']} job {job['request_id']} (attempt {job.get('attempts', 1)})")
+        job_scheduler.submit(job["job_type"], job["request_id"], lambda: self._execute(job))
+        return True
+
+    async def _execute(self, job: dict):
+        request_id = job["request_id"]
+        heartbeat_task = asyncio.create_task(self._heartbeat(request_id))
+        try:
+            processor = REQUEST_PROCESSORS.get(job["request_type"])
+            if processor is None:
+                await self.tracker.update_request_status(
+                    request_id, RequestStatus.FAILED, error_message=f"No processor for {job['request_type']}"
+                )
+            else:
+                await processor(request_id, self.tracker)
+        except asyncio.CancelledError:
+            # Leave the lease to expire so another worker picks the job up
+            raise
+        except Exception:
+            logger.exception(f"Job {request_id} failed")
+        finally:
+            heartbeat_task.cancel()
+
+        await self.queue.release(request_id, self.worker_id)
+
+    async def _heartbeat(self, request_id: str):
+        while True:
+            await asyncio.sleep(settings.JOB_HEARTBEAT_SECONDS)
+            try:
+                if not await self.queue.heartbeat(request_id, self.worker_id):
+                    logger.warning(f"Lost lease on job {request_id}")
+                    return
+            except Exception as e:
+                logger.warning(f"Heartbeat failed for job {request_id}: {e}")
+
+async def main():
+    await connect_to_mongo()
+    db = await get_database()
+    worker = Worker(db)
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, worker.stop)
+
+    try:
+        await worker.run()
+    finally:
+        await job_scheduler.drain(settings.JOB_DRAIN_TIMEOUT_SECONDS)
+        await worker.queue.expire_leases(worker.worker_id)
+        await http_clients.aclose()
+        await close_mongo_connection()
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    asyncio.run(main())
@@ -0,0 +1,39 @@
+import os
+import sys
+import wave
+import numpy as np
+import pytest
+
+# Settings require these; tests never connect to MongoDB
+os.environ.setdefault("MONGODB_URL", "mongodb://127.0.0.1:1/?serverSelectionTimeoutMS=200")
+os.environ.setdefault("DATABASE_NAME", "egramsabha_test")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SAMPLE_RATE = 16000
+
+@pytest.fixture
+def make_wav(tmp_path):
+    """Write a 16 kHz mono 16-bit WAV from (kind, seconds) parts; kind is "speech", "quiet" or "zero"."""
+    rng = np.random.default_rng(0)
+
+    def _make(parts, name="audio.wav"):
+        pieces = []
+        for kind, seconds in parts:
+            n = int(seconds * SAMPLE_RATE)
+            if kind == "speech":
+                pieces.append(rng.normal(0, 6000, n))
+            elif kind == "quiet":
+                pieces.append(rng.normal(0, 20, n))
+            else:
+                pieces.append(np.zeros(n))
+        samples = np.clip(np.concatenate(pieces), -32768, 32767).astype("<i2")
+        path = tmp_path / name
+        with wave.open(str(path), "wb") as out:
+            out.setnchannels(1)
+            out.setsampwidth(2)
+            out.setframerate(SAMPLE_RATE)
+            out.writeframes(samples.tobytes())
+        return str(path)
+
+    return _make
@@ -0,0 +1,36 @@
+import os
+import time
+import asyncio
+from app.services.file_storage import FileStorage
+
+def test_concurrent_writes_of_one_part_never_interleave(tmp_path):
+    storage = FileStorage(str(tmp_path))
+
+    async def body(fill):
+        for _ in range(20):
+            yield fill * 1000
+            await asyncio.sleep(0)
+
+    async def scenario():
+        await asyncio.gather(
+            storage.store_upload_part("u1", 0, body(b"a"), 10 ** 6),
+            storage.store_upload_part("u1", 0, body(b"b"), 10 ** 6),
+        )
+
+    asyncio.run(scenario())
+    data = (tmp_path / "upload_u1" / "000000.part").read_bytes()
+    assert data in (b"a" * 20000, b"b" * 20000)
+    assert sorted(os.listdir(tmp_path / "upload_u1")) == ["000000.part"]
+
+def test_cleanup_keeps_upload_parts_for_the_session_ttl(tmp_path, monkeypatch):
+    from app.core.config import settings
+    monkeypatch.setattr(settings, "RESUMABLE_UPLOAD_TTL_HOURS", 72)
+    storage = FileStorage(str(tmp_path))
+    two_days_ago = time.time() - 48 * 3600
+    for name in ("upload_live", "request-old"):
+        (tmp_path / name).mkdir()
+        os.utime(tmp_path / name, (two_days_ago, two_days_ago))
+
+    storage.cleanup_old_files(hours_old=24)
+    assert (tmp_path / "upload_live").exists()
+    assert not (tmp_path / "request-old").exists()
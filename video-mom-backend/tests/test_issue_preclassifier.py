@@ -0,0 +1,97 @@
+import itertools
+from datetime import datetime, timedelta
+import pytest
+from app.services.issue_preclassifier import IssuePreclassifier
+
+PLACES = ["ward 3", "the school road", "the market", "the bus stand", "ward 7", "the temple lane",
+          "the panchayat office", "the health centre", "ward 1", "the river bank"]
+ROUTINE = [
+    "Street light not working near {}", "Garbage not collected in {} for a week", "Drain blocked at {}",
+    "Pothole on the road at {}", "Hand pump broken near {}", "Ration shop delay at {}",
+    "Water supply timing irregular in {}", "Road repair pending at {}", "Toilet dirty at {}",
+    "Pension payment pending for people in {}",
+]
+EMERGENCIES = [
+    "Fire in houses near {}, people injured", "Live wire fell on the road at {}, danger",
+    "Cholera outbreak in {}, many sick", "Flood water entered homes in {}",
+    "Accident at {}, ambulance needed", "Dengue cases rising in {}, emergency",
+]
+
+def analyses(templates, count, sentiment, priority, language="en"):
+    texts = (template.format(place) for place, template in itertools.product(PLACES, templates))
+    return [{"text": text, "language": language, "sentiment": sentiment, "priority": priority}
+            for text in itertools.islice(itertools.cycle(list(texts)), count)]
+
+def trained(docs):
+    classifier = IssuePreclassifier()
+    classifier._loaded = True  # no MongoDB: train from the given docs
+    classifier._models = classifier._fit(docs)
+    return classifier
+
+@pytest.fixture
+def skewed():
+    return trained(analyses(ROUTINE, 190, "NEGATIVE", "NORMAL") + analyses(EMERGENCIES, 10, "NEGATIVE", "URGENT"))
+
+def test_skewed_history_never_answers_normal_locally(skewed):
+    assert "NORMAL" not in skewed._models[3]
+    for emergency in ["Boy drowned in village pond", "Wall of primary school cracked and may fall on children"]:
+        assert skewed.classify(emergency) is None
+    # Even routine issues escalate: too few held-out urgent issues to trust NORMAL answers
+    assert skewed.classify("Street light not working near ward 9") is None
+
+def test_balanced_history_answers_confident_trusted_classes():
+    classifier = trained(analyses(ROUTINE, 200, "NEGATIVE", "NORMAL") + analyses(EMERGENCIES, 200, "NEGATIVE", "URGENT"))
+    report = classifier.stats()["validation"]
+    assert report["trusted_priorities"] == ["NORMAL", "URGENT"]
+    assert report["priority"]["URGENT"]["caught"] >= 0.85
+
+    routine = classifier.classify("Garbage not collected in ward 3 for a week")
+    assert routine["suggestedPriority"] == "NORMAL"
+    assert routine["source"] == "local" and routine["keyPhrasesSource"] == "keywords"
+    urgent = classifier.classify("Fire in houses near the market, people injured")
+    assert urgent["suggestedPriority"] == "URGENT"
+
+def test_urgent_keyword_blocks_a_local_normal_answer():
+    classifier = trained(analyses(ROUTINE, 200, "NEGATIVE", "NORMAL") + analyses(EMERGENCIES, 200, "NEGATIVE", "URGENT"))
+    assert classifier.classify("Garbage not collected in ward 3 for a week") is not None
+    assert classifier.classify("Garbage not collected in ward 3 for a week, snake seen") is None
+
+def test_rare_classes_are_not_trusted(skewed):
+    # POSITIVE never appeared in training or validation
+    assert "POSITIVE" not in skewed._models[2]
+
+def test_languages_without_validated_history_are_escalated():
+    classifier = trained(analyses(ROUTINE, 200, "NEGATIVE", "NORMAL") + analyses(EMERGENCIES, 200, "NEGATIVE", "URGENT"))
+    assert classifier.stats()["validation"]["trusted_languages"] == ["en"]
+    assert classifier.classify("Fire in houses near the market, people injured", "en-IN") is not None
+    assert classifier.classify("Fire in houses near the market, people injured", "ta") is None
+
+def test_lexicon_fallback_only_covers_lexicon_languages():
+    classifier = IssuePreclassifier()
+    classifier._loaded = True
+    emergency = "Fire in houses near the market, people injured, ambulance needed"
+    assert classifier.classify(emergency, "hi")["suggestedPriority"] == "URGENT"
+    assert classifier.classify(emergency, "ta") is None
+
+def test_recorded_analyses_expire_and_are_capped(monkeypatch):
+    mongomock = pytest.importorskip("mongomock")
+    from app.services import issue_preclassifier as module
+    monkeypatch.setattr(module.settings, "ISSUE_PRECLASSIFIER_MAX_SAMPLES", 50)
+    monkeypatch.setattr(module.settings, "ISSUE_PRECLASSIFIER_MIN_SAMPLES", 1000)
+    collection = mongomock.MongoClient().db.issue_analyses
+    collection.create_index([("created_at", -1)])
+    classifier = IssuePreclassifier()
+    IssuePreclassifier._ensure_indexes(collection)
+    classifier._collection = collection
+
+    ttl = collection.index_information()["created_at_1"]
+    assert ttl["expireAfterSeconds"] == module.settings.ISSUE_PRECLASSIFIER_RETENTION_DAYS * 86400
+    assert "created_at_-1" not in collection.index_information()
+
+    start = (datetime.utcnow() - timedelta(hours=2)).replace(microsecond=0)
+    collection.insert_many([dict(doc, created_at=start + timedelta(minutes=i))
+                            for i, doc in enumerate(analyses(ROUTINE, 80, "NEGATIVE", "NORMAL"))])
+    classifier._training = True
+    classifier._train()
+    assert collection.count_documents({}) == 50
+    assert collection.find_one(sort=[("created_at", 1)])["created_at"] == start + timedelta(minutes=30)
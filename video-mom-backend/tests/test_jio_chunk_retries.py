@@ -0,0 +1,121 @@
+import asyncio
+import wave
+import zlib
+import pytest
+from app.services import jio_only_stt_transcriber as jio
+from app.services.jio_only_stt_transcriber import JioTranslateSTTTranscriber, IncompleteTranscriptionError
+
+class MemoryCheckpoint:
+    """ChunkCheckpoint without MongoDB"""
+
+    def __init__(self):
+        self.stored = {}
+
+    async def load(self):
+        return len(self.stored)
+
+    def key(self, chunk_info):
+        return f"{chunk_info['start']}-{chunk_info['end']}"
+
+    def get(self, chunk_info):
+        return self.stored.get(self.key(chunk_info))
+
+    async def save(self, chunk_info, result):
+        self.stored[self.key(chunk_info)] = result
+
+class FakeProvider:
+    """Stands in for the Jio API; chunks shorter than a minute fail `failures` times"""
+
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.calls = []
+
+    async def __call__(self, audio_bytes, duration, language):
+        self.calls.append(duration)
+        if duration < 60 and self.failures:
+            self.failures -= 1
+            return None
+        return {"recognized_text": f"w{zlib.crc32(audio_bytes)}"}
+
+@pytest.fixture
+def transcriber(monkeypatch):
+    # Fixed 60 s chunks (0-60, 57-117, 114-130 s for 130 s of audio)
+    monkeypatch.setattr(jio.voice_activity_detector, "enabled", False)
+    transcriber = JioTranslateSTTTranscriber()
+    transcriber.api_key = "test"
+    transcriber.chunk_retries = 2
+    transcriber.retry_base_seconds = 0
+    return transcriber
+
+def test_failed_chunk_is_retried(transcriber, make_wav):
+    provider = FakeProvider(failures=2)
+    transcriber._send_wav_bytes_async = provider
+    transcript = asyncio.run(transcriber.transcribe_audio(make_wav([("speech", 130)]), checkpoint=MemoryCheckpoint()))
+    assert len(transcript.split()) == 3
+    assert len(provider.calls) == 5
+
+def test_missing_chunk_fails_and_keeps_checkpoints(transcriber, make_wav):
+    path = make_wav([("speech", 130)])
+    checkpoint = MemoryCheckpoint()
+    transcriber._send_wav_bytes_async = FakeProvider(failures=3)
+    with pytest.raises(IncompleteTranscriptionError) as excinfo:
+        asyncio.run(transcriber.transcribe_audio(path, checkpoint=checkpoint))
+    assert excinfo.value.missing_chunks == [2]
+    assert len(checkpoint.stored) == 2
+
+    # The next attempt only sends the chunk that never came back
+    provider = FakeProvider()
+    transcriber._send_wav_bytes_async = provider
+    transcript = asyncio.run(transcriber.transcribe_audio(path, checkpoint=checkpoint))
+    assert len(transcript.split()) == 3
+    assert len(provider.calls) == 1
+
+def test_streamed_missing_chunk_fails_and_resumes(transcriber, make_wav):
+    path = make_wav([("speech", 130)])
+
+    def pcm_blocks():
+        with wave.open(path, "rb") as wav:
+            while True:
+                block = wav.readframes(16000)
+                if not block:
+                    return
+                yield block
+
+    checkpoint = MemoryCheckpoint()
+    transcriber._send_wav_bytes_async = FakeProvider(failures=3)
+    with pytest.raises(IncompleteTranscriptionError):
+        asyncio.run(transcriber.transcribe_stream(pcm_blocks(), checkpoint=checkpoint))
+    assert len(checkpoint.stored) == 2
+
+    provider = FakeProvider()
+    transcriber._send_wav_bytes_async = provider
+    transcript = asyncio.run(transcriber.transcribe_stream(pcm_blocks(), checkpoint=checkpoint))
+    assert len(transcript.split()) == 3
+    assert provider.calls == [10.0]
+
+def test_reupload_of_the_same_media_skips_finished_chunks(transcriber, make_wav):
+    mongomock_motor = pytest.importorskip("mongomock_motor")
+    from app.services.request_tracker import RequestTracker, ChunkCheckpoint
+
+    path = make_wav([("speech", 130)])
+    tracker = RequestTracker(mongomock_motor.AsyncMongoMockClient()["test"])
+
+    async def scenario():
+        # The first request gives up with one chunk missing and ends FAILED
+        transcriber._send_wav_bytes_async = FakeProvider(failures=3)
+        with pytest.raises(IncompleteTranscriptionError):
+            await transcriber.transcribe_audio(path, checkpoint=ChunkCheckpoint(tracker, "first", "jio:Hindi", "cafe"))
+
+        # A re-upload gets a new request ID but the same content hash
+        provider = FakeProvider()
+        transcriber._send_wav_bytes_async = provider
+        checkpoint = ChunkCheckpoint(tracker, "second", "jio:Hindi", "cafe")
+        transcript = await transcriber.transcribe_audio(path, checkpoint=checkpoint)
+        assert len(transcript.split()) == 3
+        assert provider.calls == [16.0]
+
+        # Other languages of the same media never see these chunks
+        assert await ChunkCheckpoint(tracker, "third", "jio:Marathi", "cafe").load() == 0
+        await checkpoint.clear()
+        assert await ChunkCheckpoint(tracker, "fourth", "jio:Hindi", "cafe").load() == 0
+    asyncio.run(scenario())
@@ -0,0 +1,161 @@
+import asyncio
+from datetime import datetime, timedelta
+import pytest
+from app.core.database import RequestStatus
+from app.services.job_queue import JobQueue, QueueState
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+def run(coro):
+    return asyncio.run(coro)
+
+async def make_queue():
+    queue = JobQueue(mongomock_motor.AsyncMongoMockClient()["test"])
+    await queue.setup()
+    return queue
+
+async def insert_request(queue, request_id, created_at=None, **fields):
+    now = datetime.utcnow()
+    await queue.requests_collection.insert_one({
+        "request_id": request_id,
+        "request_type": "translation",
+        "status": RequestStatus.INITIATED,
+        "created_at": created_at or now,
+        "updated_at": created_at or now,
+        **fields
+    })
+
+async def expire_lease(queue, request_id):
+    await queue.requests_collection.update_one(
+        {"request_id": request_id}, {"$set": {"lease_expires_at": datetime.utcnow() - timedelta(seconds=1)}}
+    )
+
+def test_claim_takes_highest_priority_first():
+    async def scenario():
+        queue = await make_queue()
+        for request_id, priority in (("bulk", 2), ("interactive", 0), ("llm", 1)):
+            await insert_request(queue, request_id)
+            await queue.enqueue(request_id, "translation", priority)
+        claimed = [(await queue.claim("w1", ["translation"]))["request_id"] for _ in range(3)]
+        assert claimed == ["interactive", "llm", "bulk"]
+        assert await queue.claim("w1", ["translation"]) is None
+    run(scenario())
+
+def test_claim_only_matches_requested_job_types():
+    async def scenario():
+        queue = await make_queue()
+        await insert_request(queue, "r1")
+        await queue.enqueue("r1", "transcription", 2)
+        assert await queue.claim("w1", ["llm", "translation"]) is None
+        assert (await queue.claim("w1", ["transcription"]))["request_id"] == "r1"
+    run(scenario())
+
+def test_a_job_is_claimed_only_once():
+    async def scenario():
+        queue = await make_queue()
+        await insert_request(queue, "r1")
+        await queue.enqueue("r1", "translation", 0)
+        results = await asyncio.gather(*(queue.claim(f"w{i}", ["translation"]) for i in range(5)))
+        winners = [job for job in results if job]
+        assert len(winners) == 1
+        assert winners[0]["attempts"] == 1
+    run(scenario())
+
+def test_live_lease_is_not_reclaimed_but_expired_one_is():
+    async def scenario():
+        queue = await make_queue()
+        await insert_request(queue, "r1")
+        await queue.enqueue("r1", "translation", 0)
+        first = await queue.claim("w1", ["translation"])
+        assert await queue.claim("w2", ["translation"]) is None
+        assert await queue.heartbeat("r1", "w1")
+
+        await expire_lease(queue, "r1")
+        second = await queue.claim("w2", ["translation"])
+        assert second["lease_owner"] == "w2"
+        assert second["attempts"] == first["attempts"] + 1
+        # The old owner learns it lost the lease and cannot release the new owner's job
+        assert not await queue.heartbeat("r1", "w1")
+        await queue.release("r1", "w1")
+        doc = await queue.requests_collection.find_one({"request_id": "r1"})
+        assert doc["queue_state"] == QueueState.LEASED and doc["lease_owner"] == "w2"
+    run(scenario())
+
+def test_expired_lease_is_not_reclaimed_after_max_attempts(monkeypatch):
+    async def scenario():
+        from app.core.config import settings
+        monkeypatch.setattr(settings, "JOB_MAX_ATTEMPTS", 2)
+        queue = await make_queue()
+        await insert_request(queue, "r1")
+        await queue.enqueue("r1", "translation", 0)
+        for worker in ("w1", "w2"):
+            assert await queue.claim(worker, ["translation"])
+            await expire_lease(queue, "r1")
+        assert await queue.claim("w3", ["translation"]) is None
+    run(scenario())
+
+def test_renew_leases_extends_every_lease_of_the_owner():
+    async def scenario():
+        queue = await make_queue()
+        for request_id in ("r1", "r2"):
+            await insert_request(queue, request_id)
+            await queue.lease(request_id, "translation", 0, "api-1")
+            await expire_lease(queue, request_id)
+        assert await queue.renew_leases("api-1") == 2
+        assert await queue.claim_interrupted("api-2") is None
+    run(scenario())
+
+def test_expired_leases_are_recovered_once():
+    async def scenario():
+        queue = await make_queue()
+        await insert_request(queue, "r1")
+        await queue.lease("r1", "translation", 0, "api-1")
+        assert await queue.claim_interrupted("api-2") is None
+
+        await queue.expire_leases("api-1")
+        await asyncio.sleep(0.01)  # stored datetimes have millisecond precision
+        recovered = await asyncio.gather(queue.claim_interrupted("api-2"), queue.claim_interrupted("api-3"))
+        assert len([job for job in recovered if job]) == 1
+    run(scenario())
+
+def test_finished_requests_are_not_recovered():
+    async def scenario():
+        queue = await make_queue()
+        await insert_request(queue, "r1", status=RequestStatus.COMPLETED)
+        await queue.lease("r1", "translation", 0, "api-1")
+        await expire_lease(queue, "r1")
+        assert await queue.claim_interrupted("api-2") is None
+    run(scenario())
+
+def test_requests_from_before_the_queue_are_failed_not_recovered():
+    async def scenario():
+        db = mongomock_motor.AsyncMongoMockClient()["test"]
+        queue = JobQueue(db)
+        old = datetime.utcnow() - timedelta(days=30)
+        await insert_request(queue, "legacy", created_at=old)
+        await insert_request(queue, "legacy-done", created_at=old, status=RequestStatus.COMPLETED)
+
+        await queue.setup()
+        assert await queue.claim_interrupted("api-1") is None
+        legacy = await queue.requests_collection.find_one({"request_id": "legacy"})
+        assert legacy["status"] == RequestStatus.FAILED
+        done = await queue.requests_collection.find_one({"request_id": "legacy-done"})
+        assert done["status"] == RequestStatus.COMPLETED
+
+        # Later starts keep the original queue creation time and change nothing
+        created_at = await queue.queue_created_at()
+        assert await queue.fail_legacy_requests() == 0
+        assert await queue.queue_created_at() == created_at
+    run(scenario())
+
+def test_unleased_request_created_after_the_queue_is_recovered_when_stale():
+    async def scenario():
+        queue = await make_queue()
+        await insert_request(queue, "fresh")
+        assert await queue.claim_interrupted("api-1") is None
+
+        await queue.requests_collection.update_one(
+            {"request_id": "fresh"}, {"$set": {"updated_at": datetime.utcnow() - timedelta(seconds=queue.lease_seconds + 1)}}
+        )
+        assert (await queue.claim_interrupted("api-1"))["request_id"] == "fresh"
+    run(scenario())
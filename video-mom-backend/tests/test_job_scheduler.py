@@ -0,0 +1,122 @@
+import asyncio
+import pytest
+from app.services.job_scheduler import JobScheduler, JobType, QueueFullError
+
+def make_scheduler(limit=1, max_pending=2):
+    scheduler = JobScheduler()
+    scheduler.limits = {job_type: limit for job_type in scheduler.limits}
+    scheduler.max_pending = max_pending
+    return scheduler
+
+def test_limits_running_jobs_per_type_and_runs_by_priority():
+    async def scenario():
+        scheduler = make_scheduler(limit=1, max_pending=10)
+        started = []
+        gate = asyncio.Event()
+
+        def job(name):
+            async def run():
+                started.append(name)
+                await gate.wait()
+            return run
+
+        scheduler.submit(JobType.TRANSCRIPTION, "t1", job("t1"))
+        scheduler.submit(JobType.TRANSCRIPTION, "t2", job("t2"), priority=5)
+        scheduler.submit(JobType.TRANSCRIPTION, "t3", job("t3"), priority=0)
+        scheduler.submit(JobType.TRANSLATION, "x1", job("x1"))
+        await asyncio.sleep(0)
+        assert sorted(started) == ["t1", "x1"]
+        assert scheduler.stats()["running"][JobType.TRANSCRIPTION] == 1
+
+        gate.set()
+        await asyncio.sleep(0.01)
+        # t3 has the better priority of the two waiting transcriptions
+        assert started.index("t3") < started.index("t2")
+    asyncio.run(scenario())
+
+def test_rejects_when_full_and_after_drain_starts():
+    async def scenario():
+        scheduler = make_scheduler(limit=1, max_pending=1)
+        gate = asyncio.Event()
+        scheduler.submit(JobType.LLM, "a", gate.wait)
+        scheduler.check_capacity(JobType.LLM)  # one pending slot left
+        scheduler.submit(JobType.LLM, "b", gate.wait)
+        with pytest.raises(QueueFullError):
+            scheduler.check_capacity(JobType.LLM)
+
+        drain = asyncio.create_task(scheduler.drain(timeout=1))
+        await asyncio.sleep(0)
+        with pytest.raises(QueueFullError):
+            scheduler.check_capacity(JobType.TRANSLATION)
+        gate.set()
+        await drain
+    asyncio.run(scenario())
+
+def test_drain_waits_for_running_jobs_and_drops_queued_ones():
+    async def scenario():
+        scheduler = make_scheduler(limit=1, max_pending=10)
+        finished = []
+
+        async def slow():
+            await asyncio.sleep(0.05)
+            finished.append("running")
+
+        async def never():
+            finished.append("queued")
+
+        scheduler.submit(JobType.LLM, "running", slow)
+        scheduler.submit(JobType.LLM, "queued", never)
+        await scheduler.drain(timeout=1)
+        assert finished == ["running"]
+        assert scheduler.stats()["pending"][JobType.LLM] == 0
+    asyncio.run(scenario())
+
+def test_drain_cancels_jobs_past_the_timeout():
+    async def scenario():
+        scheduler = make_scheduler()
+        cancelled = asyncio.Event()
+
+        async def stuck():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        scheduler.submit(JobType.TRANSCRIPTION, "stuck", stuck)
+        await asyncio.sleep(0)
+        await scheduler.drain(timeout=0.05)
+        assert cancelled.is_set()
+        assert scheduler.stats()["running"][JobType.TRANSCRIPTION] == 0
+    asyncio.run(scenario())
+
+def test_failing_job_frees_its_slot():
+    async def scenario():
+        scheduler = make_scheduler()
+        ran = []
+
+        async def boom():
+            raise RuntimeError("pipeline bug")
+
+        async def next_job():
+            ran.append(True)
+
+        scheduler.submit(JobType.LLM, "boom", boom)
+        scheduler.submit(JobType.LLM, "next", next_job)
+        await asyncio.sleep(0.01)
+        assert ran == [True]
+    asyncio.run(scenario())
+
+def test_drain_reports_discarded_jobs():
+    async def scenario():
+        scheduler = make_scheduler(limit=1, max_pending=10)
+        gate = asyncio.Event()
+        discarded = []
+        scheduler.submit(JobType.LLM, "running", gate.wait, on_discard=discarded.append)
+        scheduler.submit(JobType.LLM, "queued", gate.wait, on_discard=discarded.append)
+        drain = asyncio.create_task(scheduler.drain(timeout=1))
+        await asyncio.sleep(0)
+        assert len(discarded) == 1 and isinstance(discarded[0], QueueFullError)
+        gate.set()
+        await drain
+    asyncio.run(scenario())
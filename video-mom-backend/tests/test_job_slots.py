@@ -0,0 +1,63 @@
+import asyncio
+import threading
+import pytest
+from fastapi import HTTPException
+from app.api import endpoints
+from app.services.job_scheduler import JobScheduler, JobType
+
+@pytest.fixture
+def scheduler(monkeypatch):
+    scheduler = JobScheduler()
+    scheduler.limits = {job_type: 1 for job_type in scheduler.limits}
+    scheduler.max_pending = 1
+    monkeypatch.setattr(endpoints, "job_scheduler", scheduler)
+    return scheduler
+
+def test_returns_the_result_or_raises_the_error(scheduler):
+    async def scenario():
+        assert await endpoints._run_in_job_slot(JobType.TRANSLATION, lambda a, b: a + b, 2, 3) == 5
+        with pytest.raises(ZeroDivisionError):
+            await endpoints._run_in_job_slot(JobType.TRANSLATION, lambda: 1 / 0)
+    asyncio.run(scenario())
+
+def test_translation_slots_are_limited_and_overflow_is_rejected(scheduler):
+    async def scenario():
+        release = threading.Event()
+        running = []
+
+        def work(name):
+            running.append(name)
+            release.wait(5)
+            return name
+
+        first = asyncio.create_task(endpoints._run_in_job_slot(JobType.TRANSLATION, work, "first"))
+        await asyncio.sleep(0.05)
+        second = asyncio.create_task(endpoints._run_in_job_slot(JobType.TRANSLATION, work, "second"))
+        await asyncio.sleep(0.05)
+        assert running == ["first"]  # one slot: the second batch waits
+
+        with pytest.raises(HTTPException) as excinfo:
+            await endpoints._run_in_job_slot(JobType.TRANSLATION, work, "third")
+        assert excinfo.value.status_code == 429
+
+        release.set()
+        assert await asyncio.gather(first, second) == ["first", "second"]
+    asyncio.run(scenario())
+
+def test_queued_callers_are_answered_when_shutdown_drops_their_job(scheduler):
+    async def scenario():
+        release = threading.Event()
+        first = asyncio.create_task(endpoints._run_in_job_slot(JobType.TRANSLATION, release.wait, 5))
+        await asyncio.sleep(0.05)
+        second = asyncio.create_task(endpoints._run_in_job_slot(JobType.TRANSLATION, lambda: "never"))
+        await asyncio.sleep(0.05)
+
+        drain = asyncio.create_task(scheduler.drain(timeout=1))
+        with pytest.raises(HTTPException) as excinfo:
+            await asyncio.wait_for(second, timeout=1)
+        assert excinfo.value.status_code == 429
+
+        release.set()
+        await drain
+        assert await first is True
+    asyncio.run(scenario())
@@ -0,0 +1,20 @@
+import time
+from app.core import database
+from app.services import llm_cache
+from app.services.llm_cache import TwoTierCache
+
+def test_unreachable_mongodb_is_a_quick_miss(monkeypatch):
+    monkeypatch.setenv("MONGODB_URL", "mongodb://127.0.0.1:1")
+    monkeypatch.setattr(database, "sync_mongodb_clients", {})
+    monkeypatch.setattr(llm_cache.settings, "LLM_CACHE_DB_TIMEOUT_MS", 100)
+    cache = TwoTierCache("llm_cache_test", max_entries=10, ttl_hours=1)
+
+    started = time.monotonic()
+    assert cache.get("test", "missing") is None
+    assert time.monotonic() - started < 2
+    # Storing still works in process while MongoDB is skipped
+    cache.set("test", "key", {"answer": 42})
+    assert cache.get("test", "key") == {"answer": 42}
+    assert cache.stats()["misses"] == 1
+    for client in database.sync_mongodb_clients.values():
+        client.close()
@@ -0,0 +1,50 @@
+import pytest
+from botocore.exceptions import ClientError
+from app.services import llm_service as module
+from app.services.llm_service import LLMService, LLMThrottledError
+
+class FailingClient:
+    def __init__(self, error):
+        self.error = error
+
+    def converse(self, **kwargs):
+        raise self.error
+
+class ErrorWithoutResponse(Exception):
+    response = None
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(module.bedrock_rate_limiter, "acquire", lambda: None)
+    monkeypatch.setattr(module.bedrock_rate_limiter, "penalize", lambda: None)
+    return LLMService.__new__(LLMService)
+
+def test_bedrock_throttling_is_raised_for_retry(service):
+    service.bedrock_client = FailingClient(ClientError({"Error": {"Code": "ThrottlingException"}}, "Converse"))
+    with pytest.raises(LLMThrottledError):
+        service._make_bedrock_request([{"role": "user", "content": "hi"}])
+
+def test_other_bedrock_errors_are_not_masked(service):
+    service.bedrock_client = FailingClient(ClientError({"Error": {"Code": "ValidationException"}}, "Converse"))
+    assert service._make_bedrock_request([{"role": "user", "content": "hi"}]) is None
+    service.bedrock_client = FailingClient(ErrorWithoutResponse("connection reset"))
+    assert service._make_bedrock_request([{"role": "user", "content": "hi"}]) is None
+
+def test_aws_translate_split_keeps_line_breaks(service):
+    sentence = "यह ग्राम सभा की बैठक का एक लंबा वाक्य है। "
+    paragraph = sentence * 200
+    text = paragraph.strip() + "\n" + paragraph.strip() + "\n" + "Short closing line.\n"
+    parts = service._split_for_aws_translate(text)
+    assert len(parts) > 2
+    assert "".join(parts) == text
+    assert all(len(part.encode("utf-8")) <= module.AWS_TRANSLATE_MAX_BYTES for part in parts)
+    # Separators are kept as they were, never "\n" followed by an added space
+    assert not any(part.endswith("\n ") for part in parts)
+
+def test_aws_translate_restores_paragraphs(service):
+    paragraph = ("Gram sabha approved the new water tank. " * 300).strip()
+    service.translate_client = type("EchoTranslate", (), {
+        "translate_text": lambda self, Text, **kwargs: {"TranslatedText": Text.strip()}
+    })()
+    translated = service._translate_with_aws(paragraph + "\n" + paragraph, "hindi")
+    assert translated.count("\n") == 1
@@ -0,0 +1,17 @@
+import asyncio
+import pytest
+from app.core.database import RequestType
+from app.services.request_tracker import RequestTracker
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+def test_request_data_is_read_and_written_by_request_id():
+    async def scenario():
+        tracker = RequestTracker(mongomock_motor.AsyncMongoMockClient()["test"])
+        request_id = await tracker.create_request(RequestType.TRANSCRIPTION_JIO, {"language": "Marathi"})
+        assert await tracker.get_request_data(request_id) == {"language": "Marathi"}
+
+        await tracker.update_request_data(request_id, {"language": "Hindi"})
+        assert await tracker.get_request_data(request_id) == {"language": "Hindi"}
+        assert await tracker.get_request_data("unknown") == {}
+    asyncio.run(scenario())
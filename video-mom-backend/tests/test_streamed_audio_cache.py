@@ -0,0 +1,79 @@
+import asyncio
+import shutil
+import wave
+import pytest
+from app.api import endpoints
+from app.services.file_storage import FileStorage
+
+SHA = "ab" * 32
+
+class MemoryTracker:
+    def __init__(self):
+        self.objects = {}
+        self.media = {}
+
+    async def update_request_status(self, *args, **kwargs):
+        pass
+
+    async def store_object(self, request_id, object_type, data, ttl_hours=24):
+        self.objects[(request_id, object_type)] = data
+
+    async def get_object(self, request_id, object_type):
+        return self.objects.get((request_id, object_type))
+
+    async def get_media_entry(self, content_hash):
+        return self.media.get(content_hash)
+
+    async def record_media_artifact(self, content_hash, field, value, ttl_hours=24):
+        self.media.setdefault(content_hash, {})[field] = value
+
+    async def record_cached_transcription(self, *args):
+        pass
+
+def frames(path):
+    with wave.open(path, "rb") as f:
+        return f.getnframes()
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    storage = FileStorage(str(tmp_path / "storage"))
+    monkeypatch.setattr(endpoints, "file_storage", storage)
+    monkeypatch.setattr(endpoints.settings, "MEDIA_DEDUP_ENABLED", True)
+    monkeypatch.setattr(endpoints.voice_activity_detector, "enabled", True)
+    return storage
+
+def test_streamed_audio_does_not_replace_the_compacted_cache(storage, make_wav, monkeypatch):
+    source = make_wav([("speech", 3), ("zero", 12), ("speech", 3)])
+    tracker = MemoryTracker()
+
+    def stream_pcm(stored_path, wav_path):
+        shutil.copyfile(source, wav_path)
+        yield b""
+
+    def extract_audio(stored_path):
+        raise AssertionError("the streamed WAV should be reused instead of decoding again")
+
+    async def stream_transcribe(blocks):
+        list(blocks)
+        return "namaste"
+
+    monkeypatch.setattr(endpoints.audio_extractor, "stream_pcm", stream_pcm)
+    monkeypatch.setattr(endpoints.audio_extractor, "extract_audio", extract_audio)
+
+    async def scenario():
+        first_dir = storage.storage_dir / "first"
+        first_dir.mkdir()
+        transcript = await endpoints._handle_streaming_transcription(
+            "first", tracker, source, str(first_dir / "full_audio.wav"), stream_transcribe,
+            "jio_translate", SHA, "jio_translate:Hindi"
+        )
+        assert transcript == "namaste"
+        assert "audio_path" not in tracker.media[SHA]
+        assert tracker.media[SHA]["full_audio_path"].endswith(".full.wav")
+
+        # A later file-based provider for the same media still gets VAD-compacted audio
+        audio_path = await endpoints._handle_audio_extraction("second", tracker, {"sha256": SHA}, source)
+        assert frames(audio_path) < frames(source)
+        assert tracker.media[SHA]["audio_path"].endswith(f"{SHA}.wav")
+        assert frames(tracker.media[SHA]["full_audio_path"]) == frames(source)
+    asyncio.run(scenario())
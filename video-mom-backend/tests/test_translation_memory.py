@@ -0,0 +1,104 @@
+from app.services.translation_memory import TranslationMemory, split_segments
+
+class DictCache:
+    """TwoTierCache without MongoDB"""
+
+    def __init__(self):
+        self.entries = {}
+
+    def get(self, namespace, key):
+        return self.entries.get((namespace, key))
+
+    def set(self, namespace, key, value):
+        self.entries[(namespace, key)] = value
+
+def sentences(text):
+    return [sentence for _, sentence, _ in split_segments(text)]
+
+class FakeProvider:
+    def __init__(self, provider="llm", fallback_used=False):
+        self.provider = provider
+        self.fallback_used = fallback_used
+        self.calls = []
+
+    def __call__(self, text, language):
+        self.calls.append(text)
+        return {"text": f"<{text}>", "status": "success", "error": None,
+                "fallback_used": self.fallback_used, "provider": self.provider}
+
+def test_decimals_and_abbreviations_stay_whole():
+    assert sentences("Road repair in Ward No. 5 costing Rs. 2.5 lakh.") == [
+        "Road repair in Ward No. 5 costing Rs. 2.5 lakh."
+    ]
+    assert sentences("Dr. Sharma and Sh. R. K. Verma attended. Budget was 3.5 lakh.") == [
+        "Dr. Sharma and Sh. R. K. Verma attended.", "Budget was 3.5 lakh."
+    ]
+    assert sentences("Attendance was 120. 45 were women.") == ["Attendance was 120. 45 were women."]
+
+def test_sentence_ends():
+    assert sentences("Meeting held. सड़क की मरम्मत हुई। Next item?\nDone") == [
+        "Meeting held.", "सड़क की मरम्मत हुई।", "Next item?", "Done"
+    ]
+    assert sentences("See e.g. the earlier report.") == ["See e.g. the earlier report."]
+
+def test_segments_rejoin_to_the_text():
+    text = "  First point.  Second, Rs. 4.5 lakh!\n\nतीसरा।  "
+    assert "".join(lead + sentence + trail for lead, sentence, trail in split_segments(text)) == text
+
+def test_multi_sentence_run_is_not_split_into_pairs():
+    memory = TranslationMemory(DictCache())
+    provider = FakeProvider()
+    result = memory.translate("Ward No. 5 road. Costing Rs. 2.5 lakh.", "hi", provider, "llm:m1")
+    assert result["text"] == "<Ward No. 5 road. Costing Rs. 2.5 lakh.>"
+
+    # Only the whole text was stored, so a text sharing one sentence is translated afresh
+    result = memory.translate("Ward No. 5 road. Something new.", "hi", provider, "llm:m1")
+    assert provider.calls[-1] == "Ward No. 5 road. Something new."
+    assert result["memory_hits"] == 0
+
+    result = memory.translate("Ward No. 5 road. Costing Rs. 2.5 lakh.", "hi", provider, "llm:m1")
+    assert result["provider"] == "translation_memory"
+    assert len(provider.calls) == 2
+
+def test_single_sentences_are_reused_between_known_ones():
+    memory = TranslationMemory(DictCache())
+    provider = FakeProvider()
+    memory.translate("Gram Sabha opened.", "hi", provider, "llm:m1")
+    memory.translate("Meeting closed.", "hi", provider, "llm:m1")
+
+    result = memory.translate("Gram Sabha opened. Budget of Rs. 2.5 lakh passed. Meeting closed.", "hi", provider, "llm:m1")
+    assert provider.calls[-1] == "Budget of Rs. 2.5 lakh passed."
+    assert result["text"] == "<Gram Sabha opened.> <Budget of Rs. 2.5 lakh passed.> <Meeting closed.>"
+    assert result["memory_hits"] == 2
+
+def test_entries_are_kept_per_provider_and_model():
+    memory = TranslationMemory(DictCache())
+    memory.translate("Gram Sabha opened.", "hi", FakeProvider(), "llm:m1")
+    provider = FakeProvider("aws_translate")
+    result = memory.translate("Gram Sabha opened.", "hi", provider, "aws_translate")
+    assert provider.calls == ["Gram Sabha opened."]
+    assert result["provider"] == "aws_translate"
+
+def test_fallback_output_is_not_stored():
+    memory = TranslationMemory(DictCache())
+    memory.translate("Gram Sabha opened.", "hi", FakeProvider("llm", fallback_used=True), "aws_translate")
+    provider = FakeProvider("aws_translate")
+    memory.translate("Gram Sabha opened.", "hi", provider, "aws_translate")
+    assert provider.calls == ["Gram Sabha opened."]
+
+def test_batch_translates_whole_sentences_once():
+    memory = TranslationMemory(DictCache())
+    sent = []
+
+    def translate_batch(batch, language):
+        sent.extend(batch)
+        return [f"<{sentence}>" for sentence in batch]
+
+    texts = ["Road in Ward No. 5 costs Rs. 2.5 lakh.", "Road in Ward No. 5 costs Rs. 2.5 lakh. Approved."]
+    translations, hits = memory.translate_many(texts, "hi", translate_batch, True, "llm:m1")
+    assert sent == ["Road in Ward No. 5 costs Rs. 2.5 lakh.", "Approved."]
+    assert translations[1] == "<Road in Ward No. 5 costs Rs. 2.5 lakh.> <Approved.>"
+    assert hits == 0
+
+    translations, hits = memory.translate_many(texts[:1], "hi", translate_batch, True, "llm:m1")
+    assert hits == 1 and len(sent) == 2
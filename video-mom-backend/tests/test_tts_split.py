@@ -0,0 +1,60 @@
+from app.services.tts_service import TTSService, POLLY_MAX_CHARS
+
+split_text = TTSService.split_text
+
+def test_text_within_the_limit_is_one_segment():
+    text = "Budget is Rs. 3.5 lakh. बजट पास हुआ।\nNext item."
+    assert split_text(text) == [text]
+    assert split_text("  ") == []
+
+def test_long_text_splits_at_sentence_ends_only():
+    text = "Budget is Rs. 3.5 lakh for Ward No. 5. " * 6
+    segments = split_text(text, max_chars=100)
+    assert all(len(segment) <= 100 for segment in segments)
+    assert all(segment.endswith("Ward No. 5.") for segment in segments)
+    assert " ".join(segments) == text.strip()
+
+def test_segments_keep_the_original_text():
+    text = "पहला वाक्य है।  Second one is 2.75 km long! Third?\nFourth line. " * 40
+    segments = split_text(text, max_chars=120)
+    assert all(len(segment) <= 120 for segment in segments)
+    # Only whitespace between segments is dropped
+    assert "".join(segments).replace(" ", "").replace("\n", "") == text.replace(" ", "").replace("\n", "")
+    assert not any(segment.startswith(("75", "5 ")) for segment in segments)
+
+def test_sentence_longer_than_a_request_is_cut_at_spaces():
+    text = ("word " * 1000).strip()
+    segments = split_text(text)
+    assert len(segments) == 2
+    assert all(len(segment) <= POLLY_MAX_CHARS for segment in segments)
+    assert " ".join(segments) == text
+
+def test_text_without_spaces_is_cut_at_the_limit():
+    segments = split_text("x" * 250, max_chars=100)
+    assert [len(segment) for segment in segments] == [100, 100, 50]
+
+def test_closing_the_stream_stops_synthesis_without_waiting(monkeypatch):
+    import time
+    from app.services import tts_service as module
+
+    monkeypatch.setattr(module.settings, "TTS_STREAM_CONCURRENCY", 2)
+    service = TTSService.__new__(TTSService)
+    service.polly_client = object()
+    synthesized = []
+
+    def synthesize_segment(text, language):
+        synthesized.append(text)
+        if len(synthesized) > 1:
+            time.sleep(0.3)
+        return text.encode()
+
+    service._synthesize_segment = synthesize_segment
+    text = " ".join(f"Sentence number {i} is here." for i in range(400))
+    stream = service.synthesize_stream(text * 4)
+    next(stream)
+    closed_at = time.monotonic()
+    stream.close()
+    # Closing does not wait for the segments still being synthesized
+    assert time.monotonic() - closed_at < 0.2
+    time.sleep(0.5)
+    assert len(synthesized) <= 3
@@ -0,0 +1,31 @@
+import pytest
+from fastapi.testclient import TestClient
+from app import main
+from app.api import endpoints
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(main.file_storage, "max_upload_bytes", 1000)
+    monkeypatch.setattr(main, "MULTIPART_OVERHEAD_BYTES", 200)
+
+    async def handler_reached(*args):
+        raise AssertionError("upload reached the endpoint")
+
+    # Rejections must come from the middleware, before the body is parsed
+    monkeypatch.setattr(endpoints, "_check_job_capacity", handler_reached)
+    return TestClient(main.app, raise_server_exceptions=False)
+
+def test_oversized_upload_is_rejected_before_the_body_is_read(client):
+    response = client.post("/transcription/", files={"file": ("meeting.mp3", b"x" * 2000, "audio/mpeg")})
+    assert response.status_code == 413
+
+def test_upload_without_content_length_is_rejected(client):
+    body = b'--b\r\nContent-Disposition: form-data; name="file"; filename="a.mp3"\r\n\r\nxx\r\n--b--\r\n'
+    response = client.post(
+        "/transcription/", content=iter([body]),
+        headers={"content-type": "multipart/form-data; boundary=b"}
+    )
+    assert response.status_code == 411
+
+def test_other_requests_are_not_limited(client):
+    assert client.get("/").status_code == 200
@@ -0,0 +1,101 @@
+import pytest
+from app.services.voice_activity import VoiceActivityDetector
+from app.services.wav_chunker import WavChunkReader
+
+@pytest.fixture
+def vad():
+    detector = VoiceActivityDetector()
+    detector.frame_ms = 30
+    detector.threshold_db = 12.0
+    detector.min_silence_ms = 700
+    detector.speech_pad_ms = 200
+    detector.compact_gap_ms = 400
+    return detector
+
+def plan(vad, path, max_chunk_ms):
+    with WavChunkReader(path) as reader:
+        return vad.plan_chunks(reader, max_chunk_ms), reader.duration_ms
+
+def regions(vad, path):
+    with WavChunkReader(path) as reader:
+        return vad.speech_regions(vad.frame_energies(reader))
+
+def assert_valid_plan(chunks, max_chunk_ms):
+    assert [chunk["index"] for chunk in chunks] == list(range(len(chunks)))
+    assert chunks[0]["is_first"] and chunks[-1]["is_last"]
+    for chunk in chunks:
+        assert 0 < chunk["end"] - chunk["start"] <= max_chunk_ms
+    for previous, chunk in zip(chunks, chunks[1:]):
+        assert previous["end"] <= chunk["start"]
+
+def test_all_speech_keeps_everything(vad, make_wav):
+    path = make_wav([("speech", 20)])
+    assert regions(vad, path) == [(0, 19980)]
+    chunks, _ = plan(vad, path, 60000)
+    assert [(chunk["start"], chunk["end"]) for chunk in chunks] == [(0, 19980)]
+
+def test_all_silence_keeps_everything(vad, make_wav):
+    # No dynamic range: nothing can be told apart, so nothing is dropped
+    path = make_wav([("zero", 10)])
+    assert regions(vad, path) == [(0, 9990)]
+    assert vad.compact_silences(path) == path
+
+def test_digital_silence_has_no_speech(vad, make_wav):
+    with WavChunkReader(make_wav([("zero", 2)])) as reader, reader.pcm_view() as view:
+        assert not vad.has_speech(vad.pcm_energies(bytes(view), reader.sample_rate))
+    with WavChunkReader(make_wav([("speech", 2)], "speech.wav")) as reader, reader.pcm_view() as view:
+        assert vad.has_speech(vad.pcm_energies(bytes(view), reader.sample_rate))
+
+def test_short_pauses_are_bridged(vad, make_wav):
+    path = make_wav([("quiet", 2), ("speech", 3), ("quiet", 0.3), ("speech", 3), ("quiet", 2)])
+    found = regions(vad, path)
+    assert len(found) == 1
+    start, end = found[0]
+    assert 1700 <= start <= 2000 and 8300 <= end <= 8600
+
+def test_long_pauses_split_speech_into_separate_chunks(vad, make_wav):
+    path = make_wav([("speech", 5), ("quiet", 10), ("speech", 5), ("quiet", 10), ("speech", 5)])
+    found = regions(vad, path)
+    assert len(found) == 3
+    for (start, end), expected_start in zip(found, (0, 15000, 30000)):
+        assert abs(start - expected_start) <= 300
+        assert abs(end - (expected_start + 5000)) <= 300
+
+    chunks, _ = plan(vad, path, 60000)
+    assert len(chunks) == 3
+    assert_valid_plan(chunks, 60000)
+    assert all(chunk["overlap_start"] == chunk["overlap_end"] == 0 for chunk in chunks)
+
+def test_compaction_shortens_long_pauses(vad, make_wav):
+    path = make_wav([("speech", 5), ("quiet", 10), ("speech", 5), ("quiet", 10), ("speech", 5)])
+    compacted = vad.compact_silences(path)
+    assert compacted != path
+    with WavChunkReader(compacted) as reader:
+        # Three padded speech regions plus two 400 ms gaps
+        assert 15000 + 800 <= reader.duration_ms <= 15000 + 800 + 1300
+
+def test_long_speech_is_cut_at_the_size_limit(vad, make_wav):
+    path = make_wav([("quiet", 2), ("speech", 70), ("quiet", 2)])
+    chunks, _ = plan(vad, path, 30000)
+    assert len(chunks) == 3
+    assert_valid_plan(chunks, 30000)
+    # Contiguous: nothing inside the speech region is dropped at a cut
+    for previous, chunk in zip(chunks, chunks[1:]):
+        assert previous["end"] == chunk["start"]
+
+def test_region_exactly_at_the_limit_is_not_split(vad, make_wav):
+    path = make_wav([("speech", 30)])
+    chunks, _ = plan(vad, path, 30000)
+    assert [(chunk["start"], chunk["end"]) for chunk in chunks] == [(0, 30000)]
+
+    # One frame over the limit is split, and no piece exceeds it
+    chunks, _ = plan(vad, path, 29970)
+    assert len(chunks) == 2
+    assert_valid_plan(chunks, 29970)
+    assert chunks[0]["end"] == chunks[1]["start"]
+
+def test_neighbouring_regions_are_packed_up_to_the_limit(vad, make_wav):
+    path = make_wav([("speech", 8), ("quiet", 1.5), ("speech", 8), ("quiet", 1.5), ("speech", 8)])
+    chunks, _ = plan(vad, path, 20000)
+    assert_valid_plan(chunks, 20000)
+    assert len(chunks) == 2
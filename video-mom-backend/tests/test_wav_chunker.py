@@ -0,0 +1,40 @@
+import struct
+import pytest
+from app.services.wav_chunker import WavChunkReader, build_wav_header, WAV_HEADER_SIZE
+
+def test_header_fields(make_wav):
+    with WavChunkReader(make_wav([("speech", 2)])) as reader:
+        assert (reader.sample_rate, reader.channels, reader.sample_width) == (16000, 1, 2)
+        assert reader.num_frames == 32000
+        assert reader.duration_ms == 2000
+
+def test_slices_at_chunk_boundaries_rejoin_to_the_whole(make_wav):
+    with WavChunkReader(make_wav([("speech", 3)])) as reader:
+        whole = reader.wav_bytes(0, reader.duration_ms)[WAV_HEADER_SIZE:]
+        pieces = [reader.wav_bytes(start, start + 1000) for start in range(0, 3000, 1000)]
+        for piece in pieces:
+            data_size = struct.unpack_from("<I", piece, 40)[0]
+            assert data_size == len(piece) - WAV_HEADER_SIZE == 32000
+        assert b"".join(piece[WAV_HEADER_SIZE:] for piece in pieces) == whole
+
+def test_ranges_are_clamped_to_the_recording(make_wav):
+    with WavChunkReader(make_wav([("speech", 1)])) as reader:
+        assert len(reader.wav_bytes(500, 5000)) == WAV_HEADER_SIZE + 16000
+        assert len(reader.wav_bytes(-100, 0)) == WAV_HEADER_SIZE
+        assert len(reader.wav_bytes(2000, 3000)) == WAV_HEADER_SIZE
+
+def test_placeholder_data_size_from_streamed_writers(tmp_path):
+    # ffmpeg writing to a pipe leaves 0xFFFFFFFF as the data size
+    path = tmp_path / "streamed.wav"
+    header = bytearray(build_wav_header(0, 16000, 1, 2))
+    struct.pack_into("<I", header, 40, 0xFFFFFFFF)
+    path.write_bytes(bytes(header) + b"\x01\x00" * 1600 + b"\x01")
+    with WavChunkReader(str(path)) as reader:
+        assert reader.num_frames == 1600
+        assert reader.duration_ms == 100
+
+def test_rejects_non_wav(tmp_path):
+    path = tmp_path / "not.wav"
+    path.write_bytes(b"ID3" + b"\x00" * 100)
+    with pytest.raises(ValueError):
+        WavChunkReader(str(path))